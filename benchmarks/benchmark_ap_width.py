@@ -0,0 +1,96 @@
+"""
+Benchmark of SpikingFeatures.average_AP_width on long voltage traces,
+compared to the previous implementation that found the width of each spike
+with scipy.optimize.brentq.
+
+Run with::
+
+    python benchmarks/benchmark_ap_width.py
+"""
+from __future__ import print_function
+
+import timeit
+
+import numpy as np
+import scipy.interpolate
+import scipy.optimize
+
+from uncertainpy.features import SpikingFeatures, Spikes
+
+
+def average_AP_width_reference(spikes):
+    """
+    The previous implementation of SpikingFeatures.average_AP_width.
+    """
+    if spikes.nr_spikes <= 0:
+        return None
+
+    sum_AP_width = 0
+    for spike in spikes:
+        V_width = (spike.V_spike + spike.V[0])/2.
+
+        V_interpolation = scipy.interpolate.interp1d(spike.time, spike.V - V_width)
+
+        root1 = scipy.optimize.brentq(V_interpolation, spike.time[0], spike.time_spike)
+        root2 = scipy.optimize.brentq(V_interpolation, spike.time_spike, spike.time[-1])
+
+        sum_AP_width += abs(root2 - root1)
+
+    return sum_AP_width/float(spikes.nr_spikes)
+
+
+def voltage_trace(nr_samples, nr_spikes):
+    """
+    A noisy voltage trace with `nr_spikes` non-overlapping spikes, sampled
+    with a time step of 0.025 ms.
+    """
+    time = np.arange(nr_samples)*0.025
+
+    V = -65 + np.random.normal(0, 0.5, nr_samples)
+
+    width = 40
+    spike_times = np.sort(np.random.choice(np.arange(100, nr_samples - 100, 2*width), nr_spikes, replace=False))
+    shape = 100*np.exp(-0.5*((np.arange(-width, width) - 0.5)/8.)**2)
+    for spike_time in spike_times:
+        V[spike_time - width:spike_time + width] += shape
+
+    return time, V
+
+
+def benchmark(name, time, V, number=1):
+    features = SpikingFeatures(verbose_level="error")
+    spikes = Spikes(time, V)
+
+    current = features.average_AP_width(time, spikes, {})[1]
+    reference = average_AP_width_reference(spikes)
+
+    assert abs(current - reference) < 1e-9
+
+    time_current = min(timeit.repeat(lambda: features.average_AP_width(time, spikes, {}),
+                                     number=number, repeat=3))/number
+    time_reference = min(timeit.repeat(lambda: average_AP_width_reference(spikes),
+                                       number=number, repeat=3))/number
+
+    print("{:<40} {:>12.6f} s {:>12.6f} s {:>10.1f}x".format(name,
+                                                             time_reference,
+                                                             time_current,
+                                                             time_reference/time_current))
+
+
+def main():
+    np.random.seed(10)
+
+    print("{:<40} {:>14} {:>14} {:>11}".format("Voltage trace", "Previous", "Current", "Speedup"))
+
+    time, V = voltage_trace(10**4, 10)
+    benchmark("10^4 samples, 10 spikes", time, V, number=10)
+
+    time, V = voltage_trace(10**6, 1000)
+    benchmark("10^6 samples, 1000 spikes", time, V)
+
+    time, V = voltage_trace(10**6, 5000)
+    benchmark("10^6 samples, 5000 spikes", time, V)
+
+
+if __name__ == "__main__":
+    main()
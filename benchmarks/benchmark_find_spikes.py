@@ -0,0 +1,138 @@
+"""
+Benchmark of Spikes.find_spikes on long voltage traces, compared to the
+previous implementation that looped over each sample of the voltage trace.
+
+Run with::
+
+    python benchmarks/benchmark_find_spikes.py
+"""
+from __future__ import print_function
+
+import timeit
+
+import numpy as np
+
+from uncertainpy.features import Spikes
+from uncertainpy.features.spikes import Spike
+
+
+def find_spikes_reference(time, V, threshold=-30, extended_spikes=False):
+    """
+    The previous implementation of Spikes.find_spikes.
+    """
+    min_dist_from_peak = 1
+    derivative_cutoff = 0.5
+
+    spikes = []
+    if threshold == "auto":
+        threshold = np.sqrt(V.var())
+
+
+    spike_start = 0
+    start_flag = False
+
+    if extended_spikes:
+        dVdt = np.gradient(V)
+
+        gt_derivative = np.where(dVdt >= derivative_cutoff)[0]
+        lt_derivative = np.where(dVdt <= -derivative_cutoff)[0]
+
+    prev_spike_end = 0
+
+    for i in range(len(V)):
+        if V[i] > threshold and start_flag is False:
+            spike_start = i
+            start_flag = True
+            continue
+
+        elif V[i] < threshold and start_flag is True:
+            spike_end = i + 1
+            start_flag = False
+
+            time_spike = time[spike_start:spike_end]
+            V_spike = V[spike_start:spike_end]
+
+            spike_index = np.argmax(V_spike)
+            global_index = spike_index + spike_start
+            time_max = time[global_index]
+            V_max = V[global_index]
+
+            if extended_spikes:
+                spike_start = gt_derivative[(gt_derivative > prev_spike_end) & (gt_derivative < global_index)][0]
+                spike_end = Spikes().consecutive(lt_derivative[lt_derivative > global_index])[-1] + 1
+
+            else:
+                if global_index - min_dist_from_peak < spike_start:
+                    spike_start = global_index - min_dist_from_peak
+
+                if global_index + min_dist_from_peak + 1 > spike_end:
+                    spike_end = global_index + min_dist_from_peak + 1
+
+            time_spike = time[spike_start:spike_end]
+            V_spike = V[spike_start:spike_end]
+
+
+            spikes.append(Spike(time_spike, V_spike, time_max, V_max, global_index))
+            prev_spike_end = spike_end
+
+    return spikes
+
+
+def voltage_trace(nr_samples, nr_spikes):
+    """
+    A noisy voltage trace with `nr_spikes` spikes, sampled with a time step
+    of 0.025 ms.
+    """
+    time = np.arange(nr_samples)*0.025
+
+    V = -65 + np.random.normal(0, 0.5, nr_samples)
+
+    spike_times = np.sort(np.random.choice(np.arange(100, nr_samples - 100), nr_spikes, replace=False))
+    width = 40
+    shape = 100*np.exp(-0.5*((np.arange(-width, width) - 0.5)/8.)**2)
+    for spike_time in spike_times:
+        V[spike_time - width:spike_time + width] += shape
+
+    return time, V
+
+
+def benchmark(name, time, V, extended_spikes=False, number=1):
+    spikes = Spikes()
+    spikes.find_spikes(time, V, extended_spikes=extended_spikes)
+    reference = find_spikes_reference(time, V, extended_spikes=extended_spikes)
+
+    assert len(spikes) == len(reference)
+    for spike, spike_reference in zip(spikes, reference):
+        assert spike.global_index == spike_reference.global_index
+        assert np.array_equal(spike.time, spike_reference.time)
+        assert np.array_equal(spike.V, spike_reference.V)
+
+    time_current = min(timeit.repeat(lambda: Spikes(time, V, extended_spikes=extended_spikes),
+                                     number=number, repeat=3))/number
+    time_reference = min(timeit.repeat(lambda: find_spikes_reference(time, V, extended_spikes=extended_spikes),
+                                       number=number, repeat=3))/number
+
+    print("{:<40} {:>12.6f} s {:>12.6f} s {:>10.1f}x".format(name,
+                                                             time_reference,
+                                                             time_current,
+                                                             time_reference/time_current))
+
+
+def main():
+    np.random.seed(10)
+
+    print("{:<40} {:>14} {:>14} {:>11}".format("Voltage trace", "Previous", "Current", "Speedup"))
+
+    time, V = voltage_trace(10**4, 10)
+    benchmark("10^4 samples, 10 spikes", time, V, number=10)
+
+    time, V = voltage_trace(10**6, 100)
+    benchmark("10^6 samples, 100 spikes", time, V)
+    benchmark("10^6 samples, 100 spikes, extended", time, V, extended_spikes=True)
+
+    time, V = voltage_trace(10**6, 2000)
+    benchmark("10^6 samples, 2000 spikes", time, V)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark of Parallel.none_to_nan on long model results, compared to the
+previous implementation that converted every result through Python lists.
+
+Run with::
+
+    python benchmarks/benchmark_none_to_nan.py
+"""
+from __future__ import print_function
+
+import timeit
+
+import numpy as np
+
+from uncertainpy.core import Parallel
+
+
+def none_to_nan_reference(values):
+    """
+    The previous implementation of Parallel.none_to_nan.
+    """
+    values_list = np.array(values).tolist()
+
+    if values is None:
+        values_list = np.nan
+    elif hasattr(values, "__iter__") and len(values) == 0:
+        values_list = np.nan
+    else:
+        try:
+            for i, u in enumerate(values):
+                if hasattr(u, "__iter__"):
+                    values_list[i] = none_to_nan_reference(u)
+
+            fill = np.nan
+            for i, u in enumerate(values):
+                if u is not None:
+                    fill = np.full(np.shape(values_list[i]), np.nan, dtype=float).tolist()
+                    break
+
+            for i, u in enumerate(values):
+                if u is None:
+                    values_list[i] = fill
+
+        except TypeError:
+            return values_list
+
+    return np.array(values_list)
+
+
+def benchmark(name, values, number=5):
+    parallel = Parallel()
+
+    result = parallel.none_to_nan(values)
+    reference = none_to_nan_reference(values)
+
+    assert np.array_equal(np.isnan(result), np.isnan(reference))
+    assert np.array_equal(result[~np.isnan(result)], reference[~np.isnan(reference)])
+
+    time = min(timeit.repeat(lambda: parallel.none_to_nan(values), number=number, repeat=3))/number
+    time_reference = min(timeit.repeat(lambda: none_to_nan_reference(values), number=number, repeat=3))/number
+
+    print("{:<40} {:>12.6f} s {:>12.6f} s {:>10.1f}x".format(name,
+                                                             time_reference,
+                                                             time,
+                                                             time_reference/time))
+
+
+def main():
+    nr_samples = 10**6
+
+    print("{:<40} {:>14} {:>14} {:>11}".format("Result", "Previous", "Current", "Speedup"))
+
+    trace = np.random.uniform(-70, 30, nr_samples)
+    benchmark("Voltage trace, 10^6 samples", trace)
+
+    benchmark("Voltage trace as list, 10^6 samples", trace.tolist(), number=1)
+
+    traces = [None if i % 10 == 0 else np.random.uniform(-70, 30, nr_samples//100) for i in range(100)]
+    benchmark("100 traces with None, 10^6 samples", traces, number=1)
+
+    spikes = [None if i % 3 == 0 else float(i) for i in range(nr_samples)]
+    benchmark("List with None, 10^6 samples", spikes, number=1)
+
+
+if __name__ == "__main__":
+    main()
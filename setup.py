@@ -35,7 +35,7 @@ towards neuroscience, the implemented methods are general, and Uncertainpy can
 be used for many other types of models and features within other fields.
 """
 
-uncertainpy_require = ["chaospy", "tqdm", "h5py", "multiprocess", "numpy",
+uncertainpy_require = ["chaospy", "tqdm", "h5py", "multiprocess", "dill", "numpy",
                        "scipy", "seaborn", "matplotlib", "xvfbwrapper"]
 efel_features = ["efel"]
 network_features = ["elephant", "neo", "quantities"]
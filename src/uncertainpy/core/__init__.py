@@ -4,16 +4,34 @@ calculate features of the model, both in parallel (``RunModel`` and
 ``Parallel``), as well as the class for performing the uncertainty calculations
 (``UncertaintyCalculations``. It also contains the base classes that are
 responsible for setting and updating parameters, models and features across
-classes (``Base`` and ``ParameterBase``).
+classes (``Base`` and ``ParameterBase``), and the executors that are
+responsible for distributing the model evaluations (``SerialExecutor``,
+``ThreadExecutor``, ``ProcessExecutor`` and ``MPIExecutor``), as well as the
+class for storing model evaluations in a checkpoint file (``Checkpoint``), the
+cache of model evaluations (``EvaluationCache``) and the store of raw model
+outputs (``ModelOutputs``).
 """
 
 from .base import Base, ParameterBase
 from .run_model import RunModel
 from .uncertainty_calculations import UncertaintyCalculations
 from .parallel import Parallel
+from .executors import Executor, SerialExecutor, ThreadExecutor
+from .executors import ProcessExecutor, MPIExecutor
+from .checkpoint import Checkpoint
+from .cache import EvaluationCache
+from .model_outputs import ModelOutputs
 
 __all__ = ["Parallel",
            "Base",
            "ParameterBase",
            "RunModel",
-           "UncertaintyCalculations"]
\ No newline at end of file
+           "UncertaintyCalculations",
+           "Executor",
+           "SerialExecutor",
+           "ThreadExecutor",
+           "ProcessExecutor",
+           "MPIExecutor",
+           "Checkpoint",
+           "EvaluationCache",
+           "ModelOutputs"]
\ No newline at end of file
@@ -0,0 +1,372 @@
+import numpy as np
+
+from ..data import Data
+from ..utils import SpikeTrains
+
+
+class _FeatureEvaluations(object):
+    """
+    The evaluations of a single model/feature, as they are added to a
+    ResultAssembler.
+    """
+    def __init__(self, nr_nodes, adaptive):
+        self.nr_nodes = nr_nodes
+        self.adaptive = adaptive
+
+        # Preallocated array with the evaluations, created from the
+        # first evaluation that is not only nan
+        self.evaluations = None
+        self.shape = None
+        self.dtype = None
+        self.filled = np.zeros(nr_nodes, dtype=bool)
+
+        # The shape and time values of node 0, used if all evaluations are nan
+        self.shape_first = ()
+        self.time_first = np.nan
+
+        # Index of the first node with values and time values that are not
+        # only nan
+        self.index_values = None
+        self.ndim = 0
+        self.index_time = None
+        self.time = None
+
+        # If the shape of the evaluations varies between nodes
+        self.varying = False
+
+        # If the evaluations are SpikeTrains objects, which are stored as they
+        # are in an object array
+        self.sparse = False
+
+        # Only used for adaptive features
+        self.values_list = None
+        self.interpolations = None
+        self.time_interpolate = None
+        self.index_interpolate = None
+        self.time_error = False
+
+        if self.adaptive:
+            self.values_list = [np.nan]*nr_nodes
+            self.interpolations = [None]*nr_nodes
+
+
+
+class ResultAssembler(object):
+    """
+    Assemble the results from each model evaluation into a Data object,
+    one result at the time as the model evaluations are finished.
+
+    The evaluations of the model and each feature are written directly into
+    preallocated arrays, so only a single copy of the evaluations is kept in
+    memory. Adaptive model/features are interpolated when the Data object is
+    created.
+
+    Parameters
+    ----------
+    model : Model
+        The model the results are from.
+    features : Features
+        The features the results are from.
+    nr_nodes : int
+        The number of model evaluations.
+    logger : logging.Logger
+        Logger object responsible for logging to screen or file.
+    time_grids : {None, dict}, optional
+        The common time grids the adaptive model/features have been
+        interpolated onto by the workers (see Parallel). These model/features
+        are stored as they are, without any further interpolation.
+        Default is None.
+
+    Notes
+    -----
+    The time spent in each phase of the model evaluations (see Parallel.run)
+    is stored in ``data.node_timings``, with numpy.nan for nodes that were not
+    evaluated (failed evaluations, or results reused from a checkpoint or
+    cache).
+
+    Model/features that give SpikeTrains objects are stored as an object array
+    with one SpikeTrains object for each node (numpy.nan for failed
+    evaluations), without being converted to dense arrays.
+
+    The results are handled the same way as in ``RunModel.results_to_data``
+    (which uses this class): evaluations that are only numpy.nan get the
+    shape of the other evaluations, the time values are taken from the first
+    evaluation that has time values, and model/features that have a varying
+    number of time points must be adaptive.
+
+    See Also
+    --------
+    uncertainpy.core.RunModel.results_to_data
+    """
+    def __init__(self, model, features, nr_nodes, logger, time_grids=None):
+        self.model = model
+        self.features = features
+        self.nr_nodes = nr_nodes
+        self.logger = logger
+        self.time_grids = time_grids
+
+        self.feature_evaluations = None
+        self.node_timings = {}
+
+
+    def is_adaptive(self, feature):
+        """
+        If a model/feature is specified as adaptive, and has not already been
+        interpolated onto a common time grid.
+
+        Parameters
+        ----------
+        feature : str
+            Name of a feature or the model.
+
+        Returns
+        -------
+        bool
+            True if the model/feature is specified as adaptive and must be
+            interpolated.
+        """
+        if self.time_grids is not None and feature in self.time_grids:
+            return False
+
+        return (feature == self.model.name and self.model.adaptive) \
+            or (feature != self.model.name and feature in self.features.adaptive)
+
+
+    def add(self, index, result):
+        """
+        Add the result from a single model evaluation.
+
+        Parameters
+        ----------
+        index : int
+            The index of the node the result is for.
+        result : {dictionary, None}
+            The model and feature results, see Parallel.run.
+            None if the model evaluation failed, in which case the model and
+            each feature get numpy.nan as result.
+        """
+        if result is None:
+            return
+
+        if self.model.name in result:
+            self._add_timings(index, result[self.model.name].get("timings", {}))
+
+        if self.feature_evaluations is None:
+            self.feature_evaluations = {}
+            for feature in result:
+                self.feature_evaluations[feature] = _FeatureEvaluations(self.nr_nodes,
+                                                                        self.is_adaptive(feature))
+
+        for feature in self.feature_evaluations:
+            self._add_feature(index, feature, result)
+
+
+    def _add_timings(self, index, timings):
+        for phase in timings:
+            if phase not in self.node_timings:
+                self.node_timings[phase] = np.full(self.nr_nodes, np.nan)
+
+            self.node_timings[phase][index] = timings[phase]
+
+
+    def _add_feature(self, index, feature, result):
+        evaluations = self.feature_evaluations[feature]
+
+        values = result[feature]["values"]
+        time = result[feature]["time"]
+
+        if isinstance(values, SpikeTrains):
+            self._add_sparse(index, evaluations, values, time)
+            return
+
+        if index == 0:
+            evaluations.shape_first = np.shape(values)
+            evaluations.time_first = time
+
+        values_nan = np.all(np.isnan(values))
+
+        if not values_nan and (evaluations.index_values is None or index < evaluations.index_values):
+            evaluations.index_values = index
+            evaluations.ndim = np.ndim(values)
+
+        if not np.all(np.isnan(time)) and (evaluations.index_time is None or index < evaluations.index_time):
+            evaluations.index_time = index
+            evaluations.time = time
+
+        if evaluations.adaptive:
+            self._add_adaptive(index, evaluations, values, result, feature)
+            return
+
+        if values_nan:
+            return
+
+        shape = np.shape(values)
+
+        if evaluations.evaluations is None:
+            values = np.asarray(values)
+
+            if values.dtype.kind in "biuf":
+                dtype = float
+            elif values.dtype.kind == "c":
+                dtype = complex
+            else:
+                dtype = object
+
+            evaluations.evaluations = np.full((self.nr_nodes,) + shape, np.nan, dtype=dtype)
+            evaluations.shape = shape
+            evaluations.dtype = values.dtype
+
+        elif shape != evaluations.shape:
+            evaluations.varying = True
+            return
+
+        evaluations.evaluations[index] = values
+        evaluations.filled[index] = True
+        evaluations.dtype = np.result_type(evaluations.dtype, np.asarray(values).dtype)
+
+
+    def _add_sparse(self, index, evaluations, values, time):
+        if evaluations.evaluations is None:
+            evaluations.evaluations = np.full(self.nr_nodes, np.nan, dtype=object)
+            evaluations.sparse = True
+
+        evaluations.evaluations[index] = values
+        evaluations.filled[index] = True
+
+        if evaluations.index_values is None or index < evaluations.index_values:
+            evaluations.index_values = index
+            evaluations.ndim = values.ndim
+
+        if not np.all(np.isnan(time)) and (evaluations.index_time is None or index < evaluations.index_time):
+            evaluations.index_time = index
+            evaluations.time = time
+
+
+    def _add_adaptive(self, index, evaluations, values, result, feature):
+        evaluations.values_list[index] = values
+
+        if "interpolation" not in result[feature]:
+            return
+
+        evaluations.interpolations[index] = result[feature]["interpolation"]
+
+        time = result[feature]["time"]
+        if np.all(np.isnan(time)):
+            time = result[self.model.name]["time"]
+
+            if np.all(np.isnan(time)):
+                evaluations.time_error = True
+                return
+
+        # Use the longest time array, and the first if several are equally long
+        if evaluations.time_interpolate is None \
+                or len(time) > len(evaluations.time_interpolate) \
+                or (len(time) == len(evaluations.time_interpolate) and index < evaluations.index_interpolate):
+            evaluations.time_interpolate = time
+            evaluations.index_interpolate = index
+
+
+    def data(self):
+        """
+        Create a Data object from the added results.
+
+        Returns
+        -------
+        data : Data object
+            A Data object with time and (interpolated) results for the model and
+            each feature.
+
+        Raises
+        ------
+        RuntimeError
+            If no results have been added, or all model evaluations failed.
+        ValueError
+            If the number of points varies between the evaluations of a
+            model/feature that is not adaptive.
+        ValueError
+            If neither an adaptive feature nor the model has time values to
+            use in the interpolation.
+        NotImplementedError
+            If an adaptive model/feature is >= 2D.
+        """
+        if self.feature_evaluations is None:
+            raise RuntimeError("No successful model evaluations")
+
+        data = Data()
+
+        # Add features and labels
+        for feature in self.feature_evaluations:
+            data.add_features(feature)
+
+            if feature == self.model.name:
+                data[feature]["labels"] = self.model.labels
+            elif feature in self.features.labels:
+                data[feature]["labels"] = self.features.labels[feature]
+
+        data.model_name = self.model.name
+        data.node_timings = self.node_timings
+
+        # Check if features are adaptive without being specified as a adaptive
+        for feature in data:
+            if self.feature_evaluations[feature].varying:
+                raise ValueError("{}: The number of points varies between runs.".format(feature)
+                                 + " Try setting adaptive to True in {}".format(feature))
+
+        for feature in data:
+            evaluations = self.feature_evaluations[feature]
+
+            if evaluations.index_values is None:
+                ndim = len(evaluations.shape_first)
+            else:
+                ndim = evaluations.ndim
+
+            if evaluations.index_time is None:
+                time = evaluations.time_first
+            else:
+                time = evaluations.time
+
+            if evaluations.sparse:
+                values = evaluations.evaluations
+
+            elif evaluations.adaptive:
+                # TODO implement interpolation of >= 2d data, part2
+                if ndim >= 2:
+                    raise NotImplementedError("Feature: {feature},".format(feature=feature)
+                                              + " no support for >= 2D interpolation")
+
+                elif ndim == 1:
+                    if evaluations.time_error:
+                        raise ValueError("Neither {} or model has t values to use in interpolation".format(feature))
+
+                    # No interpolations if all evaluations have only nan values
+                    if evaluations.time_interpolate is not None:
+                        time = evaluations.time_interpolate
+
+                    values = np.full((self.nr_nodes, len(np.atleast_1d(time))), np.nan)
+                    for i, interpolation in enumerate(evaluations.interpolations):
+                        if interpolation is not None:
+                            values[i] = interpolation(time)
+
+                # Interpolating a 0D result makes no sense, so if a 0D feature
+                # is supposed to be interpolated store it as normal
+                else:
+                    self.logger.warning("Feature: {feature}, ".format(feature=feature) +
+                                        "is a 0D result. No interpolation is performed")
+
+                    values = np.array(evaluations.values_list)
+
+            elif evaluations.evaluations is None:
+                # Only nan values
+                values = np.full((self.nr_nodes,) + evaluations.shape_first, np.nan)
+
+            else:
+                values = evaluations.evaluations
+
+                # Keep integer results as integers if no evaluations are missing
+                if np.all(evaluations.filled) and evaluations.dtype.kind in "biu":
+                    values = values.astype(evaluations.dtype)
+
+            data[feature].time = np.array(time)
+            data[feature].evaluations = values
+
+        return data
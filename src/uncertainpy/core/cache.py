@@ -0,0 +1,357 @@
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import os
+import hashlib
+import collections
+
+import numpy as np
+
+from ..utils import create_logger
+
+
+def _copy_result(result):
+    """
+    Copy the dictionaries of a result, so changes to the returned result do
+    not change the cached result. The arrays are not copied.
+    """
+    return dict((feature, dict(result[feature])) for feature in result)
+
+
+def _parameters(model_parameters):
+    """
+    Convert the model parameters to a sorted list of ``(name, value)`` pairs,
+    with numpy numbers converted to Python numbers, so the representation
+    does not depend on the type of the values.
+    """
+    parameters = []
+    for name, value in sorted(model_parameters.items()):
+        if isinstance(value, np.floating):
+            value = float(value)
+        elif isinstance(value, np.integer):
+            value = int(value)
+
+        parameters.append((name, value))
+
+    return parameters
+
+
+def _time_grid_hashes(time_grids):
+    """
+    Find the hash of the time grid of each model/feature, since the time
+    grids can be long. Returns a sorted list of ``(name, hash)`` pairs, or
+    None if `time_grids` is None.
+    """
+    if time_grids is None:
+        return None
+
+    grids = []
+    for feature, time_grid in sorted(time_grids.items()):
+        time_grid = np.ascontiguousarray(time_grid, dtype=float)
+        grids.append((feature, hashlib.sha1(time_grid.tobytes()).hexdigest()))
+
+    return grids
+
+
+def _configuration(obj):
+    """
+    Find the configuration of a model or features object, that is all
+    attributes that are numbers, strings, booleans, None, or lists, tuples
+    and dictionaries of those.
+
+    Parameters
+    ----------
+    obj
+        The object to find the configuration of.
+
+    Returns
+    -------
+    configuration : list
+        A sorted list of ``(attribute name, value)`` pairs.
+    """
+    def simple(value):
+        if value is None or isinstance(value, (bool, int, float, str, type(u""), np.number)):
+            return True
+        elif isinstance(value, (list, tuple)):
+            return all(simple(item) for item in value)
+        elif isinstance(value, dict):
+            return all(simple(key) and simple(item) for key, item in value.items())
+
+        return False
+
+    configuration = []
+    for name, value in sorted(vars(obj).items()):
+        if simple(value):
+            if isinstance(value, dict):
+                value = sorted(value.items())
+
+            configuration.append((name, value))
+
+    return configuration
+
+
+
+class EvaluationCache(object):
+    """
+    Cache of model evaluations, so model evaluations with identical model
+    parameters are not performed again.
+
+    The results are cached in memory, with a least recently used eviction
+    policy, and optionally on disk, with a limit on the total size of the
+    cached files. Each result is identified by a hash of the name, class and
+    version of the model, the configuration of the model and features, and
+    the values of all model parameters.
+
+    Parameters
+    ----------
+    folder : {None, str}, optional
+        The folder to store the cached results in. If None, results are only
+        cached in memory.
+        Default is None.
+    max_items : int, optional
+        The maximum number of results cached in memory.
+        Default is 1000.
+    max_disk_size : {None, int}, optional
+        The maximum total size in bytes of the results cached on disk.
+        If None, there is no limit.
+        Default is None.
+    verbose_level : {"info", "debug", "warning", "error", "critical"}, optional
+        Set the threshold for the logging level.
+        Logging messages less severe than this level is ignored.
+        Default is `"info"`.
+    verbose_filename : {None, str}, optional
+        Sets logging to a file with name `verbose_filename`.
+        No logging to screen if set. Default is None.
+
+    Attributes
+    ----------
+    folder : {None, str}
+        The folder to store the cached results in.
+    max_items : int
+        The maximum number of results cached in memory.
+    max_disk_size : {None, int}
+        The maximum total size in bytes of the results cached on disk.
+    hits : int
+        The number of results found in the cache.
+    misses : int
+        The number of results not found in the cache.
+    logger : logging.Logger
+        Logger object responsible for logging to screen or file.
+
+    Notes
+    -----
+    Only attributes of the model and features that are numbers, strings,
+    booleans or None (or lists, tuples and dictionaries of those) are part of
+    the configuration used to identify a result. Changes to the code of the
+    model are not detected. Set a ``version`` attribute on the model and
+    change it when the model is changed, or call ``clear``.
+
+    The cache only stores successful model evaluations.
+    """
+    def __init__(self,
+                 folder=None,
+                 max_items=1000,
+                 max_disk_size=None,
+                 verbose_level="info",
+                 verbose_filename=None):
+
+        self.folder = folder
+        self.max_items = max_items
+        self.max_disk_size = max_disk_size
+
+        self.logger = create_logger(verbose_level,
+                                    verbose_filename,
+                                    self.__class__.__name__)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = collections.OrderedDict()
+
+        # Size of each file on disk, ordered from least to most recently used
+        self._disk = collections.OrderedDict()
+
+        if self.folder is not None:
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+
+            filenames = []
+            for filename in os.listdir(self.folder):
+                if filename.endswith(".pickle"):
+                    path = os.path.join(self.folder, filename)
+                    filenames.append((os.path.getmtime(path), filename, os.path.getsize(path)))
+
+            for mtime, filename, size in sorted(filenames):
+                self._disk[filename[:-len(".pickle")]] = size
+
+
+    def __len__(self):
+        return len(set(self._memory.keys()) | set(self._disk.keys()))
+
+
+    def __contains__(self, key):
+        return key in self._memory or key in self._disk
+
+
+    @property
+    def disk_size(self):
+        """
+        The total size in bytes of the results cached on disk.
+
+        Returns
+        -------
+        disk_size : int
+            The total size in bytes of the results cached on disk.
+        """
+        return sum(self._disk.values())
+
+
+    def key(self, model, features, model_parameters, time_grids=None):
+        """
+        Create the key identifying a model evaluation.
+
+        Parameters
+        ----------
+        model : Model
+            The model that is evaluated.
+        features : Features
+            The features that are calculated.
+        model_parameters : dictionary
+            All model parameters as a dictionary.
+        time_grids : {None, dict}, optional
+            The common time grids adaptive model/features are interpolated
+            onto, see Parallel.
+            Default is None.
+
+        Returns
+        -------
+        key : str
+            A hexadecimal hash identifying the model evaluation.
+        """
+        parameters = _parameters(model_parameters)
+
+        # The time grids can be long, so only their hash is used
+        grids = _time_grid_hashes(time_grids)
+
+        identifier = repr((model.name,
+                           model.__class__.__name__,
+                           getattr(model, "version", None),
+                           _configuration(model),
+                           features.__class__.__name__,
+                           _configuration(features),
+                           parameters,
+                           grids))
+
+        return hashlib.sha1(identifier.encode("utf-8")).hexdigest()
+
+
+    def get(self, key):
+        """
+        Get a cached result.
+
+        Parameters
+        ----------
+        key : str
+            The key identifying the model evaluation.
+
+        Returns
+        -------
+        result : {dictionary, None}
+            The cached model and feature results (see Parallel.run), or None
+            if the result is not cached.
+        """
+        if key in self._memory:
+            self._memory[key] = self._memory.pop(key)
+            self.hits += 1
+
+            return _copy_result(self._memory[key])
+
+        if key in self._disk:
+            path = self._path(key)
+
+            try:
+                with open(path, "rb") as f:
+                    result = pickle.load(f)
+            except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                self.logger.warning("Unable to read cached result: {}".format(path))
+                self._remove(key)
+                self.misses += 1
+
+                return None
+
+            os.utime(path, None)
+            self._disk[key] = self._disk.pop(key)
+            self._add_to_memory(key, result)
+            self.hits += 1
+
+            return _copy_result(result)
+
+        self.misses += 1
+
+        return None
+
+
+    def set(self, key, result):
+        """
+        Add a result to the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key identifying the model evaluation.
+        result : dictionary
+            The model and feature results (see Parallel.run).
+        """
+        self._add_to_memory(key, _copy_result(result))
+
+        if self.folder is None:
+            return
+
+        path = self._path(key)
+        with open(path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._disk.pop(key, None)
+        self._disk[key] = os.path.getsize(path)
+
+        if self.max_disk_size is not None:
+            disk_size = self.disk_size
+            while disk_size > self.max_disk_size and self._disk:
+                oldest = next(iter(self._disk))
+                disk_size -= self._disk[oldest]
+                self._remove(oldest)
+
+
+    def clear(self):
+        """
+        Remove all cached results, both in memory and on disk.
+        """
+        self._memory.clear()
+
+        for key in list(self._disk.keys()):
+            self._remove(key)
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def _add_to_memory(self, key, result):
+        self._memory.pop(key, None)
+        self._memory[key] = result
+
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + ".pickle")
+
+
+    def _remove(self, key):
+        self._disk.pop(key, None)
+
+        path = self._path(key)
+        if os.path.isfile(path):
+            os.remove(path)
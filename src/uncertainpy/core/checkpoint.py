@@ -0,0 +1,226 @@
+import os
+import hashlib
+
+import h5py
+import numpy as np
+
+from ..utils import create_logger, SpikeTrains
+from ..data import _save_spike_trains, _load_spike_trains
+from .cache import _time_grid_hashes
+
+
+class Checkpoint(object):
+    """
+    Store the results of model evaluations in a HDF5 file as soon as they are
+    calculated, so finished evaluations can be reloaded if the calculations
+    are interrupted.
+
+    Each model evaluation is stored in a group named after the index of the
+    node, with the values of the uncertain parameters, and the time and values
+    of the model and each feature. SpikeTrains objects are stored as the spike
+    times and offsets, in the same way as in Data.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the checkpoint file.
+    model_name : str
+        Name of the model. Checkpoints created for a different model are not
+        reused.
+    uncertain_parameters : list
+        A list of the names of the uncertain parameters. Checkpoints created
+        for a different set of uncertain parameters are not reused.
+    feature_names : {None, list}, optional
+        A list of the names of the features that are calculated. Checkpoints
+        created for a different set of features are not reused.
+        Default is None, meaning no features.
+    time_grids : {None, dict}, optional
+        The common time grids adaptive model/features are interpolated onto,
+        see Parallel. Checkpoints created with different time grids are not
+        reused. Default is None.
+    resume : bool, optional
+        If the evaluations in an existing checkpoint file should be kept and
+        reused. If False, any existing checkpoint file is overwritten.
+        Default is False.
+    verbose_level : {"info", "debug", "warning", "error", "critical"}, optional
+        Set the threshold for the logging level.
+        Logging messages less severe than this level is ignored.
+        Default is `"info"`.
+    verbose_filename : {None, str}, optional
+        Sets logging to a file with name `verbose_filename`.
+        No logging to screen if set. Default is None.
+
+    Attributes
+    ----------
+    filename : str
+        Name of the checkpoint file.
+    logger : logging.Logger
+        Logger object responsible for logging to screen or file.
+
+    Notes
+    -----
+    Finished evaluations are matched to the nodes by the values of the
+    uncertain parameters, so to reuse evaluations the same nodes must be
+    created, for example by using the same seed.
+
+    Only a hash of the time grids is stored in the checkpoint file.
+    """
+    def __init__(self,
+                 filename,
+                 model_name,
+                 uncertain_parameters,
+                 feature_names=None,
+                 time_grids=None,
+                 resume=False,
+                 verbose_level="info",
+                 verbose_filename=None):
+
+        self.filename = filename
+
+        self.logger = create_logger(verbose_level,
+                                    verbose_filename,
+                                    self.__class__.__name__)
+
+        if feature_names is None:
+            feature_names = []
+
+        feature_names = sorted(feature_names)
+        time_grids_hash = hashlib.sha1(repr(_time_grid_hashes(time_grids)).encode("utf-8")).hexdigest()
+
+        folder = os.path.dirname(filename)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        if resume and os.path.isfile(filename):
+            self.file = h5py.File(filename, "a")
+
+            stored_feature_names = self.file.attrs.get("feature names")
+            if stored_feature_names is not None:
+                stored_feature_names = [str(name) for name in stored_feature_names]
+
+            if self.file.attrs["model name"] != model_name \
+                    or list(self.file.attrs["uncertain parameters"]) != list(uncertain_parameters) \
+                    or stored_feature_names != feature_names \
+                    or self.file.attrs.get("time grids") != time_grids_hash:
+                self.logger.warning("Checkpoint {} was created for another ".format(filename)
+                                    + "model, other uncertain parameters, other features "
+                                    + "or other time grids. Not resuming.")
+                self.file.close()
+                self.file = None
+
+        else:
+            self.file = None
+
+        if self.file is None:
+            self.file = h5py.File(filename, "w")
+            self.file.attrs["model name"] = model_name
+            self.file.attrs["uncertain parameters"] = list(uncertain_parameters)
+            self.file.attrs["feature names"] = feature_names
+            self.file.attrs["time grids"] = time_grids_hash
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def load(self):
+        """
+        Load all finished model evaluations from the checkpoint file.
+
+        Returns
+        -------
+        evaluations : dict
+            A dictionary with a tuple of the values of the uncertain parameters
+            as keys, and a ``(result, error)`` tuple as values. `result` is the
+            model and feature results without interpolations (see
+            Parallel.run), or None if the evaluation failed. `error` is None,
+            or a description of the error if the evaluation failed.
+        """
+        evaluations = {}
+        for index in self.file:
+            group = self.file[index]
+
+            key = tuple(group.attrs["node"].tolist())
+
+            if "error" in group.attrs:
+                evaluations[key] = (None, str(group.attrs["error"]))
+                continue
+
+            result = {}
+            for feature in group:
+                result[str(feature)] = {"values": self._load_values(group[feature]["values"]),
+                                        "time": self._load_values(group[feature]["time"])}
+
+            evaluations[key] = (result, None)
+
+        return evaluations
+
+
+    def save(self, index, node, result, error=None):
+        """
+        Save a finished model evaluation to the checkpoint file.
+
+        Parameters
+        ----------
+        index : int
+            The index of the node.
+        node : array
+            The values of the uncertain parameters for the evaluation.
+        result : {dictionary, None}
+            The model and feature results (see Parallel.run), or None if the
+            evaluation failed. Interpolations are not stored.
+        error : {None, str}, optional
+            A description of the error if the evaluation failed.
+            Default is None.
+        """
+        name = str(index)
+
+        if name in self.file:
+            del self.file[name]
+
+        group = self.file.create_group(name)
+        group.attrs["node"] = np.atleast_1d(node)
+
+        if error is not None:
+            group.attrs["error"] = error
+        else:
+            for feature in result:
+                feature_group = group.create_group(feature)
+                self._save_values(feature_group, "values", result[feature]["values"])
+                self._save_values(feature_group, "time", result[feature]["time"])
+
+        self.file.flush()
+
+
+    def _save_values(self, group, name, values):
+        """
+        Save the time or values of a model/feature result to `group`.
+        """
+        if isinstance(values, SpikeTrains):
+            _save_spike_trains(group.create_group(name), [values])
+        else:
+            group.create_dataset(name, data=values)
+
+
+    def _load_values(self, item):
+        """
+        Load the time or values of a model/feature result saved by
+        ``_save_values``.
+        """
+        if isinstance(item, h5py.Group) and item.attrs.get("type") == "spike trains":
+            return _load_spike_trains(item)[0]
+
+        return item[()]
+
+
+    def close(self):
+        """
+        Close the checkpoint file.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,923 @@
+try:
+    from mpi4py import MPI
+    from mpi4py.futures import MPIPoolExecutor
+
+    prerequisites = True
+except ImportError:
+    prerequisites = False
+
+import os
+import uuid
+import atexit
+import shutil
+import logging
+import functools
+import tempfile
+import collections
+
+import numpy as np
+import multiprocess as mp
+import multiprocess.dummy
+import multiprocess.util
+import dill
+
+from .cache import _configuration, _time_grid_hashes
+
+
+if prerequisites:
+    # Objects are sent between the MPI processes using dill, so models and
+    # features defined as functions are supported. This replaces the pickler
+    # of mpi4py for the whole process, also outside of MPIExecutor.
+    MPI.pickle.__init__(dill.dumps, dill.loads)
+
+
+# The Parallel object used by each worker process. It is set once per worker
+# by the initializer, so the model and features are not sent to the workers
+# for each model evaluation.
+_worker_parallel = None
+
+# The folder and size threshold used to send large arrays from this worker
+# through memory-mapped files, see ProcessExecutor
+_worker_scratch = None
+
+# The time spent in the setup of the model and features in this worker. It is
+# sent back together with the first result from the worker, and then set to
+# None.
+_worker_setup_time = None
+
+
+class _SharedArray(object):
+    """
+    Handle to an array stored in a memory-mapped file by a worker process.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+
+
+    def load(self):
+        """
+        Memory map the array and remove the file. The array stays valid
+        until it is no longer used.
+        """
+        array = np.asarray(np.load(self.filename, mmap_mode="r"))
+
+        try:
+            os.remove(self.filename)
+        except OSError:
+            # Files in use can not be removed on Windows,
+            # they are removed together with the scratch folder
+            pass
+
+        return array
+
+
+def _share_arrays(result, folder, threshold):
+    """
+    Replace the numerical arrays in a result that are larger than `threshold`
+    bytes by handles to memory-mapped files in `folder`.
+    """
+    if result is None:
+        return result
+
+    for feature in result:
+        for key in ["values", "time"]:
+            array = result[feature][key]
+
+            if isinstance(array, np.ndarray) and array.dtype.kind in "biufc" \
+                    and array.nbytes >= threshold:
+                filename = os.path.join(folder, "{}.npy".format(uuid.uuid4().hex))
+                np.save(filename, array)
+
+                result[feature][key] = _SharedArray(filename)
+
+    return result
+
+
+def _load_arrays(result):
+    """
+    Replace the handles to memory-mapped files in a result by the arrays.
+    """
+    if result is None:
+        return result
+
+    for feature in result:
+        for key in ["values", "time"]:
+            if isinstance(result[feature][key], _SharedArray):
+                result[feature][key] = result[feature][key].load()
+
+    return result
+
+
+def _init_worker(parallel, initializer=None, initargs=(), scratch=None):
+    """
+    Initialize a worker process.
+
+    Parameters
+    ----------
+    parallel : Parallel
+        The Parallel object used for each model evaluation in this worker.
+    initializer : {None, callable}, optional
+        A function called once when each worker starts.
+        Default is None.
+    initargs : tuple, optional
+        Arguments sent to `initializer`.
+        Default is ``()``.
+    scratch : {None, tuple}, optional
+        The folder and size threshold in bytes used to send large arrays
+        through memory-mapped files. If None, all arrays are pickled.
+        Default is None.
+    """
+    global _worker_parallel
+    global _worker_scratch
+    global _worker_setup_time
+
+    _worker_parallel = parallel
+    _worker_scratch = scratch
+
+    if initializer is not None:
+        initializer(*initargs)
+
+    _worker_setup_time = parallel.setup_worker()
+
+    # Pool workers run the multiprocess finalizers when they exit,
+    # MPI workers the atexit functions
+    multiprocess.util.Finalize(None, _teardown_worker, exitpriority=10)
+    atexit.register(_teardown_worker)
+
+
+def _teardown_worker():
+    """
+    Clean up after the setup of the model and features when a worker exits.
+    """
+    global _worker_parallel
+
+    if _worker_parallel is not None:
+        _worker_parallel.teardown_worker()
+        _worker_parallel = None
+
+
+def _pop_setup_time():
+    """
+    Get the setup time of this worker the first time it is called, and None
+    afterwards.
+    """
+    global _worker_setup_time
+
+    setup_time = _worker_setup_time
+    _worker_setup_time = None
+
+    return setup_time
+
+
+def _run_node(model_parameters, time_grids=None):
+    """
+    Run the model and calculate the features for a single set of model
+    parameters, using the Parallel object of this worker.
+
+    Parameters
+    ----------
+    model_parameters : dictionary
+        All model parameters as a dictionary.
+    time_grids : {None, dict}, optional
+        The common time grid of each adaptive model/feature, see
+        Parallel.evaluate.
+        Default is None.
+
+    Returns
+    -------
+    result : tuple
+        The ``(result, error)`` tuple returned by Parallel.evaluate.
+    setup_time : {None, float}
+        The time in seconds spent in the setup of this worker, for the first
+        evaluation in the worker. None for all other evaluations.
+    """
+    result, error = _worker_parallel.evaluate(model_parameters, time_grids)
+
+    if _worker_scratch is not None:
+        result = _share_arrays(result, *_worker_scratch)
+
+    return (result, error), _pop_setup_time()
+
+
+def _run_batch(batch, time_grids=None):
+    """
+    Run a vectorized model and calculate the features for a batch of model
+    parameters, using the Parallel object of this worker.
+
+    Parameters
+    ----------
+    batch : list
+        A list where each element is a dictionary with the model parameters
+        for a single evaluation.
+    time_grids : {None, dict}, optional
+        The common time grid of each adaptive model/feature, see
+        Parallel.evaluate.
+        Default is None.
+
+    Returns
+    -------
+    results : list
+        A list of ``(result, error)`` tuples, see Parallel.evaluate_batch.
+    setup_time : {None, float}
+        The time in seconds spent in the setup of this worker, for the first
+        batch in the worker. None for all other batches.
+    """
+    results = _worker_parallel.evaluate_batch(batch, time_grids)
+
+    if _worker_scratch is not None:
+        results = [(_share_arrays(result, *_worker_scratch), error) for result, error in results]
+
+    return results, _pop_setup_time()
+
+
+def _bounded_imap(submit, items, max_inflight):
+    """
+    Submit each item and yield the results in order, with at most
+    `max_inflight` items submitted whose results have not yet been yielded.
+
+    Parameters
+    ----------
+    submit : callable
+        Submits an item for evaluation, and returns a function without
+        arguments that waits for and returns the result.
+    items : iterable
+        The items to evaluate.
+    max_inflight : int
+        The maximum number of items that are evaluated, or have finished but
+        not yet been yielded, at the same time.
+
+    Yields
+    ------
+    result
+        The result of each item, in the same order as `items`.
+    """
+    items = iter(items)
+    pending = collections.deque()
+
+    while True:
+        for item in items:
+            pending.append(submit(item))
+
+            if len(pending) >= max_inflight:
+                break
+
+        if not pending:
+            return
+
+        yield pending.popleft()()
+
+
+def _pool_imap(pool, function, items, max_inflight=None):
+    """
+    Lazily map `function` over `items` with a multiprocess pool, with at most
+    `max_inflight` items submitted at the time, see ``_bounded_imap``.
+    """
+    if max_inflight is None:
+        return pool.imap(function, items)
+
+    return _bounded_imap(lambda item: pool.apply_async(function, (item,)).get,
+                         items,
+                         max_inflight)
+
+
+def _settings(obj):
+    """
+    The configuration of a model or features object, without the private
+    attributes that only hold state built up during the evaluations.
+    Private attributes are kept when they store the value of a property, for
+    example ``_features_to_run``.
+    """
+    settings = []
+    for name, value in _configuration(obj):
+        if not name.startswith("_") \
+                or isinstance(getattr(type(obj), name[1:], None), property):
+            settings.append((name, value))
+
+    return settings
+
+
+def _parallel_settings(parallel):
+    """
+    The settings of `parallel` that are used in the workers, with the time
+    grids replaced by their hashes.
+    """
+    settings = [(name, getattr(parallel, name, None))
+                for name in ["timeout", "retries", "on_error", "profile", "store_model_results"]]
+
+    return settings, _time_grid_hashes(parallel.time_grids)
+
+
+
+class Executor(object):
+    """
+    Base class for the executors that evaluate the model and calculate the
+    features for a series of model parameters.
+
+    An executor is started with the Parallel object to evaluate, and the
+    started workers are reused for all later evaluations as long as the
+    Parallel object, number of CPUs and initializer stay the same.
+    The Parallel, model, features and initializer objects are compared by
+    identity, together with the settings of the Parallel object, model and
+    features (see ``_worker_state``).
+    When a worker starts, ``setup_worker`` of the model and features is
+    called after the initializer, and ``teardown_worker`` is called when the
+    worker is shut down.
+
+    Parameters
+    ----------
+    CPUs : {None, int}, optional
+        The number of workers to use. If None, the default for each executor
+        is used.
+        Default is None.
+
+    Attributes
+    ----------
+    CPUs : {None, int}
+        The number of workers to use.
+    running : bool
+        If the workers of the executor have been started.
+    setup_times : list
+        The time in seconds spent in the setup of the model and features in
+        each worker that has reported it. Workers report the setup time
+        together with their first result.
+
+    Notes
+    -----
+    Subclasses must implement ``_start``, ``_close``, ``imap`` and
+    ``imap_batches``.
+    """
+    name = None
+
+    def __init__(self, CPUs=None):
+        self.CPUs = CPUs
+        self.setup_times = []
+        self._state = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    @property
+    def running(self):
+        return self._state is not None
+
+
+    def start(self, parallel, initializer=None, initargs=()):
+        """
+        Start the workers, or reuse the running workers if the Parallel
+        object, number of CPUs and initializer have not changed.
+
+        Parameters
+        ----------
+        parallel : Parallel
+            The Parallel object responsible for each model evaluation.
+        initializer : {None, callable}, optional
+            A function that is called once in each worker when it starts.
+            Default is None.
+        initargs : tuple, optional
+            Arguments sent to `initializer`.
+            Default is ``()``.
+        """
+        state = self._worker_state(parallel, initializer, initargs)
+
+        if self.running and self._same_state(state):
+            return
+
+        self.close()
+        self._start(parallel, initializer, initargs)
+        self._state = state
+
+
+    def close(self):
+        """
+        Shut down the workers, if they are running.
+        """
+        if self.running:
+            self._close()
+            self._state = None
+
+
+    def _worker_state(self, parallel, initializer, initargs):
+        """
+        The state that requires the workers to be restarted when it changes.
+
+        Returns
+        -------
+        objects : tuple
+            The objects sent to the workers, compared by identity.
+        settings : tuple
+            The number of CPUs, the settings of `parallel` and the settings
+            of the model and features (the public attributes and properties
+            that are numbers, strings, booleans, None, or lists, tuples and
+            dictionaries of those), compared by value.
+
+        Notes
+        -----
+        The workers get a copy of the model and features when they are
+        started. Changes to other attributes of the model and features, for
+        example replacing a function, are not detected. Call ``close`` to
+        restart the workers after such changes.
+        """
+        objects = (parallel, parallel.model, parallel.features, initializer) + tuple(initargs)
+        settings = (self.CPUs,
+                    len(initargs),
+                    _parallel_settings(parallel),
+                    _settings(parallel.model),
+                    _settings(parallel.features))
+
+        return objects, settings
+
+
+    def _same_state(self, state):
+        """
+        Check if `state` is the same as the state the workers were started
+        with.
+        """
+        objects, settings = state
+        started_objects, started_settings = self._state
+
+        return len(objects) == len(started_objects) \
+            and all(obj is started for obj, started in zip(objects, started_objects)) \
+            and settings == started_settings
+
+
+    def _collect(self, results):
+        """
+        Remove the setup times from the results returned by ``_run_node`` or
+        ``_run_batch``, and add them to ``setup_times``.
+        """
+        for result, setup_time in results:
+            if setup_time is not None:
+                self.setup_times.append(setup_time)
+
+            yield result
+
+
+    def _start(self, parallel, initializer, initargs):
+        raise NotImplementedError("No _start method implemented in {}".format(self.__class__.__name__))
+
+
+    def _close(self):
+        raise NotImplementedError("No _close method implemented in {}".format(self.__class__.__name__))
+
+
+    def imap(self, model_parameters, max_inflight=None, time_grids=None):
+        """
+        Evaluate the model and features for each set of model parameters.
+
+        Parameters
+        ----------
+        model_parameters : list
+            A list where each element is a dictionary with the model parameters
+            for a single evaluation.
+        max_inflight : {None, int}, optional
+            The maximum number of model evaluations that are submitted to the
+            workers, but whose results have not yet been returned by the
+            iterator. Limits the number of results kept in memory when the
+            workers are faster than the results are consumed. If None,
+            all model evaluations are submitted at once.
+            Default is None.
+        time_grids : {None, dict}, optional
+            The common time grid of each adaptive model/feature, sent to the
+            workers together with the model parameters, see
+            Parallel.evaluate.
+            Default is None.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the ``(result, error)`` tuples returned by
+            Parallel.evaluate, in the same order as `model_parameters`.
+        """
+        raise NotImplementedError("No imap method implemented in {}".format(self.__class__.__name__))
+
+
+    def imap_batches(self, batches, max_inflight=None, time_grids=None):
+        """
+        Evaluate a vectorized model and the features for batches of model
+        parameters, with one batch sent to a worker at the time.
+
+        Parameters
+        ----------
+        batches : list
+            A list of batches, where each batch is a list of dictionaries with
+            the model parameters for a single evaluation.
+        max_inflight : {None, int}, optional
+            The maximum number of batches that are submitted to the workers,
+            but whose results have not yet been returned by the iterator.
+            If None, all batches are submitted at once.
+            Default is None.
+        time_grids : {None, dict}, optional
+            The common time grid of each adaptive model/feature, sent to the
+            workers together with the batches, see Parallel.evaluate.
+            Default is None.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the lists of ``(result, error)`` tuples returned
+            by Parallel.evaluate_batch, in the same order as `batches`.
+        """
+        raise NotImplementedError("No imap_batches method implemented in {}".format(self.__class__.__name__))
+
+
+
+class SerialExecutor(Executor):
+    """
+    Evaluate the model in the current process, one evaluation at the time.
+
+    Useful when debugging or profiling a model, since exceptions and
+    profilers work as for any other Python code.
+
+    Parameters
+    ----------
+    CPUs : {None, int}, optional
+        Ignored, only a single process is used.
+        Default is None.
+    """
+    name = "serial"
+
+    def __init__(self, CPUs=None):
+        super(SerialExecutor, self).__init__(CPUs=CPUs)
+
+        self._parallel = None
+        self._started = None
+
+
+    def start(self, parallel, initializer=None, initargs=()):
+        super(SerialExecutor, self).start(parallel, initializer=initializer, initargs=initargs)
+
+        self._parallel = parallel
+
+
+    def _worker_state(self, parallel, initializer, initargs):
+        # The model and features are shared with the current process,
+        # so changes to them do not require the workers to be restarted.
+        # New model or features objects must be set up again.
+        objects = (parallel.model, parallel.features, initializer) + tuple(initargs)
+
+        return objects, (self.CPUs, len(initargs))
+
+
+    def _start(self, parallel, initializer, initargs):
+        if initializer is not None:
+            initializer(*initargs)
+
+        self.setup_times.append(parallel.setup_worker())
+        self._started = parallel
+
+
+    def _close(self):
+        self._started.teardown_worker()
+
+        self._started = None
+        self._parallel = None
+
+
+    # Only a single evaluation is performed at the time,
+    # so max_inflight has no effect
+    def imap(self, model_parameters, max_inflight=None, time_grids=None):
+        for parameters in model_parameters:
+            yield self._parallel.evaluate(parameters, time_grids)
+
+
+    def imap_batches(self, batches, max_inflight=None, time_grids=None):
+        for batch in batches:
+            yield self._parallel.evaluate_batch(batch, time_grids)
+
+
+
+class ThreadExecutor(Executor):
+    """
+    Evaluate the model in a pool of threads in the current process.
+
+    Suitable for models that release the GIL for most of the work, such as
+    models that spend their time in NumPy or SciPy routines. Avoids the
+    overhead of sending the results between processes.
+
+    Parameters
+    ----------
+    CPUs : {None, int}, optional
+        The number of threads. If None, the number of CPUs on the computer
+        (multiprocess.cpu_count()) is used.
+        Default is None.
+
+    Notes
+    -----
+    All threads share the same model and features, so the model must be thread
+    safe. NEURON and NEST models are not.
+    """
+    name = "thread"
+
+    def __init__(self, CPUs=None):
+        super(ThreadExecutor, self).__init__(CPUs=CPUs)
+
+        self._pool = None
+        self._parallel = None
+        self._started = None
+
+
+    def __del__(self):
+        if getattr(self, "_pool", None) is not None:
+            self._pool.terminate()
+
+
+    def start(self, parallel, initializer=None, initargs=()):
+        super(ThreadExecutor, self).start(parallel, initializer=initializer, initargs=initargs)
+
+        self._parallel = parallel
+
+
+    def _worker_state(self, parallel, initializer, initargs):
+        # The model and features are shared with the current process,
+        # so changes to them do not require the workers to be restarted.
+        # New model or features objects must be set up again.
+        objects = (parallel.model, parallel.features, initializer) + tuple(initargs)
+
+        return objects, (self.CPUs, len(initargs))
+
+
+    def _start(self, parallel, initializer, initargs):
+        # The threads share the model and features, so they are only set up once
+        self.setup_times.append(parallel.setup_worker())
+        self._started = parallel
+
+        self._pool = multiprocess.dummy.Pool(processes=self.CPUs,
+                                             initializer=initializer,
+                                             initargs=initargs)
+
+
+    def _close(self):
+        self._pool.close()
+        self._pool.join()
+
+        self._started.teardown_worker()
+
+        self._pool = None
+        self._started = None
+        self._parallel = None
+
+
+    def imap(self, model_parameters, max_inflight=None, time_grids=None):
+        return _pool_imap(self._pool,
+                          functools.partial(self._parallel.evaluate, time_grids=time_grids),
+                          model_parameters,
+                          max_inflight)
+
+
+    def imap_batches(self, batches, max_inflight=None, time_grids=None):
+        return _pool_imap(self._pool,
+                          functools.partial(self._parallel.evaluate_batch, time_grids=time_grids),
+                          batches,
+                          max_inflight)
+
+
+
+class ProcessExecutor(Executor):
+    """
+    Evaluate the model in a pool of worker processes on the current computer.
+
+    The model and features are sent once to each worker process when the pool
+    is started.
+
+    Parameters
+    ----------
+    CPUs : {None, int}, optional
+        The number of worker processes. If None, the number of CPUs on the
+        computer (multiprocess.cpu_count()) is used.
+        Default is None.
+    memmap_threshold : {None, int}, optional
+        Numerical arrays in the model and feature results larger than this
+        number of bytes are sent from the workers through memory-mapped
+        files instead of being pickled. If None, all results are pickled.
+        Default is None.
+    scratch_folder : {None, str}, optional
+        The folder where the memory-mapped files are stored. If None,
+        ``/dev/shm`` is used if it exists, otherwise the temporary folder of
+        the system.
+        Default is None.
+
+    Notes
+    -----
+    Memory-mapped files reduce the time spent pickling and sending large
+    results, such as the 2D spike matrices of network models, between the
+    processes. The files are removed as soon as the results are loaded, and
+    the scratch folder is removed when the executor is closed.
+    """
+    name = "process"
+
+    def __init__(self, CPUs=None, memmap_threshold=None, scratch_folder=None):
+        super(ProcessExecutor, self).__init__(CPUs=CPUs)
+
+        self.memmap_threshold = memmap_threshold
+        self.scratch_folder = scratch_folder
+
+        self._pool = None
+        self._folder = None
+
+
+    def __del__(self):
+        # Do not wait for running evaluations when the object is garbage collected
+        if getattr(self, "_pool", None) is not None:
+            self._pool.terminate()
+
+        if getattr(self, "_folder", None) is not None:
+            shutil.rmtree(self._folder, ignore_errors=True)
+
+
+    def _worker_state(self, parallel, initializer, initargs):
+        objects, settings = super(ProcessExecutor, self)._worker_state(parallel, initializer, initargs)
+
+        return objects, settings + (self.memmap_threshold, self.scratch_folder)
+
+
+    def _start(self, parallel, initializer, initargs):
+        scratch = None
+        if self.memmap_threshold is not None:
+            scratch_folder = self.scratch_folder
+            if scratch_folder is None:
+                scratch_folder = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+            self._folder = tempfile.mkdtemp(prefix="uncertainpy_", dir=scratch_folder)
+            scratch = (self._folder, self.memmap_threshold)
+
+        self._pool = mp.Pool(processes=self.CPUs,
+                             initializer=_init_worker,
+                             initargs=(parallel, initializer, initargs, scratch))
+
+
+    def _close(self):
+        self._pool.close()
+        self._pool.join()
+
+        self._pool = None
+
+        if self._folder is not None:
+            shutil.rmtree(self._folder, ignore_errors=True)
+            self._folder = None
+
+
+    def imap(self, model_parameters, max_inflight=None, time_grids=None):
+        results = self._collect(_pool_imap(self._pool,
+                                           functools.partial(_run_node, time_grids=time_grids),
+                                           model_parameters,
+                                           max_inflight))
+
+        if self._folder is None:
+            return results
+
+        return ((_load_arrays(result), error) for result, error in results)
+
+
+    def imap_batches(self, batches, max_inflight=None, time_grids=None):
+        results = self._collect(_pool_imap(self._pool,
+                                           functools.partial(_run_batch, time_grids=time_grids),
+                                           batches,
+                                           max_inflight))
+
+        if self._folder is None:
+            return results
+
+        return ([(_load_arrays(result), error) for result, error in batch_results]
+                for batch_results in results)
+
+
+
+class MPIExecutor(Executor):
+    """
+    Evaluate the model in a pool of MPI processes, which can span several
+    computers.
+
+    Parameters
+    ----------
+    CPUs : {None, int}, optional
+        The number of MPI worker processes. If None, the universe size of the
+        MPI environment is used.
+        Default is None.
+
+    Raises
+    ------
+    ImportError
+        If mpi4py is not installed.
+
+    Notes
+    -----
+    Objects are sent between the MPI processes using dill, so models and
+    features defined as functions are supported. The pickler of mpi4py is
+    set to dill once, when ``uncertainpy.core.executors`` is imported, and
+    this applies to all use of mpi4py in the process.
+
+    The worker processes are either spawned dynamically, or, when this is not
+    supported by the MPI implementation, started together with the main
+    process using the ``mpi4py.futures`` module::
+
+        mpirun -n 17 python -m mpi4py.futures uq_script.py
+
+    which uses one process to run the script and 16 worker processes.
+    """
+    name = "mpi"
+
+    def __init__(self, CPUs=None):
+        if not prerequisites:
+            raise ImportError("The mpi backend requires: mpi4py")
+
+        super(MPIExecutor, self).__init__(CPUs=CPUs)
+
+        self._executor = None
+
+
+    def _start(self, parallel, initializer, initargs):
+        self._executor = MPIPoolExecutor(max_workers=self.CPUs,
+                                         initializer=_init_worker,
+                                         initargs=(parallel, initializer, initargs))
+
+
+    def _close(self):
+        self._executor.shutdown(wait=True)
+
+        self._executor = None
+
+
+    def imap(self, model_parameters, max_inflight=None, time_grids=None):
+        return self._collect(self._map(functools.partial(_run_node, time_grids=time_grids),
+                                       model_parameters,
+                                       max_inflight))
+
+
+    def imap_batches(self, batches, max_inflight=None, time_grids=None):
+        return self._collect(self._map(functools.partial(_run_batch, time_grids=time_grids),
+                                       batches,
+                                       max_inflight))
+
+
+    def _map(self, function, items, max_inflight):
+        if max_inflight is None:
+            return self._executor.map(function, items)
+
+        return _bounded_imap(lambda item: self._executor.submit(function, item).result,
+                             items,
+                             max_inflight)
+
+
+
+executors = {SerialExecutor.name: SerialExecutor,
+             ThreadExecutor.name: ThreadExecutor,
+             ProcessExecutor.name: ProcessExecutor,
+             MPIExecutor.name: MPIExecutor}
+
+
+def create_executor(backend, CPUs=None, memmap_threshold=None, scratch_folder=None):
+    """
+    Create the executor for a backend.
+
+    Parameters
+    ----------
+    backend : {"serial", "thread", "process", "mpi", Executor}
+        The name of the backend, or an Executor instance which is returned
+        unchanged.
+    CPUs : {None, int}, optional
+        The number of workers used by the executor.
+        Default is None.
+    memmap_threshold : {None, int}, optional
+        The size in bytes above which arrays are sent from the workers through
+        memory-mapped files, see ProcessExecutor. Only supported by the
+        "process" backend.
+        Default is None.
+    scratch_folder : {None, str}, optional
+        The folder where the memory-mapped files are stored, see
+        ProcessExecutor. Only used by the "process" backend.
+        Default is None.
+
+    Returns
+    -------
+    executor : Executor
+        The executor for `backend`.
+
+    Raises
+    ------
+    ValueError
+        If `backend` is not one of "serial", "thread", "process" or "mpi".
+    ValueError
+        If `memmap_threshold` is given for another backend than "process".
+    """
+    if isinstance(backend, Executor):
+        return backend
+
+    if backend not in executors:
+        raise ValueError("No backend with name {}. ".format(backend)
+                         + "Supported backends are: {}".format(", ".join(sorted(executors))))
+
+    if backend == ProcessExecutor.name:
+        return ProcessExecutor(CPUs=CPUs,
+                               memmap_threshold=memmap_threshold,
+                               scratch_folder=scratch_folder)
+
+    if memmap_threshold is not None:
+        raise ValueError("memmap_threshold is only supported by the process backend")
+
+    return executors[backend](CPUs=CPUs)
@@ -0,0 +1,160 @@
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import os
+import hashlib
+
+from .cache import _parameters
+from ..utils import create_logger
+
+
+class ModelOutputs(object):
+    """
+    Store the raw output of each model evaluation, everything returned by the
+    model function including the info objects, so the features can be
+    recalculated later without running the model again.
+
+    Each model output is stored in a pickle file in `folder`, identified by a
+    hash of the name of the model and the values of all model parameters.
+
+    Parameters
+    ----------
+    folder : str
+        The folder to store the model outputs in. Creates the folder if it
+        does not exist.
+    verbose_level : {"info", "debug", "warning", "error", "critical"}, optional
+        Set the threshold for the logging level.
+        Logging messages less severe than this level is ignored.
+        Default is `"info"`.
+    verbose_filename : {None, str}, optional
+        Sets logging to a file with name `verbose_filename`.
+        No logging to screen if set. Default is None.
+
+    Attributes
+    ----------
+    folder : str
+        The folder the model outputs are stored in.
+    logger : logging.Logger
+        Logger object responsible for logging to screen or file.
+
+    Notes
+    -----
+    Model outputs are matched by the values of the model parameters, so to
+    reuse the model outputs the same nodes must be created, for example by
+    using the same seed. Changes to the model are not detected, call ``clear``
+    when the model is changed.
+    """
+    def __init__(self,
+                 folder,
+                 verbose_level="info",
+                 verbose_filename=None):
+
+        self.folder = folder
+
+        self.logger = create_logger(verbose_level,
+                                    verbose_filename,
+                                    self.__class__.__name__)
+
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+
+    def __contains__(self, key):
+        return os.path.isfile(self._path(key))
+
+
+    def __len__(self):
+        return len([filename for filename in os.listdir(self.folder) if filename.endswith(".pickle")])
+
+
+    def key(self, model_name, model_parameters):
+        """
+        Create the key identifying a model output.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the model.
+        model_parameters : dictionary
+            All model parameters as a dictionary.
+
+        Returns
+        -------
+        key : str
+            A hexadecimal hash identifying the model output.
+        """
+        identifier = repr((model_name, _parameters(model_parameters)))
+
+        return hashlib.sha1(identifier.encode("utf-8")).hexdigest()
+
+
+    def load(self, key):
+        """
+        Load a stored model output.
+
+        Parameters
+        ----------
+        key : str
+            The key identifying the model output.
+
+        Returns
+        -------
+        model_result : {tuple, None}
+            The output of the model function, or None if no model output is
+            stored for `key`.
+        """
+        path = self._path(key)
+
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            self.logger.warning("Unable to read stored model output: {}".format(path))
+
+            return None
+
+
+    def save(self, key, model_result):
+        """
+        Store a model output.
+
+        Parameters
+        ----------
+        key : str
+            The key identifying the model output.
+        model_result : tuple
+            The output of the model function.
+
+        Notes
+        -----
+        Model outputs that can not be pickled are not stored, and a warning
+        is given.
+        """
+        path = self._path(key)
+
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(model_result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            self.logger.warning("Unable to store model output: {}: {}".format(error.__class__.__name__, error))
+
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+    def clear(self):
+        """
+        Remove all stored model outputs.
+        """
+        for filename in os.listdir(self.folder):
+            if filename.endswith(".pickle"):
+                os.remove(os.path.join(self.folder, filename))
+
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + ".pickle")
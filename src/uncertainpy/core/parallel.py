@@ -1,9 +1,54 @@
+import time
 import traceback
+import signal
+import threading
+import cProfile
 
 import numpy as np
 import scipy.interpolate as scpi
 
 from .base import Base
+from ..utils import SpikeTrains
+
+
+def _to_array(values):
+    """
+    Convert `values` to an array. Ragged sequences, which newer versions of
+    NumPy refuse to convert, are converted to a one dimensional object array,
+    as in older versions of NumPy.
+    """
+    try:
+        return np.array(values)
+    except ValueError:
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+
+        return array
+
+
+class EvaluationTimeoutError(Exception):
+    """
+    Raised when a model evaluation takes longer than the timeout.
+    """
+    pass
+
+
+class StoredModelResult(object):
+    """
+    A stored output of the model function. Parallel calculates the features
+    from the stored output instead of running the model, when given an
+    instance of this class instead of the model parameters.
+
+    Parameters
+    ----------
+    model_result : tuple
+        The output of the model function.
+    """
+    def __init__(self, model_result):
+        self.model_result = model_result
+
+
 
 class Parallel(Base):
     """
@@ -29,6 +74,36 @@ class Parallel(Base):
         Sets logging to a file with name `verbose_filename`.
         No logging to screen if a filename is given.
         Default is None.
+    timeout : {None, float}, optional
+        The maximum time in seconds a single model evaluation, including the
+        calculation of the features, is allowed to take. If None, there is no
+        time limit.
+        Default is None.
+    retries : int, optional
+        The number of times a failed or timed out model evaluation is retried
+        before it is given up.
+        Default is 0.
+    on_error : {"raise", "nan"}, optional
+        What to do when a model evaluation has failed after all retries.
+        "raise" prints the stack trace and re-raises the exception, aborting
+        the uncertainty quantification. "nan" records the evaluation as
+        failed, and the model and all features get numpy.nan as result
+        for that evaluation.
+        Default is "raise".
+    time_grids : {None, dict}, optional
+        A dictionary with the name of adaptive model/features as keys and a
+        common time grid as values. Adaptive model/features in `time_grids`
+        are interpolated onto their time grid directly after the evaluation,
+        instead of returning the interpolation object.
+        Default is None.
+    profile : bool, optional
+        If each model evaluation should be profiled with cProfile. The profile
+        statistics are added to the result of the evaluation.
+        Default is False.
+    store_model_results : bool, optional
+        If the raw output of the model function should be added to the result
+        of each model evaluation, so it can be stored.
+        Default is False.
 
     Attributes
     ----------
@@ -36,6 +111,36 @@ class Parallel(Base):
     features : uncertainpy.Parallel.features
     logger : logging.Logger
         Logger object responsible for logging to screen or file.
+    timeout : {None, float}
+        The maximum time in seconds a single model evaluation is allowed
+        to take.
+    retries : int
+        The number of times a failed model evaluation is retried.
+    on_error : {"raise", "nan"}
+        What to do when a model evaluation has failed after all retries.
+    time_grids : {None, dict}
+        The common time grid for each adaptive model/feature that is
+        interpolated directly after the evaluation.
+    profile : bool
+        If each model evaluation is profiled with cProfile.
+    store_model_results : bool
+        If the raw output of the model function is added to the result of
+        each model evaluation.
+
+    Raises
+    ------
+    ValueError
+        If `on_error` is not "raise" or "nan".
+
+    Notes
+    -----
+    The timeout is implemented with the SIGALRM signal, and is therefore only
+    available on Unix, and only when the model is evaluated in the main
+    thread of a process (all backends except "thread"). Otherwise the model
+    is evaluated without a timeout, and a warning is logged the first time.
+    The signal is only handled when the control returns to the Python
+    interpreter, so a model stuck inside a single call to compiled code is
+    not interrupted.
 
     See Also
     --------
@@ -43,7 +148,70 @@ class Parallel(Base):
     uncertainpy.models.Model
     uncertainpy.models.Model.run : Requirements for the model run function.
     """
-    def create_interpolations(self, result):
+    def __init__(self,
+                 model=None,
+                 features=None,
+                 verbose_level="info",
+                 verbose_filename=None,
+                 timeout=None,
+                 retries=0,
+                 on_error="raise",
+                 time_grids=None,
+                 profile=False,
+                 store_model_results=False):
+
+        if on_error not in ["raise", "nan"]:
+            raise ValueError("on_error must be either 'raise' or 'nan', not {}".format(on_error))
+
+        super(Parallel, self).__init__(model=model,
+                                       features=features,
+                                       verbose_level=verbose_level,
+                                       verbose_filename=verbose_filename)
+
+        self.timeout = timeout
+        self.retries = retries
+        self.on_error = on_error
+        self.time_grids = time_grids
+        self.profile = profile
+        self.store_model_results = store_model_results
+
+        # If the warning that the timeout is unsupported has been logged
+        self._timeout_warned = False
+
+
+    def setup_worker(self):
+        """
+        Perform the one-time setup of the model and features in a worker, by
+        calling ``model.setup_worker`` and ``features.setup_worker``.
+
+        Returns
+        -------
+        setup_time : float
+            The time in seconds spent in the setup.
+        """
+        start = time.time()
+
+        if self.model is not None:
+            self.model.setup_worker()
+
+        self.features.setup_worker()
+
+        return time.time() - start
+
+
+    def teardown_worker(self):
+        """
+        Clean up after the one-time setup of the model and features in a
+        worker, by calling ``model.teardown_worker`` and
+        ``features.teardown_worker``.
+        """
+        if self.model is not None:
+            self.model.teardown_worker()
+
+        self.features.teardown_worker()
+
+
+    def create_interpolations(self, result, time_grids=None):
         """
         Create an interpolation for adaptive model and features `result`.
 
@@ -78,6 +246,11 @@ class Parallel(Base):
                           "feature_invalid": {"values": np.nan,
                                               "time": np.nan}}
 
+        time_grids : {None, dict}, optional
+            The common time grid of each adaptive model/feature, see
+            `time_grids`. If None, `time_grids` of this object is used.
+            Default is None.
+
         Returns
         -------
         result : dict
@@ -111,7 +284,13 @@ class Parallel(Base):
         to be able to create the polynomial approximation.
         For 1D results this is done with scipy:
         ``InterpolatedUnivariateSpline(time, U, k=3)``.
+        If a common time grid for the model/feature is given in `time_grids`,
+        the interpolation is evaluated on the time grid, and the interpolated
+        values and the time grid replace ``"values"`` and ``"time"``.
+        No interpolation object is then added.
         """
+        if time_grids is None:
+            time_grids = self.time_grids
 
         for feature in result:
             if np.ndim(result[feature]["values"]) == 0:
@@ -130,7 +309,16 @@ class Parallel(Base):
                     interpolation = scpi.InterpolatedUnivariateSpline(result[feature]["time"],
                                                                       result[feature]["values"],
                                                                       k=3)
-                    result[feature]["interpolation"] = interpolation
+
+                    # Evaluate the interpolation here if the time grid is
+                    # known, so only the values are sent back to RunModel
+                    if time_grids is not None and feature in time_grids:
+                        time_grid = time_grids[feature]
+
+                        result[feature]["values"] = interpolation(time_grid)
+                        result[feature]["time"] = time_grid
+                    else:
+                        result[feature]["interpolation"] = interpolation
 
 
             if np.ndim(result[feature]["values"]) >= 2:
@@ -144,7 +332,7 @@ class Parallel(Base):
 
 
 
-    def run(self, model_parameters):
+    def run(self, model_parameters, time_grids=None):
         """
         Run a model and calculate features from the model output,
         return the results.
@@ -158,9 +346,15 @@ class Parallel(Base):
 
         Parameters
         ----------
-        model_parameters : dictionary
+        model_parameters : {dictionary, StoredModelResult}
             All model parameters as a dictionary.
             These parameters are sent to model.run().
+            If a StoredModelResult, the features are calculated from the
+            stored output of the model function, without running the model.
+        time_grids : {None, dict}, optional
+            The common time grid of each adaptive model/feature, see
+            `time_grids`. If None, `time_grids` of this object is used.
+            Default is None.
 
         Returns
         -------
@@ -168,7 +362,13 @@ class Parallel(Base):
             The model and feature results. The model and each feature each has
             a dictionary with the time values, ``"time"``,  and model/feature results, ``"values"``.
             If an interpolation has been created, those features/model also has
-            ``"interpolation"`` added. An example:
+            ``"interpolation"`` added. The model dictionary additionally has
+            ``"timings"``, a dictionary with the time in seconds spent in each
+            phase of the evaluation (``"run"``, ``"validate"``,
+            ``"postprocess"``, ``"preprocess"``, ``"feature: <feature name>"``
+            for each feature, and ``"interpolation"``). If `store_model_results`
+            is True, the model dictionary also has ``"model_result"``, the raw
+            output of the model function. An example:
 
             .. code-block:: Python
 
@@ -203,57 +403,370 @@ class Parallel(Base):
         """
         # Try-except to catch exceptions and print stack trace
         try:
-            model_result = self.model.run(**model_parameters)
+            return self._run(model_parameters, time_grids)
+
+        except Exception as error:
+            print("Caught exception in parallel run of model:")
+            print("")
+            traceback.print_exc()
+            print("")
+            raise error
+
+
+    def _run(self, model_parameters, time_grids=None):
+        """
+        Run a model and calculate features from the model output, without
+        catching any exceptions. See Parallel.run.
+        """
+        if isinstance(model_parameters, StoredModelResult):
+            return self._calculate(model_parameters.model_result, time_grids=time_grids)
+
+        # A vectorized model is run as a batch with a single parameter set
+        if self.model.vectorized:
+            return self._run_batch([model_parameters], time_grids)[0]
+
+        start = time.time()
+        model_result = self.model.run(**model_parameters)
+        elapsed = time.time() - start
+
+        results = self._calculate(model_result, {"run": elapsed}, time_grids)
+
+        if self.store_model_results:
+            results[self.model.name]["model_result"] = model_result
+
+        return results
+
+
+    def _run_batch(self, batch, time_grids=None):
+        """
+        Run a vectorized model for a batch of model parameters, and calculate
+        the features for each set of model parameters, without catching any
+        exceptions.
+        """
+        parameters = {}
+        for name in batch[0]:
+            parameters[name] = np.array([model_parameters[name] for model_parameters in batch])
+
+        start = time.time()
+        model_result = self.model.run(**parameters)
+
+        self.model.validate_run_result(model_result)
+
+        model_results = self.model.split_run_result(model_result, len(batch))
+
+        # The time of the batch is shared equally between the model evaluations
+        elapsed = (time.time() - start)/len(batch)
+
+        batch_results = []
+        for model_result in model_results:
+            results = self._calculate(model_result, {"run": elapsed}, time_grids)
+
+            if self.store_model_results:
+                results[self.model.name]["model_result"] = model_result
+
+            batch_results.append(results)
+
+        return batch_results
+
+
+    def _calculate(self, model_result, timings=None, time_grids=None):
+        """
+        Postprocess the model result and calculate the features for a single
+        model evaluation, without catching any exceptions.
+
+        The time in seconds spent in each phase is added to `timings`, which
+        is stored as ``results[model.name]["timings"]``. The time of each
+        feature is stored as ``"feature: <feature name>"``.
+        """
+        if timings is None:
+            timings = {}
+
+        start = time.time()
+        self.model.validate_run_result(model_result)
+        timings["validate"] = time.time() - start
+
+        results = {}
+
+
+        start = time.time()
+        postprocess_result = self.model.postprocess(*model_result)
+
+        try:
+            time_postprocess, values_postprocess = postprocess_result
+        except (ValueError, TypeError) as error:
+            msg = "model.postprocess() must return time and values (return time, values | return None, values)"
+            if not error.args:
+                error.args = ("",)
+            error.args = error.args + (msg,)
+            raise
+
+        values_postprocess = self.none_to_nan(values_postprocess)
+        time_postprocess = self.none_to_nan(time_postprocess)
+        timings["postprocess"] = time.time() - start
+
+        results[self.model.name] = {"time": time_postprocess,
+                                    "values": values_postprocess}
+
+
+        # Calculate features from the model results
+        start = time.time()
+        feature_preprocess = self.features.preprocess(*model_result)
+        timings["preprocess"] = time.time() - start
+
+        feature_results, feature_timings = self.features.calculate_features_with_timings(*feature_preprocess)
+
+        for feature in feature_timings:
+            timings["feature: " + feature] = feature_timings[feature]
+
+        for feature in feature_results:
+            time_feature = feature_results[feature]["time"]
+            values_feature = feature_results[feature]["values"]
+
+            time_feature = self.none_to_nan(time_feature)
+            values_feature = self.none_to_nan(values_feature)
+
+            results[feature] = {"values": values_feature,
+                                "time": time_feature}
 
-            self.model.validate_run_result(model_result)
+        # Create interpolations
+        start = time.time()
+        results = self.create_interpolations(results, time_grids)
+        timings["interpolation"] = time.time() - start
 
-            results = {}
+        results[self.model.name]["timings"] = timings
 
+        return results
 
-            postprocess_result = self.model.postprocess(*model_result)
 
+
+    def _run_timeout(self, model_parameters, nr_evaluations=1, time_grids=None):
+        """
+        Run a model and calculate features from the model output, and raise an
+        EvaluationTimeoutError if it takes longer than `timeout` for each of
+        the `nr_evaluations`. A list of model parameters is run as a batch.
+        """
+        if isinstance(model_parameters, list):
+            run = self._run_batch
+        else:
+            run = self._run
+
+        if self.timeout is None:
+            return run(model_parameters, time_grids)
+
+        if not hasattr(signal, "SIGALRM") \
+                or not isinstance(threading.current_thread(), threading._MainThread):
+            # Only warn once, instead of for each model evaluation
+            if not self._timeout_warned:
+                self.logger.warning("Timeout is only supported in the main thread "
+                                    + "of a process on Unix. Running without a timeout.")
+                self._timeout_warned = True
+
+            return run(model_parameters, time_grids)
+
+        timeout = self.timeout*nr_evaluations
+
+        def handler(signum, frame):
+            raise EvaluationTimeoutError("Model evaluation timed out after {} s".format(timeout))
+
+        previous_handler = signal.signal(signal.SIGALRM, handler)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+        try:
+            return run(model_parameters, time_grids)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+    def evaluate(self, model_parameters, time_grids=None):
+        """
+        Run a model and calculate features from the model output, with the
+        timeout, retries and error policy given by `timeout`, `retries`
+        and `on_error`.
+
+        Parameters
+        ----------
+        model_parameters : {dictionary, StoredModelResult}
+            All model parameters as a dictionary.
+            These parameters are sent to model.run().
+            If a StoredModelResult, the features are calculated from the
+            stored output of the model function, see Parallel.run.
+        time_grids : {None, dict}, optional
+            The common time grid of each adaptive model/feature, see
+            `time_grids`. If None, `time_grids` of this object is used.
+            Default is None.
+
+        Returns
+        -------
+        result : {dictionary, None}
+            The model and feature results, see Parallel.run.
+            None if the evaluation failed and ``on_error="nan"``.
+        error : {None, str}
+            None if the evaluation succeeded, otherwise a description of the
+            error that caused the last attempt to fail.
+
+        Raises
+        ------
+        Exception
+            The exception from the last attempt if the evaluation failed
+            and ``on_error="raise"``.
+
+        Notes
+        -----
+        If `profile` is True, the evaluation is profiled with cProfile, and
+        the profile statistics (the ``stats`` dictionary of the profiler) are
+        added to the model result as ``"profile"``. Failed evaluations are
+        not included in the profile.
+
+        See also
+        --------
+        uncertainpy.Parallel.run
+        """
+        if not self.profile:
+            return self._evaluate(model_parameters, time_grids)
+
+        (result, error), stats = self._profile(self._evaluate, model_parameters, time_grids)
+
+        self._add_profile([(result, error)], stats)
+
+        return result, error
+
+
+    def _evaluate(self, model_parameters, time_grids=None):
+        """
+        Run a model and calculate features from the model output, with the
+        timeout, retries and error policy, without profiling.
+        See Parallel.evaluate.
+        """
+        for attempt in range(self.retries + 1):
             try:
-                time_postprocess, values_postprocess = postprocess_result
-            except (ValueError, TypeError) as error:
-                msg = "model.postprocess() must return time and values (return time, values | return None, values)"
-                if not error.args:
-                    error.args = ("",)
-                error.args = error.args + (msg,)
-                raise
+                return self._run_timeout(model_parameters, time_grids=time_grids), None
 
-            values_postprocess = self.none_to_nan(values_postprocess)
-            time_postprocess = self.none_to_nan(time_postprocess)
+            except Exception as error:
+                message = "{}: {}".format(error.__class__.__name__, error)
 
-            results[self.model.name] = {"time": time_postprocess,
-                                        "values": values_postprocess}
+                if attempt < self.retries:
+                    self.logger.warning("Model evaluation failed, retrying "
+                                        + "({}/{}). {}".format(attempt + 1, self.retries, message))
 
+                elif self.on_error == "raise":
+                    print("Caught exception in parallel run of model:")
+                    print("")
+                    traceback.print_exc()
+                    print("")
+                    raise
 
-            # Calculate features from the model results
-            feature_preprocess = self.features.preprocess(*model_result)
-            feature_results = self.features.calculate_features(*feature_preprocess)
+                else:
+                    self.logger.warning("Model evaluation failed, the result is set "
+                                        + "to nan. {}".format(message))
 
-            for feature in feature_results:
-                time_feature = feature_results[feature]["time"]
-                values_feature = feature_results[feature]["values"]
+                    return None, message
 
-                time_feature = self.none_to_nan(time_feature)
-                values_feature = self.none_to_nan(values_feature)
 
-                results[feature] = {"values": values_feature,
-                                    "time": time_feature}
 
-            # Create interpolations
-            results = self.create_interpolations(results)
+    def evaluate_batch(self, batch, time_grids=None):
+        """
+        Run a vectorized model for a batch of model parameters and calculate
+        the features for each set of model parameters, with the timeout,
+        retries and error policy given by `timeout`, `retries` and `on_error`.
+
+        Parameters
+        ----------
+        batch : list
+            A list where each element is a dictionary with all model parameters
+            for a single model evaluation. The parameters are sent to
+            model.run() as arrays with one value for each model evaluation.
+        time_grids : {None, dict}, optional
+            The common time grid of each adaptive model/feature, see
+            `time_grids`. If None, `time_grids` of this object is used.
+            Default is None.
+
+        Returns
+        -------
+        results : list
+            A list with a ``(result, error)`` tuple for each set of model
+            parameters in the batch, see Parallel.evaluate.
+
+        Raises
+        ------
+        Exception
+            The exception from the last attempt if an evaluation failed
+            and ``on_error="raise"``.
+
+        Notes
+        -----
+        Models that are not vectorized are evaluated separately for each set
+        of model parameters. The timeout for the batch is `timeout` times the number of model
+        evaluations in the batch. If the batch fails, each set of model
+        parameters is evaluated separately, so a single failing set of model
+        parameters does not cause the whole batch to fail. If `profile` is
+        True, the batch is profiled as a whole, and the profile statistics are
+        added to the first successful result in the batch.
+
+        See also
+        --------
+        uncertainpy.Parallel.evaluate
+        uncertainpy.models.Model.run : Requirements for vectorized models.
+        """
+        if len(batch) == 1 or not self.model.vectorized:
+            return [self.evaluate(model_parameters, time_grids) for model_parameters in batch]
+
+        if not self.profile:
+            return self._evaluate_batch(batch, time_grids)
+
+        results, stats = self._profile(self._evaluate_batch, batch, time_grids)
+
+        self._add_profile(results, stats)
 
-            return results
+        return results
 
 
+    def _evaluate_batch(self, batch, time_grids=None):
+        """
+        Run a vectorized model for a batch of model parameters, with the
+        timeout, retries and error policy, without profiling.
+        See Parallel.evaluate_batch.
+        """
+        try:
+            results = self._run_timeout(batch, nr_evaluations=len(batch), time_grids=time_grids)
+
         except Exception as error:
-            print("Caught exception in parallel run of model:")
-            print("")
-            traceback.print_exc()
-            print("")
-            raise error
+            self.logger.warning("Evaluation of a batch of {} model parameters ".format(len(batch))
+                                + "failed, evaluating each separately. "
+                                + "{}: {}".format(error.__class__.__name__, error))
+
+            return [self._evaluate(model_parameters, time_grids) for model_parameters in batch]
+
+        return [(result, None) for result in results]
+
+
+    def _profile(self, function, *args):
+        """
+        Call `function` with cProfile enabled, and return the output of
+        `function` and the profile statistics.
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        try:
+            output = function(*args)
+        finally:
+            profiler.disable()
+
+        profiler.create_stats()
+
+        return output, profiler.stats
+
+
+    def _add_profile(self, results, stats):
+        """
+        Add the profile statistics to the first successful result in a list
+        of ``(result, error)`` tuples.
+        """
+        for result, error in results:
+            if result is not None:
+                result[self.model.name]["profile"] = stats
+                return
 
 
     def none_to_nan(self, values):
@@ -289,8 +802,100 @@ class Parallel(Base):
                     [  1.,   2.,   3.],
                     [ nan,  nan,  nan],
                     [  1.,   2.,   3.]]])
+
+        Notes
+        -----
+        Numerical arrays (and lists of numbers) without None are returned
+        without being copied, and sequences where each element is either None
+        or a numerical array of the same shape are converted by filling a
+        preallocated array. Other values are converted element by element.
+        SpikeTrains objects are returned unchanged.
+        """
+        if isinstance(values, SpikeTrains):
+            return values
+
+        # Fast path for results that already are regular numerical arrays
+        if isinstance(values, np.ndarray) and values.dtype.kind in "biufc":
+            if values.size > 0 and values.ndim > 0:
+                return values
+
+        elif isinstance(values, (list, tuple)) and len(values) > 0:
+            # Ragged sequences, or sequences containing None, raise an error
+            # in newer versions of NumPy, and are converted below
+            try:
+                array = np.asarray(values)
+            except (ValueError, TypeError):
+                array = None
+
+            if array is not None and array.dtype.kind in "biufc" and array.size > 0:
+                return array
+
+        if (isinstance(values, (list, tuple)) and len(values) > 0) \
+                or (isinstance(values, np.ndarray) and values.dtype == object and values.ndim > 0 and len(values) > 0):
+            try:
+                result = self._fill_none(values)
+            except ValueError:
+                result = None
+
+            if result is not None:
+                return result
+
+        return self._none_to_nan(values)
+
+
+    def _fill_none(self, values):
+        """
+        Convert a sequence where each element is either None or a numerical
+        array (or number) of the same shape, by filling an array of numpy.nan
+        with the elements that are not None.
+        Returns None if `values` is not on this form.
+        """
+        is_none = np.array([value is None for value in values], dtype=bool)
+
+        if np.all(is_none):
+            return np.full(len(values), np.nan)
+
+        # Sequences of numbers and None are converted in a single operation
+        if np.ndim(values[np.argmin(is_none)]) == 0:
+            array = np.array(values, dtype=object)
+
+            if array.ndim == 1:
+                array[is_none] = np.nan
+
+                try:
+                    return array.astype(float)
+                except (TypeError, ValueError):
+                    pass
+
+        elements = []
+        for value, none in zip(values, is_none):
+            if not none:
+                element = np.asarray(self.none_to_nan(value))
+
+                if element.dtype.kind not in "biufc":
+                    return None
+
+                elements.append(element)
+
+        shape = elements[0].shape
+        for element in elements:
+            if element.shape != shape:
+                return None
+
+        dtype = np.result_type(float, *[element.dtype for element in elements])
+
+        result = np.full((len(values),) + shape, np.nan, dtype=dtype)
+        result[~is_none] = np.stack(elements)
+
+        return result
+
+
+    def _none_to_nan(self, values):
+        """
+        Convert None values in `values` to arrays of numpy.nan, element by
+        element. See Parallel.none_to_nan.
         """
-        values_list = np.array(values).tolist()
+        values_list = _to_array(values).tolist()
 
         if values is None:
             values_list = np.nan
@@ -318,5 +923,5 @@ class Parallel(Base):
                 return values_list
 
 
-        return np.array(values_list)
+        return _to_array(values_list)
 
@@ -6,6 +6,10 @@ try:
 except ImportError:
     prerequisites = False
 
+import time
+import pstats
+import itertools
+
 from tqdm import tqdm
 
 import numpy as np
@@ -13,7 +17,55 @@ import multiprocess as mp
 
 from ..data import Data
 from .base import ParameterBase
-from .parallel import Parallel
+from .parallel import Parallel, StoredModelResult
+from .executors import create_executor, ThreadExecutor, ProcessExecutor
+from .checkpoint import Checkpoint
+from .model_outputs import ModelOutputs
+from .assembler import ResultAssembler
+from ..models import Model
+from ..features import Features
+from ..utils import SpikeTrains
+
+
+class _ProfileStats(object):
+    """
+    The profile statistics of a model evaluation, in the form pstats.Stats
+    loads profile statistics from.
+    """
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def _result_size(result):
+    """
+    Estimate the memory in bytes used by the model and feature results of a
+    single model evaluation, from the size of the values and time arrays.
+    """
+    size = 0
+    for feature in result:
+        for key in ["values", "time"]:
+            value = result[feature][key]
+
+            if isinstance(value, SpikeTrains):
+                size += value.times.nbytes + value.offsets.nbytes
+            else:
+                size += np.asarray(value).nbytes
+
+    return size
+
+
+def _implements(obj, base, method):
+    """
+    If `obj` reimplements `method` of its base class `base`.
+    """
+    function = getattr(type(obj), method, None)
+    base_function = getattr(base, method)
+
+    return getattr(function, "__func__", function) is not getattr(base_function, "__func__", base_function)
+
 
 
 class RunModel(ParameterBase):
@@ -46,6 +98,105 @@ class RunModel(ParameterBase):
     CPUs : int, optional
         The number of CPUs to use when calculating the model and features.
         Default is number of CPUs on the computer (multiprocess.cpu_count()).
+    backend : {"process", "thread", "serial", "mpi", Executor}, optional
+        The backend used to evaluate the model. "process" uses a pool of
+        worker processes, "thread" a pool of threads, "serial" evaluates
+        the model in the current process, and "mpi" uses a pool of MPI
+        processes (requires mpi4py). An Executor instance can also be given,
+        in which case `CPUs` is ignored.
+        Default is "process".
+    initializer : {None, callable}, optional
+        A function that is called once in each worker when the backend is
+        started, for example to perform expensive setup that
+        should not be repeated for each model evaluation.
+        Default is None.
+    initargs : tuple, optional
+        Arguments sent to `initializer`.
+        Default is ``()``.
+    timeout : {None, float}, optional
+        The maximum time in seconds a single model evaluation, including the
+        calculation of the features, is allowed to take. If None, there is no
+        time limit. The timeout is not supported by the "thread" backend.
+        Default is None.
+    retries : int, optional
+        The number of times a failed or timed out model evaluation is retried
+        before it is given up.
+        Default is 0.
+    on_error : {"raise", "nan"}, optional
+        What to do when a model evaluation has failed after all retries.
+        "raise" aborts by re-raising the exception. "nan" records the
+        evaluation as failed, and the model and all features get numpy.nan as
+        result for that evaluation.
+        Default is "raise".
+    checkpoint : {None, str}, optional
+        Name of a HDF5 file where each model evaluation is stored as soon as it
+        is finished. If None, no checkpoint file is used.
+        Default is None.
+    resume : bool, optional
+        If the finished model evaluations in an existing `checkpoint` file
+        should be reused, so only the missing and failed evaluations are
+        performed. If False, an existing `checkpoint` file is overwritten.
+        Default is False.
+    cache : {None, EvaluationCache}, optional
+        Cache of model evaluations. Model evaluations found in the cache are
+        not performed again, and new model evaluations are added to the cache.
+        If None, no cache is used.
+        Default is None.
+    time_grid : {None, array, int, "pilot"}, optional
+        The common time grid adaptive model/features are interpolated onto.
+        If given, the interpolation is performed by the workers directly after
+        each model evaluation, so only the interpolated values are sent back.
+        An array is used as the time grid for the model and all adaptive
+        features. "pilot" uses the time values of the model/features from a
+        pilot run of the first node. An integer ``N`` uses ``N`` evenly spaced
+        time points between the first and last time value of the model/features
+        in a pilot run of the first node. If None, the interpolation objects are
+        sent back and evaluated on the longest time array after all model
+        evaluations are finished.
+        Default is None.
+    batch_size : {None, int}, optional
+        The number of parameter sets sent to a worker at the time, for
+        vectorized models (see Model.run). If None, the parameter sets are
+        divided evenly between the workers. Ignored if the model is not
+        vectorized.
+        Default is None.
+    profile : bool, optional
+        If each model evaluation should be profiled with cProfile in the
+        workers. The profile statistics of all model evaluations are merged
+        into `profile_stats`.
+        Default is False.
+    max_inflight : {None, int}, optional
+        The maximum number of model evaluations that are submitted to the
+        workers but not yet stored. If None, all model evaluations are
+        submitted at once.
+        Default is None.
+    max_memory : {None, int}, optional
+        The maximum memory in bytes used by the results of the model
+        evaluations that are submitted to the workers but not yet stored.
+        The memory used by each result is estimated from the first successful
+        model evaluation. If None, there is no memory limit.
+        Default is None.
+    model_outputs : {None, str}, optional
+        Name of a folder where the raw output of each model evaluation,
+        everything returned by the model function, is stored. If None, the
+        model outputs are not stored.
+        Default is None.
+    reuse_model_outputs : bool, optional
+        If the features should be calculated from the model outputs stored in
+        `model_outputs`, instead of running the model. The model is only run
+        for the nodes without a stored model output.
+        Default is False.
+    memmap_threshold : {None, int}, optional
+        Numerical arrays in the model and feature results larger than this
+        number of bytes are sent from the workers through memory-mapped files
+        instead of being pickled. Only supported by the "process" backend.
+        If None, all results are pickled.
+        Default is None.
+    scratch_folder : {None, str}, optional
+        The folder where the memory-mapped files are stored. If None,
+        ``/dev/shm`` is used if it exists, otherwise the temporary folder of
+        the system.
+        Default is None.
 
     Attributes
     ----------
@@ -59,6 +210,105 @@ class RunModel(ParameterBase):
         Logger object responsible for logging to screen or file.
     CPUs : int
         The number of CPUs used when calculating the model and features.
+    backend : Executor
+        The executor responsible for evaluating the model.
+    initializer : {None, callable}
+        A function that is called once in each worker when the backend is
+        started.
+    initargs : tuple
+        Arguments sent to `initializer`.
+    failures : list
+        A description of each failed model evaluation in the last call to
+        ``evaluate_nodes``.
+    setup_times : list
+        The time in seconds spent in ``setup_worker`` of the model and
+        features, for each worker started during the last call to
+        ``evaluate_nodes``. Empty if running workers were reused.
+    checkpoint : {None, str}
+        Name of the HDF5 file where each model evaluation is stored.
+    resume : bool
+        If the finished model evaluations in `checkpoint` are reused.
+    cache : {None, EvaluationCache}
+        Cache of model evaluations.
+    time_grid : {None, array, int, "pilot"}
+        The common time grid adaptive model/features are interpolated onto.
+    time_grids : {None, dict}
+        The common time grid of each adaptive model/feature used in the last
+        call to ``run`` or ``evaluate_nodes``, found from `time_grid`.
+        None if `time_grid` is None.
+    batch_size : {None, int}
+        The number of parameter sets sent to a worker at the time, for
+        vectorized models.
+    profile : bool
+        If each model evaluation is profiled with cProfile in the workers.
+    profile_stats : {None, pstats.Stats}
+        The merged profile statistics of the model evaluations in the last
+        call to ``run`` or ``evaluate_nodes``. None if `profile` is False.
+    max_inflight : {None, int}
+        The maximum number of model evaluations that are submitted to the
+        workers but not yet stored.
+    max_memory : {None, int}
+        The maximum memory in bytes used by the results of the model
+        evaluations that are submitted to the workers but not yet stored.
+    model_outputs : {None, str}
+        Name of the folder where the raw output of each model evaluation is
+        stored.
+    reuse_model_outputs : bool
+        If the features are calculated from the stored model outputs.
+    memmap_threshold : {None, int}
+        The size in bytes above which arrays are sent from the workers through
+        memory-mapped files.
+    scratch_folder : {None, str}
+        The folder where the memory-mapped files are stored.
+
+    Raises
+    ------
+    ValueError
+        If `time_grid` is a string other than "pilot".
+    ValueError
+        If `max_inflight` is smaller than 1.
+    ValueError
+        If a `timeout` is given together with the "thread" backend.
+    ValueError
+        If a `memmap_threshold` is given together with another backend than
+        "process".
+
+    Notes
+    -----
+    The workers of the backend are started the first time the model is
+    evaluated, and are reused for all later evaluations. The workers are
+    restarted if the model, features, number of CPUs or initializer have
+    been replaced, or the settings of the model and features (such as
+    ``features_to_run``) have changed since they were started. Other changes
+    to the model and features, such as replacing a method, are not detected.
+    Call ``close`` (or use RunModel as a
+    context manager) to shut down the workers when they are no longer needed.
+    The ``setup_worker`` methods of the model and features are called once in
+    each worker when it is started, and the time spent is reported
+    separately from the model evaluations.
+
+    With ``time_grid="pilot"`` or an integer `time_grid`, the first node is
+    evaluated before the other nodes to find the time grid, and its result
+    is reused. The time grids are sent to the workers together with each
+    model evaluation, so the running workers are reused. Model/feature results
+    that cover a shorter time range than the time grid are extrapolated.
+
+    By default all model evaluations are submitted to the workers at once, so
+    the results of the workers pile up in memory if they are finished faster
+    than they are stored. `max_inflight` and `max_memory` limit the number of
+    results that are kept in memory at the same time. The results are stored
+    in the order of the nodes, so a slow model evaluation holds back the
+    workers once the limit is reached. With `max_memory`, the model
+    evaluations are performed one at the time until the first successful
+    model evaluation has been used to estimate the memory of each result.
+
+    With `reuse_model_outputs`, the features are recalculated from the stored
+    model outputs, so changes to the features do not require the model to be
+    run again. The model outputs are matched to the nodes by the values of
+    the model parameters, so the same nodes must be created as when the model
+    outputs were stored. Neither the checkpoint nor the cache is used to
+    look up results when reusing model outputs, since the features may have
+    changed.
 
     See Also
     --------
@@ -67,6 +317,7 @@ class RunModel(ParameterBase):
     uncertainpy.Parameters
     uncertainpy.models.Model
     uncertainpy.models.Model.run : Requirements for the model run function.
+    uncertainpy.core.Executor
     """
 
     def __init__(self,
@@ -75,13 +326,48 @@ class RunModel(ParameterBase):
                  features=None,
                  verbose_level="info",
                  verbose_filename=None,
-                 CPUs=mp.cpu_count()):
-
+                 CPUs=mp.cpu_count(),
+                 backend="process",
+                 initializer=None,
+                 initargs=(),
+                 timeout=None,
+                 retries=0,
+                 on_error="raise",
+                 checkpoint=None,
+                 resume=False,
+                 cache=None,
+                 time_grid=None,
+                 batch_size=None,
+                 profile=False,
+                 max_inflight=None,
+                 max_memory=None,
+                 model_outputs=None,
+                 reuse_model_outputs=False,
+                 memmap_threshold=None,
+                 scratch_folder=None):
+
+        if isinstance(time_grid, str) and time_grid != "pilot":
+            raise ValueError("time_grid must be None, an array, an integer or 'pilot', not {}".format(time_grid))
+
+        if max_inflight is not None and max_inflight < 1:
+            raise ValueError("max_inflight must be None or at least 1, not {}".format(max_inflight))
+
+        self._backend = None
+        self._vdisplay = None
+        self._nr_setup_times = 0
+
+        # The result of the pilot run used to find the time grids,
+        # reused as the result of the first node
+        self._pilot = None
 
         self._parallel = Parallel(model=model,
                                   features=features,
                                   verbose_level=verbose_level,
-                                  verbose_filename=verbose_filename)
+                                  verbose_filename=verbose_filename,
+                                  timeout=timeout,
+                                  retries=retries,
+                                  on_error=on_error,
+                                  profile=profile)
 
         super(RunModel, self).__init__(model=model,
                                        parameters=parameters,
@@ -89,9 +375,216 @@ class RunModel(ParameterBase):
                                        verbose_level=verbose_level,
                                        verbose_filename=verbose_filename)
 
-        self.CPUs = CPUs
+        self.backend = create_executor(backend,
+                                       CPUs=CPUs,
+                                       memmap_threshold=memmap_threshold,
+                                       scratch_folder=scratch_folder)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.failures = []
+        self.setup_times = []
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.cache = cache
+        self.time_grid = time_grid
+        self.time_grids = None
+        self.batch_size = batch_size
+        self.profile_stats = None
+        self.max_inflight = max_inflight
+        self.max_memory = max_memory
+        self.model_outputs = model_outputs
+        self.reuse_model_outputs = reuse_model_outputs
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
+    def __del__(self):
+        if getattr(self, "_vdisplay", None) is not None:
+            self._vdisplay.stop()
+            self._vdisplay = None
+
+
+    @property
+    def backend(self):
+        """
+        The executor responsible for evaluating the model.
+
+        Parameters
+        ----------
+        new_backend : {"process", "thread", "serial", "mpi", Executor}
+            The name of the backend or an Executor instance. The workers of the
+            previous backend are shut down. The number of CPUs, and for the
+            process backend `memmap_threshold` and `scratch_folder`, are kept
+            from the previous backend.
+
+        Returns
+        -------
+        backend : Executor
+            The executor responsible for evaluating the model.
+
+        Raises
+        ------
+        ValueError
+            If the new backend is "thread" and a timeout is used. The timeout
+            is implemented with the SIGALRM signal, which can only be used in
+            the main thread.
+
+        See Also
+        --------
+        uncertainpy.core.Executor
+        """
+        return self._backend
+
+
+    @backend.setter
+    def backend(self, new_backend):
+        CPUs = None
+        memmap_threshold = None
+        scratch_folder = None
+        if self._backend is not None:
+            CPUs = self._backend.CPUs
+
+            if new_backend == ProcessExecutor.name:
+                memmap_threshold = self.memmap_threshold
+                scratch_folder = self.scratch_folder
+
+        new_backend = create_executor(new_backend,
+                                      CPUs=CPUs,
+                                      memmap_threshold=memmap_threshold,
+                                      scratch_folder=scratch_folder)
+
+        if isinstance(new_backend, ThreadExecutor) and self._parallel.timeout is not None:
+            raise ValueError("timeout is not supported by the thread backend, "
+                             + "use the process or serial backend instead")
+
+        if self._backend is not None and new_backend is not self._backend:
+            self._backend.close()
+
+        self._backend = new_backend
+        self._nr_setup_times = len(new_backend.setup_times)
+
+
+    @property
+    def profile(self):
+        """
+        If each model evaluation is profiled with cProfile in the workers.
+
+        Parameters
+        ----------
+        new_profile : bool
+            If each model evaluation should be profiled.
+
+        Returns
+        -------
+        profile : bool
+            If each model evaluation is profiled.
+        """
+        return self._parallel.profile
+
+
+    @profile.setter
+    def profile(self, new_profile):
+        self._parallel.profile = new_profile
+
+
+    @property
+    def CPUs(self):
+        """
+        The number of CPUs used when calculating the model and features.
+
+        Parameters
+        ----------
+        new_CPUs : int
+            The number of CPUs used by the backend.
+
+        Returns
+        -------
+        CPUs : int
+            The number of CPUs used by the backend.
+        """
+        return self._backend.CPUs
+
+
+    @CPUs.setter
+    def CPUs(self, new_CPUs):
+        self._backend.CPUs = new_CPUs
+
+
+    @property
+    def memmap_threshold(self):
+        """
+        The size in bytes above which numerical arrays in the model and feature
+        results are sent from the workers through memory-mapped files instead
+        of being pickled. Only supported by the process backend.
+
+        Parameters
+        ----------
+        new_memmap_threshold : {None, int}
+            The size in bytes. If None, all results are pickled. The workers
+            are restarted the next time the model is evaluated.
+
+        Returns
+        -------
+        memmap_threshold : {None, int}
+            The size in bytes. None if the results are pickled, or the backend
+            is not the process backend.
+
+        Raises
+        ------
+        ValueError
+            If a threshold is set and the backend is not the process backend.
+
+        See Also
+        --------
+        uncertainpy.core.ProcessExecutor
+        """
+        return getattr(self._backend, "memmap_threshold", None)
+
+
+    @memmap_threshold.setter
+    def memmap_threshold(self, new_memmap_threshold):
+        if isinstance(self._backend, ProcessExecutor):
+            self._backend.memmap_threshold = new_memmap_threshold
+        elif new_memmap_threshold is not None:
+            raise ValueError("memmap_threshold is only supported by the process backend")
+
+
+    @property
+    def scratch_folder(self):
+        """
+        The folder where the memory-mapped files used to send large results
+        from the workers are stored. Only used by the process backend.
+
+        Parameters
+        ----------
+        new_scratch_folder : {None, str}
+            The folder. If None, ``/dev/shm`` is used if it exists, otherwise
+            the temporary folder of the system.
+
+        Returns
+        -------
+        scratch_folder : {None, str}
+            The folder. None if the default folder is used, or the backend is
+            not the process backend.
+
+        See Also
+        --------
+        uncertainpy.core.ProcessExecutor
+        """
+        return getattr(self._backend, "scratch_folder", None)
+
+
+    @scratch_folder.setter
+    def scratch_folder(self, new_scratch_folder):
+        if isinstance(self._backend, ProcessExecutor):
+            self._backend.scratch_folder = new_scratch_folder
+
 
     @ParameterBase.features.setter
     def features(self, new_features):
@@ -118,7 +611,7 @@ class RunModel(ParameterBase):
             A list of time arrays from all runs of the model/features.
         interpolation : list
             A list of scipy interpolation objects from all runs of
-            the model/features.
+            the model/features. None for failed model evaluations.
 
         Returns
         -------
@@ -133,7 +626,7 @@ class RunModel(ParameterBase):
         -----
         Chooses the time array with the highest number of time points and use
         this time array to interpolate the model/feature results in each of
-        those points.
+        those points. Failed model evaluations get numpy.nan in each point.
         """
 
         lengths = []
@@ -145,7 +638,10 @@ class RunModel(ParameterBase):
 
         interpolated_results = []
         for inter in interpolation:
-            interpolated_results.append(inter(time))
+            if inter is None:
+                interpolated_results.append(np.full(len(time), np.nan))
+            else:
+                interpolated_results.append(inter(time))
 
         interpolated_results = np.array(interpolated_results)
 
@@ -205,89 +701,42 @@ class RunModel(ParameterBase):
         uncertainpy.Data
         """
 
-        data = Data()
-
-        # Add features and labels
-        for feature in results[0]:
-            data.add_features(feature)
+        assembler = ResultAssembler(self.model,
+                                    self.features,
+                                    len(results),
+                                    self.logger,
+                                    time_grids=self.time_grids)
+        for i, result in enumerate(results):
+            assembler.add(i, result)
 
-            if feature == self.model.name:
-                data[feature]["labels"] = self.model.labels
-            elif feature in self.features.labels:
-                data[feature]["labels"] = self.features.labels[feature]
+        return assembler.data()
 
-        data.model_name = self.model.name
 
-        results = self.regularize_nan_results(results)
 
-        # Check if features are adaptive without being specified as a adaptive
-        # TODO if the feature is adaptive, perform the complete interpolation here instead
-        for feature in data:
-            if self.is_adaptive(results, feature):
-                if (feature == self.model.name and not self.model.adaptive) \
-                    or (feature != self.model.name and feature not in self.features.adaptive):
-                    raise ValueError("{}: The number of points varies between runs.".format(feature)
-                                     + " Try setting adaptive to True in {}".format(feature))
-
-
-        # Store all results in data, interpolate as needed
-        for feature in data:
-            # Interpolate the data if it is adaptive
-            if feature in self.features.adaptive or \
-                    (feature == self.model.name and self.model.adaptive):
-                # TODO implement interpolation of >= 2d data, part2
-                if np.ndim(results[0][feature]["values"]) >= 2:
-                    raise NotImplementedError("Feature: {feature},".format(feature=feature)
-                                              + " no support for >= 2D interpolation")
-
-                elif np.ndim(results[0][feature]["values"]) == 1:
-                    time_interpolate = []
-                    interpolations = []
-                    for result in results:
-                        # if "time" in result[feature]:
-                        if not np.all(np.isnan(result[feature]["time"])):
-                            time_interpolate.append(result[feature]["time"])
-                        elif not np.all(np.isnan(result[self.model.name]["time"])):
-                            time_interpolate.append(result[self.model.name]["time"])
-                        else:
-                            raise ValueError("Neither {} or model has t values to use in interpolation".format(feature))
-
-                        interpolations.append(result[feature]["interpolation"])
-
-                    data[feature].time, data[feature].evaluations = self.apply_interpolation(time_interpolate, interpolations)
-
-                # Interpolating a 0D result makes no sense, so if a 0D feature
-                # is supposed to be interpolated store it as normal
-                elif np.ndim(results[0][feature]["values"]) == 0:
-                    self.logger.warning("Feature: {feature}, ".format(feature=feature) +
-                                        "is a 0D result. No interpolation is performed")
-
-                    data[feature].time = results[0][feature]["time"]
-
-                    data[feature].evaluations  = []
-                    for result in results:
-                        data[feature].evaluations.append(result[feature]["values"])
-
-            else:
-                # Store data from results in a Data object
-                data[feature].time = results[0][feature]["time"]
-
-                data[feature].evaluations = []
-                for result in results:
-                    data[feature].evaluations.append(result[feature]["values"])
-
-        # ensure all results are arrays
-        for feature in data:
-            if "time" in data[feature]:
-                data[feature].time = np.array(data[feature].time)
-
-            data[feature].evaluations = np.array(data[feature].evaluations )
-
-        # data.remove_only_invalid_features()
+    def reference_time(self, results, feature):
+        """
+        Find the time values of a `feature`, from the first result where the
+        time values are not only numpy.nan.
 
-        return data
+        Parameters
+        ----------
+        results : list
+            A list where each element is a result dictionary for each set
+            of model evaluations.
+        feature: str
+            Name of a feature or the model.
 
+        Returns
+        -------
+        time : {array, float}
+            The time values of `feature`. numpy.nan if no result has
+            time values.
+        """
+        for result in results:
+            if not np.all(np.isnan(result[feature]["time"])):
+                return result[feature]["time"]
 
+        return results[0][feature]["time"]
 
 
     def evaluate_nodes(self, nodes, uncertain_parameters):
@@ -329,31 +778,456 @@ class RunModel(ParameterBase):
 
                 results = [result 1, result 2, ..., result N]
 
+        Raises
+        ------
+        RuntimeError
+            If all model evaluations failed.
+
+        Notes
+        -----
+        Failed model evaluations (only with ``on_error="nan"``) get numpy.nan
+        as result for the model and each feature, and a description of the
+        failure is added to ``failures``.
+
+        If `checkpoint` is set, each model evaluation is stored in the
+        checkpoint file as soon as it is finished. If `resume` is True,
+        the nodes that already have been evaluated successfully in the
+        checkpoint file are not evaluated again, while failed nodes are
+        evaluated again. The checkpoint file is only resumed if it was
+        created for the same model, uncertain parameters, features and time
+        grids.
+
+        If `cache` is set, the nodes with results in the cache are not
+        evaluated again.
+
+        If `model_outputs` is set, the raw output of each model evaluation is
+        stored. If `reuse_model_outputs` is True, the features are calculated
+        from the stored model outputs instead of running the model.
         """
-        if self.model.suppress_graphics:
-            if not prerequisites:
-                raise ImportError("Running with suppress_graphics require: xvfbwrapper")
+        self.profile_stats = None
+
+        self.set_time_grids(nodes, uncertain_parameters)
+
+        results = [None]*len(nodes.T)
+        for i, result in self._evaluate(nodes, uncertain_parameters):
+            results[i] = result
 
-            vdisplay = Xvfb()
-            vdisplay.start()
+        results = self.fill_failed_results(results)
 
-        results = []
-        pool = mp.Pool(processes=self.CPUs)
+        return np.array(results)
+
+
+    def _evaluate(self, nodes, uncertain_parameters):
+        """
+        Evaluate the model and calculate the features for the nodes, yielding
+        each result as soon as it is finished.
+
+        Parameters
+        ----------
+        nodes : array
+            The values for the uncertain parameters
+            to evaluate the model and features for.
+        uncertain_parameters : list
+            A list of the names of all uncertain parameters.
+
+        Yields
+        ------
+        index : int
+            The index of the node.
+        result : {dictionary, None}
+            The model and feature results for the node (see Parallel.run),
+            or None if the model evaluation failed.
+
+        Raises
+        ------
+        RuntimeError
+            If all model evaluations failed.
+
+        Notes
+        -----
+        The results are not necessarily yielded in the order of the nodes.
+        ``failures`` is updated when all nodes have been evaluated.
+        """
+        self.start()
 
         model_parameters = self.create_model_parameters(nodes, uncertain_parameters)
 
-        for result in tqdm(pool.imap(self._parallel.run, model_parameters),
-                           desc="Running model",
-                           total=len(nodes.T)):
+        nr_nodes = len(model_parameters)
+        errors = [None]*nr_nodes
+        nr_successful = 0
+
+        checkpoint = None
+        finished = {}
+        if self.checkpoint is not None:
+            checkpoint = Checkpoint(self.checkpoint,
+                                    self.model.name,
+                                    uncertain_parameters,
+                                    feature_names=self.features.features_to_run,
+                                    time_grids=self.time_grids,
+                                    resume=self.resume)
+
+            # The features may have changed since the checkpoint was created
+            if not self.reuse_model_outputs:
+                finished = checkpoint.load()
+
+        outputs = None
+        if self.model_outputs is not None:
+            outputs = ModelOutputs(self.model_outputs)
+
+        try:
+            # Reuse successful evaluations from the checkpoint, with matching
+            # parameter values. Failed evaluations are evaluated again.
+            missing = []
+            for i, node in enumerate(nodes.T):
+                key = tuple(np.atleast_1d(node).tolist())
+
+                if key in finished and finished[key][0] is not None:
+                    result = self._parallel.create_interpolations(finished[key][0], self.time_grids)
+                    nr_successful += 1
+
+                    yield i, result
+                else:
+                    missing.append(i)
+
+            if nr_nodes > len(missing):
+                self.logger.info("Reusing {} model evaluations from checkpoint: {}".format(nr_nodes - len(missing),
+                                                                                           self.checkpoint))
+
+            keys = {}
+            if self.cache is not None and not self.reuse_model_outputs:
+                not_cached = []
+                for i in missing:
+                    keys[i] = self.cache.key(self.model,
+                                             self.features,
+                                             model_parameters[i],
+                                             time_grids=self.time_grids)
+                    result = self.cache.get(keys[i])
+
+                    if result is None:
+                        not_cached.append(i)
+                    else:
+                        # The timings are from the original evaluation
+                        result[self.model.name].pop("timings", None)
+
+                        if checkpoint is not None:
+                            checkpoint.save(i, nodes.T[i], result)
+
+                        nr_successful += 1
+                        yield i, result
+
+                if len(missing) > len(not_cached):
+                    self.logger.info("Reusing {} model evaluations from cache".format(len(missing) - len(not_cached)))
+
+                missing = not_cached
+
+            stored = []
+            if self.reuse_model_outputs and outputs is not None:
+                not_stored = []
+                for i in missing:
+                    if outputs.key(self.model.name, model_parameters[i]) in outputs:
+                        stored.append(i)
+                    else:
+                        not_stored.append(i)
+
+                if stored:
+                    self.logger.info("Calculating the features from {} stored model outputs: {}".format(len(stored),
+                                                                                                         self.model_outputs))
+
+                if not_stored:
+                    self.logger.warning("{} of {} nodes have no stored model output, ".format(len(not_stored), len(missing))
+                                        + "running the model for these nodes")
+
+                missing = not_stored
+
+            # The first node has already been evaluated in the pilot run
+            pilot = self._pilot
+            self._pilot = None
+
+            if pilot is not None and missing and missing[0] == 0:
+                evaluations = itertools.chain([pilot],
+                                              self.imap([model_parameters[i] for i in missing[1:]]))
+            else:
+                evaluations = self.imap([model_parameters[i] for i in missing])
 
-            results.append(result)
+            if stored:
+                # The stored model outputs are loaded as they are sent to the workers
+                stored_results = (StoredModelResult(outputs.load(outputs.key(self.model.name, model_parameters[i])))
+                                  for i in stored)
 
-        pool.close()
+                evaluations = itertools.chain(self.backend.imap(stored_results,
+                                                                max_inflight=self.max_inflight,
+                                                                time_grids=self.time_grids),
+                                              evaluations)
 
-        if self.model.suppress_graphics:
-            vdisplay.stop()
+            indices = stored + missing
 
-        return np.array(results)
+            for j, (result, error) in enumerate(tqdm(evaluations,
+                                                     desc="Running model",
+                                                     total=len(indices))):
+                i = indices[j]
+                errors[i] = error
+
+                if result is not None and "profile" in result[self.model.name]:
+                    self.add_profile_stats(result[self.model.name].pop("profile"))
+
+                if result is not None and "model_result" in result[self.model.name]:
+                    model_result = result[self.model.name].pop("model_result")
+                    outputs.save(outputs.key(self.model.name, model_parameters[i]), model_result)
+
+                if self.cache is not None and error is None:
+                    if i not in keys:
+                        keys[i] = self.cache.key(self.model,
+                                                 self.features,
+                                                 model_parameters[i],
+                                                 time_grids=self.time_grids)
+
+                    self.cache.set(keys[i], result)
+
+                if checkpoint is not None:
+                    checkpoint.save(i, nodes.T[i], result, error)
+
+                if result is not None:
+                    nr_successful += 1
+
+                yield i, result
+
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        self.failures = []
+        for i, error in enumerate(errors):
+            if error is not None:
+                self.failures.append("Node {} {}: {}".format(i, model_parameters[i], error))
+
+        if self.failures:
+            self.logger.warning("{} of {} model evaluations failed".format(len(self.failures), nr_nodes))
+
+        self.report_setup_times()
+
+        if nr_successful == 0:
+            raise RuntimeError("All model evaluations failed:\n" + "\n".join(self.failures))
+
+
+    def imap(self, model_parameters):
+        """
+        Evaluate the model and calculate the features for each set of model
+        parameters with the backend. Vectorized models are evaluated in
+        batches of `batch_size` sets of model parameters.
+
+        Parameters
+        ----------
+        model_parameters : list
+            A list where each element is a dictionary with the model parameters
+            for a single evaluation.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the ``(result, error)`` tuples for each set of
+            model parameters, in the same order as `model_parameters`,
+            see Parallel.evaluate.
+
+        Notes
+        -----
+        At most `max_inflight` model evaluations, and model evaluations with
+        results that use at most `max_memory` bytes, are submitted to the
+        workers without having been returned by the iterator.
+        """
+        if self.max_memory is None:
+            return self._imap(model_parameters, self.max_inflight)
+
+        return self._imap_memory(model_parameters)
+
+
+    def _imap(self, model_parameters, max_inflight):
+        if not self.model.vectorized:
+            return self.backend.imap(model_parameters,
+                                     max_inflight=max_inflight,
+                                     time_grids=self.time_grids)
+
+        return self._imap_batches(model_parameters, max_inflight)
+
+
+    def _imap_memory(self, model_parameters):
+        # Evaluate the model parameters one at the time until a successful
+        # result shows how much memory each result uses
+        size = None
+        index = 0
+        while size is None and index < len(model_parameters):
+            for result, error in self._imap(model_parameters[index:index + 1], 1):
+                if result is not None:
+                    size = _result_size(result)
+
+                yield result, error
+
+            index += 1
+
+        if index == len(model_parameters):
+            return
+
+        max_inflight = max(int(self.max_memory // max(size, 1)), 1)
+        if self.max_inflight is not None:
+            max_inflight = min(max_inflight, self.max_inflight)
+
+        self.logger.debug("Each result uses about {} bytes, ".format(size)
+                          + "limiting the number of model evaluations in flight to {}".format(max_inflight))
+
+        for result in self._imap(model_parameters[index:], max_inflight):
+            yield result
+
+
+    def _imap_batches(self, model_parameters, max_inflight=None):
+        batch_size = self.batch_size
+        if batch_size is None:
+            CPUs = self.CPUs if self.CPUs else mp.cpu_count()
+            batch_size = int(np.ceil(len(model_parameters)/float(CPUs)))
+
+        batch_size = max(batch_size, 1)
+
+        batches = []
+        for i in range(0, len(model_parameters), batch_size):
+            batches.append(model_parameters[i:i + batch_size])
+
+        # max_inflight is given in model evaluations, not batches
+        if max_inflight is not None:
+            max_inflight = max(max_inflight//batch_size, 1)
+
+        for results in self.backend.imap_batches(batches,
+                                                 max_inflight=max_inflight,
+                                                 time_grids=self.time_grids):
+            for result in results:
+                yield result
+
+
+
+    def fill_failed_results(self, results):
+        """
+        Replace the results of failed model evaluations (None) with results
+        where the model and each feature is numpy.nan.
+
+        Parameters
+        ----------
+        results : list
+            A list where each element is a result dictionary for each set
+            of model evaluations, or None if the model evaluation failed.
+
+        Returns
+        -------
+        results : list
+            A list where the failed model evaluations have been replaced by
+            result dictionaries with numpy.nan as time and values for the
+            model and each feature.
+
+        Raises
+        ------
+        RuntimeError
+            If all model evaluations failed.
+        """
+        reference = None
+        for result in results:
+            if result is not None:
+                reference = result
+                break
+
+        if reference is None:
+            raise RuntimeError("All model evaluations failed:\n" + "\n".join(self.failures))
+
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = {}
+                for feature in reference:
+                    results[i][feature] = {"values": np.nan,
+                                           "time": np.nan}
+
+        return results
+
+
+
+    def add_profile_stats(self, stats):
+        """
+        Merge the profile statistics of a model evaluation into
+        `profile_stats`.
+
+        Parameters
+        ----------
+        stats : dictionary
+            The profile statistics of a model evaluation, as the ``stats``
+            attribute of a cProfile.Profile (see Parallel.evaluate).
+        """
+        if self.profile_stats is None:
+            self.profile_stats = pstats.Stats(_ProfileStats(stats))
+        else:
+            self.profile_stats.add(_ProfileStats(stats))
+
+
+    def report_setup_times(self):
+        """
+        Update ``setup_times`` with the setup times reported by the workers
+        since the last time this method was called, and log the time spent.
+        The time is logged at the info level if the model or features
+        implement ``setup_worker``, otherwise at the debug level.
+        """
+        self.setup_times = self.backend.setup_times[self._nr_setup_times:]
+        self._nr_setup_times = len(self.backend.setup_times)
+
+        if not self.setup_times:
+            return
+
+        msg = "Worker setup took {:.3g} s on average in {} worker(s), {:.3g} s in total".format(np.mean(self.setup_times),
+                                                                                              len(self.setup_times),
+                                                                                              np.sum(self.setup_times))
+
+        if _implements(self.model, Model, "setup_worker") \
+                or _implements(self.features, Features, "setup_worker"):
+            self.logger.info(msg)
+        else:
+            self.logger.debug(msg)
+
+
+    def start(self):
+        """
+        Start the workers of the backend, or reuse the running workers.
+
+        The running workers are reused as long as the model, features, number
+        of CPUs and initializer are the same objects as when the workers were
+        started, and the settings of the model and features are unchanged.
+        Otherwise the workers are restarted.
+
+        Raises
+        ------
+        ImportError
+            If the model has ``suppress_graphics=True`` and xvfbwrapper is not
+            installed.
+        """
+        # The virtual display must exist before the workers are started,
+        # so the workers inherit it
+        if self.model.suppress_graphics and self._vdisplay is None:
+            if not prerequisites:
+                raise ImportError("Running with suppress_graphics require: xvfbwrapper")
+
+            self._vdisplay = Xvfb()
+            self._vdisplay.start()
+
+            self.backend.close()
+
+        self._parallel.store_model_results = self.model_outputs is not None
+
+        self.backend.start(self._parallel,
+                           initializer=self.initializer,
+                           initargs=self.initargs)
+
+
+    def close(self):
+        """
+        Shut down the workers of the backend and stop the virtual display
+        used to suppress graphics, if they are running.
+        """
+        self.backend.close()
+
+        if self._vdisplay is not None:
+            self._vdisplay.stop()
+            self._vdisplay = None
 
 
 
@@ -404,6 +1278,79 @@ class RunModel(ParameterBase):
         return model_parameters
 
 
+    def set_time_grids(self, nodes, uncertain_parameters):
+        """
+        Find the common time grid of each adaptive model/feature from
+        `time_grid`, and store them in `time_grids`.
+
+        Parameters
+        ----------
+        nodes : array
+            The values for the uncertain parameters
+            to evaluate the model and features for.
+        uncertain_parameters : list
+            A list of the names of all uncertain parameters.
+
+        Raises
+        ------
+        RuntimeError
+            If the pilot run used to find the time grids failed.
+
+        Notes
+        -----
+        With ``time_grid="pilot"`` or an integer `time_grid`, the first node
+        is evaluated to find the time values of each adaptive model/feature.
+        Adaptive model/features without an interpolation in the pilot run
+        (for example 0D results) are not given a time grid. The result of the
+        pilot run is interpolated onto the time grids, and reused as the
+        result of the first node.
+        """
+        self.time_grids = None
+        self._pilot = None
+
+        if self.time_grid is None:
+            return
+
+        adaptive = list(self.features.adaptive)
+        if self.model.adaptive:
+            adaptive.append(self.model.name)
+
+        if not isinstance(self.time_grid, str) and np.ndim(self.time_grid) > 0:
+            time_grid = np.array(self.time_grid, dtype=float)
+            self.time_grids = dict((feature, time_grid) for feature in adaptive)
+
+            return
+
+        model_parameters = self.create_model_parameters(nodes, uncertain_parameters)
+
+        self.start()
+
+        result, error = next(iter(self.imap(model_parameters[:1])))
+        if result is None:
+            raise RuntimeError("The pilot run used to find the time grid failed: {}".format(error))
+
+        time_grids = {}
+        for feature in adaptive:
+            if feature not in result or "interpolation" not in result[feature]:
+                continue
+
+            time = result[feature]["time"]
+
+            if self.time_grid == "pilot":
+                time_grids[feature] = time
+            else:
+                time_grids[feature] = np.linspace(time[0], time[-1], int(self.time_grid))
+
+        for feature in time_grids:
+            interpolation = result[feature].pop("interpolation")
+
+            result[feature]["values"] = interpolation(time_grids[feature])
+            result[feature]["time"] = time_grids[feature]
+
+        self.time_grids = time_grids
+        self._pilot = (result, error)
+
+
     def is_adaptive(self, results, feature):
         """
         Test if a `feature` in the `results` is adaptive, meaning it has a
@@ -485,6 +1432,14 @@ class RunModel(ParameterBase):
             A Data object with time and (interpolated) results for
             the model and each feature.
 
+        Notes
+        -----
+        The time spent in each phase of each model evaluation is stored in
+        ``data.node_timings``. The total time spent evaluating the model
+        (``"model evaluation"``), the part of it spent assembling the results
+        into `data` (``"assembly"``), and the total time spent setting up the
+        workers (``"worker setup"``) are stored in ``data.timings``.
+
         See Also
         --------
         uncertainpy.Data
@@ -493,10 +1448,37 @@ class RunModel(ParameterBase):
         if isinstance(uncertain_parameters, str):
             uncertain_parameters = [uncertain_parameters]
 
-        results = self.evaluate_nodes(nodes, uncertain_parameters)
+        start = time.time()
+
+        self.profile_stats = None
+
+        self.set_time_grids(nodes, uncertain_parameters)
+
+        # Each result is stored in the Data object as soon as it is finished,
+        # instead of keeping all results in memory
+        assembler = ResultAssembler(self.model,
+                                    self.features,
+                                    len(nodes.T),
+                                    self.logger,
+                                    time_grids=self.time_grids)
+
+        assembly = 0
+        for i, result in self._evaluate(nodes, uncertain_parameters):
+            start_assembly = time.time()
+            assembler.add(i, result)
+            assembly += time.time() - start_assembly
+
+        start_assembly = time.time()
+        data = assembler.data()
+        assembly += time.time() - start_assembly
 
-        data = self.results_to_data(results)
         data.uncertain_parameters = uncertain_parameters
+        data.failures = self.failures
+
+        data.timings["model evaluation"] = time.time() - start
+        data.timings["assembly"] = assembly
+        if self.setup_times:
+            data.timings["worker setup"] = float(np.sum(self.setup_times))
 
         return data
 
@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 import multiprocess as mp
 from tqdm import tqdm
@@ -50,6 +52,70 @@ class UncertaintyCalculations(ParameterBase):
     CPUs : int, optional
         The number of CPUs used when calculating the model and features.
         By default all CPUs are used.
+    backend : {"process", "thread", "serial", "mpi", Executor}, optional
+        The backend used to evaluate the model. "process" uses a pool of
+        worker processes, "thread" a pool of threads, "serial" evaluates
+        the model in the current process, and "mpi" uses a pool of MPI
+        processes (requires mpi4py).
+        Default is "process".
+    timeout : {None, float}, optional
+        The maximum time in seconds a single model evaluation, including the
+        calculation of the features, is allowed to take. If None, there is no
+        time limit.
+        Default is None.
+    retries : int, optional
+        The number of times a failed or timed out model evaluation is retried
+        before it is given up.
+        Default is 0.
+    on_error : {"raise", "nan"}, optional
+        What to do when a model evaluation has failed after all retries.
+        "raise" aborts the uncertainty quantification by re-raising the
+        exception. "nan" records the evaluation as failed, and the model and
+        all features get numpy.nan as result for that evaluation. The failed
+        evaluations are listed in ``data.failures``.
+        Default is "raise".
+    cache : {None, EvaluationCache}, optional
+        Cache of model evaluations. Model evaluations found in the cache are
+        not performed again, for example when repeating an uncertainty
+        quantification with a different polynomial order. If None, no cache
+        is used.
+        Default is None.
+    time_grid : {None, array, int, "pilot"}, optional
+        The common time grid adaptive model/features are interpolated onto
+        by the workers directly after each model evaluation. An array is used
+        as the time grid for all adaptive model/features, "pilot" uses the
+        time values from a pilot run of the first node, and an integer ``N``
+        uses ``N`` evenly spaced time points over the time range of the pilot
+        run. If None, the results are interpolated onto the longest time array
+        after all model evaluations are finished.
+        Default is None.
+    batch_size : {None, int}, optional
+        The number of parameter sets sent to a worker at the time, for
+        vectorized models (see Model.run). If None, the parameter sets are
+        divided evenly between the workers.
+        Default is None.
+    max_inflight : {None, int}, optional
+        The maximum number of model evaluations that are submitted to the
+        workers but not yet stored. Limits the memory used when the workers
+        are faster than the results are stored. If None, all model evaluations
+        are submitted at once.
+        Default is None.
+    max_memory : {None, int}, optional
+        The maximum memory in bytes used by the results of the model
+        evaluations that are submitted to the workers but not yet stored.
+        If None, there is no memory limit.
+        Default is None.
+    memmap_threshold : {None, int}, optional
+        Numerical arrays in the model and feature results larger than this
+        number of bytes are sent from the workers through memory-mapped files
+        instead of being pickled, which is faster for large results. Only
+        supported by the "process" backend. If None, all results are pickled.
+        Default is None.
+    scratch_folder : {None, str}, optional
+        The folder where the memory-mapped files are stored. If None,
+        ``/dev/shm`` is used if it exists, otherwise the temporary folder of
+        the system.
+        Default is None.
     verbose_level : {"info", "debug", "warning", "error", "critical"}, optional
         Set the threshold for the logging level.
         Logging messages less severe than this level is ignored.
@@ -71,6 +137,13 @@ class UncertaintyCalculations(ParameterBase):
     logger : logging.Logger
         Logger object responsible for logging to screen or file.
 
+    Notes
+    -----
+    The workers of the backend in ``runmodel`` are reused between each
+    uncertainty quantification. Call ``close`` (or use UncertaintyCalculations
+    as a context manager) to shut down the workers when they are no longer
+    needed.
+
     See Also
     --------
     uncertainpy.features.Features
@@ -87,6 +160,17 @@ class UncertaintyCalculations(ParameterBase):
                  create_PCE_custom=None,
                  custom_uncertainty_quantification=None,
                  CPUs=mp.cpu_count(),
+                 backend="process",
+                 timeout=None,
+                 retries=0,
+                 on_error="raise",
+                 cache=None,
+                 time_grid=None,
+                 batch_size=None,
+                 max_inflight=None,
+                 max_memory=None,
+                 memmap_threshold=None,
+                 scratch_folder=None,
                  verbose_level="info",
                  verbose_filename=None):
 
@@ -95,7 +179,18 @@ class UncertaintyCalculations(ParameterBase):
                                  features=features,
                                  verbose_level=verbose_level,
                                  verbose_filename=verbose_filename,
-                                 CPUs=CPUs)
+                                 CPUs=CPUs,
+                                 backend=backend,
+                                 timeout=timeout,
+                                 retries=retries,
+                                 on_error=on_error,
+                                 cache=cache,
+                                 time_grid=time_grid,
+                                 batch_size=batch_size,
+                                 max_inflight=max_inflight,
+                                 max_memory=max_memory,
+                                 memmap_threshold=memmap_threshold,
+                                 scratch_folder=scratch_folder)
 
         if create_PCE_custom is not None:
             self.create_PCE_custom = create_PCE_custom
@@ -109,6 +204,25 @@ class UncertaintyCalculations(ParameterBase):
                                                       verbose_level=verbose_level,
                                                       verbose_filename=verbose_filename)
 
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """
+        Shut down the workers used to evaluate the model.
+
+        See also
+        --------
+        uncertainpy.core.RunModel.close
+        """
+        self.runmodel.close()
+
+
     @ParameterBase.features.setter
     def features(self, new_features):
         ParameterBase.features.fset(self, new_features)
@@ -1204,6 +1318,8 @@ class UncertaintyCalculations(ParameterBase):
 
         uncertain_parameters = self.convert_uncertain_parameters(uncertain_parameters)
 
+        start = time.time()
+
         if method == "collocation":
             if rosenblatt:
                 U_hat, distribution, data = \
@@ -1245,7 +1361,13 @@ class UncertaintyCalculations(ParameterBase):
         else:
             raise ValueError("No polynomial chaos method with name {}".format(method))
 
+        # The model evaluations are timed separately by RunModel
+        data.timings["polynomial chaos expansion"] = time.time() - start \
+            - data.timings.get("model evaluation", 0)
+
+        start = time.time()
         data = self.analyse_PCE(U_hat, distribution, data, nr_samples=nr_pc_mc_samples)
+        data.timings["statistics"] = time.time() - start
 
         data.seed = seed
 
@@ -1329,6 +1451,8 @@ class UncertaintyCalculations(ParameterBase):
         data.method = "monte carlo method. nr_samples={}".format(nr_samples)
         data.seed = seed
 
+        start = time.time()
+
         # TODO mask data
         for feature in data:
             if feature == self.model.name and self.model.ignore:
@@ -1340,6 +1464,8 @@ class UncertaintyCalculations(ParameterBase):
             data[feature].percentile_5 = np.percentile(data[feature].evaluations , 5, 0)
             data[feature].percentile_95 = np.percentile(data[feature].evaluations , 95, 0)
 
+        data.timings["statistics"] = time.time() - start
+
         return data
 
 
@@ -4,10 +4,112 @@ import collections
 
 import numpy as np
 
-from .utils import create_logger
+from .utils import create_logger, SpikeTrains
 from ._version import __version__
 
 
+def _is_spike_trains(evaluations):
+    """
+    If `evaluations` is an object array with a SpikeTrains object (or
+    numpy.nan) for each evaluation.
+    """
+    return isinstance(evaluations, np.ndarray) and evaluations.dtype == object \
+        and any(isinstance(evaluation, SpikeTrains) for evaluation in evaluations)
+
+
+def _save_spike_trains(group, evaluations):
+    """
+    Save an object array of SpikeTrains objects to a hdf5 group. The spike
+    times and offsets of all evaluations are concatenated, with
+    ``nr_trains[i]`` neurons in evaluation ``i``. Failed evaluations have
+    ``nr_trains`` -1.
+    """
+    times = []
+    offsets = []
+    nr_trains = np.full(len(evaluations), -1, dtype=np.int64)
+    simulation_end = np.full(len(evaluations), np.nan)
+    dt = np.full(len(evaluations), np.nan)
+
+    for i, spike_trains in enumerate(evaluations):
+        if isinstance(spike_trains, SpikeTrains):
+            times.append(spike_trains.times)
+            offsets.append(spike_trains.offsets)
+            nr_trains[i] = spike_trains.nr_trains
+            simulation_end[i] = spike_trains.simulation_end
+            dt[i] = spike_trains.dt
+
+    group.attrs["type"] = "spike trains"
+    group.create_dataset("times", data=np.concatenate(times))
+    group.create_dataset("offsets", data=np.concatenate(offsets))
+    group.create_dataset("nr_trains", data=nr_trains)
+    group.create_dataset("simulation_end", data=simulation_end)
+    group.create_dataset("dt", data=dt)
+
+
+def _save_timings(group, node_timings, timings):
+    """
+    Save the timings of each node as datasets and the remaining timings as
+    attributes of a hdf5 group.
+    """
+    group.attrs["type"] = "timings"
+
+    for phase in node_timings:
+        group.create_dataset(phase, data=node_timings[phase])
+
+    for phase in timings:
+        group.attrs[phase] = timings[phase]
+
+
+def _load_timings(group):
+    """
+    Load the timings saved by ``_save_timings``.
+    """
+    node_timings = {}
+    for phase in group:
+        node_timings[str(phase)] = group[phase][()]
+
+    timings = {}
+    for phase in group.attrs:
+        if phase != "type":
+            timings[str(phase)] = float(group.attrs[phase])
+
+    return node_timings, timings
+
+
+def _load_spike_trains(group):
+    """
+    Load an object array of SpikeTrains objects saved by
+    ``_save_spike_trains``.
+    """
+    times = group["times"][()]
+    offsets = group["offsets"][()]
+    nr_trains = group["nr_trains"][()]
+    simulation_end = group["simulation_end"][()]
+    dt = group["dt"][()]
+
+    evaluations = np.full(len(nr_trains), np.nan, dtype=object)
+
+    times_start = 0
+    offsets_start = 0
+    for i in range(len(nr_trains)):
+        if nr_trains[i] < 0:
+            continue
+
+        spike_offsets = offsets[offsets_start:offsets_start + nr_trains[i] + 1]
+        nr_spikes = spike_offsets[-1]
+
+        evaluations[i] = SpikeTrains(times[times_start:times_start + nr_spikes],
+                                     spike_offsets,
+                                     simulation_end[i],
+                                     dt[i])
+
+        times_start += nr_spikes
+        offsets_start += nr_trains[i] + 1
+
+    return evaluations
+
+
+
 class DataFeature(collections.MutableMapping):
     """
     Store the results of each statistical metric calculated from the uncertainty
@@ -280,6 +382,9 @@ class DataFeature(collections.MutableMapping):
         """
 
         if self.evaluations is not None:
+            if _is_spike_trains(self.evaluations):
+                return SpikeTrains.ndim
+
             return np.ndim(self.evaluations[0])
         else:
             return None
@@ -318,6 +423,8 @@ class Data(collections.MutableMapping):
         Name of the model.
     incomplete : list
         List of all model/features that have missing model/feature evaluations.
+    failures : list
+        List with a description of each model evaluation that failed.
     method : str
         A string that describes the method used to perform the uncertainty
         quantification.
@@ -327,6 +434,17 @@ class Data(collections.MutableMapping):
         Logger object responsible for logging to screen or file.
     data_information : list
         List of attributes containing additional information.
+    node_timings : dictionary
+        The time in seconds spent in each phase of each model evaluation,
+        with the phases as keys and an array with the time of each node as
+        values. The phases are ``"run"``, ``"validate"``, ``"postprocess"``,
+        ``"preprocess"``, ``"feature: <feature name>"`` for each feature, and
+        ``"interpolation"``. Nodes that were not evaluated have numpy.nan.
+    timings : dictionary
+        The total time in seconds spent in each phase of the uncertainty
+        quantification that is not performed for each node, such as
+        ``"model evaluation"``, ``"assembly"``, ``"worker setup"``,
+        ``"polynomial chaos expansion"``, ``"statistics"`` and ``"plotting"``.
 
 
     Notes
@@ -359,7 +477,7 @@ class Data(collections.MutableMapping):
                  verbose_filename=None):
 
         self.data_information = ["uncertain_parameters", "model_name",
-                                 "incomplete", "method", "version", "seed"]
+                                 "incomplete", "failures", "method", "version", "seed"]
 
         self.logger = create_logger(verbose_level,
                                     verbose_filename,
@@ -369,9 +487,12 @@ class Data(collections.MutableMapping):
         self.uncertain_parameters = []
         self.model_name = ""
         self.incomplete = []
+        self.failures = []
         self.data = {}
         self.method = ""
         self._seed = ""
+        self.node_timings = {}
+        self.timings = {}
 
         self.version = __version__
 
@@ -449,13 +570,65 @@ class Data(collections.MutableMapping):
         self.uncertain_parameters = []
         self.model_name = ""
         self.incomplete = []
+        self.failures = []
         self.data = {}
         self.method = ""
         self._seed = ""
+        self.node_timings = {}
+        self.timings = {}
 
         self.version = __version__
 
 
+    def timing_summary(self):
+        """
+        Create a table that summarizes where the time was spent in the
+        uncertainty quantification.
+
+        For each phase of the model evaluations the table contains the total,
+        mean and maximum time of the nodes, and the fraction of the total time
+        of all phases. The phases that are not performed for each node follow.
+
+        Returns
+        -------
+        str
+            A human readable table of the timings.
+        """
+        order = ["run", "validate", "postprocess", "preprocess"]
+
+        phases = [phase for phase in order if phase in self.node_timings]
+        phases += sorted(phase for phase in self.node_timings if phase.startswith("feature: "))
+        phases += sorted(phase for phase in self.node_timings if phase not in phases)
+
+        width = max([len(phase) for phase in list(self.node_timings) + list(self.timings)] + [len("Phase")])
+
+        row = "{:<" + str(width) + "}  {:>12}  {:>12}  {:>12}  {:>8}"
+        lines = [row.format("Phase", "Total (s)", "Mean (s)", "Max (s)", "Share")]
+
+        total = sum(np.nansum(self.node_timings[phase]) for phase in phases)
+
+        row = "{:<" + str(width) + "}  {:>12.4g}  {:>12.4g}  {:>12.4g}  {:>7.1f}%"
+        for phase in phases:
+            timings = self.node_timings[phase]
+            phase_total = np.nansum(timings)
+            share = 100.*phase_total/total if total > 0 else 0
+
+            lines.append(row.format(phase,
+                                    phase_total,
+                                    np.nanmean(timings),
+                                    np.nanmax(timings),
+                                    share))
+
+        if self.timings:
+            lines.append("")
+
+            row = "{:<" + str(width) + "}  {:>12.4g}"
+            for phase in sorted(self.timings):
+                lines.append(row.format(phase, self.timings[phase]))
+
+        return "\n".join(lines)
+
+
     def ndim(self, feature):
         """
         Get the number of dimensions of a `feature`.
@@ -610,12 +783,22 @@ class Data(collections.MutableMapping):
             f.attrs["version"] = self.version
             f.attrs["seed"] = self.seed
 
+            if self.failures:
+                f.attrs["failures"] = self.failures
+
+            if self.node_timings or self.timings:
+                _save_timings(f.create_group("timings"), self.node_timings, self.timings)
 
             for feature in self:
                 group = f.create_group(feature)
 
                 for statistical_metric in self[feature]:
-                    group.create_dataset(statistical_metric, data=self[feature][statistical_metric])
+                    data = self[feature][statistical_metric]
+
+                    if _is_spike_trains(data):
+                        _save_spike_trains(group.create_group(statistical_metric), data)
+                    else:
+                        group.create_dataset(statistical_metric, data=data)
 
                 group.create_dataset("labels", data=self[feature].labels)
 
@@ -644,10 +827,20 @@ class Data(collections.MutableMapping):
             self.version = f.attrs["version"]
             self.seed = f.attrs["seed"]
 
+            if "failures" in f.attrs:
+                self.failures = list(f.attrs["failures"])
+
             for feature in f:
+                if f[feature].attrs.get("type") == "timings":
+                    self.node_timings, self.timings = _load_timings(f[feature])
+                    continue
+
                 self.add_features(str(feature))
                 for statistical_metric in f[feature]:
-                    self[feature][statistical_metric] = f[feature][statistical_metric][()]
+                    if isinstance(f[feature][statistical_metric], h5py.Group):
+                        self[feature][statistical_metric] = _load_spike_trains(f[feature][statistical_metric])
+                    else:
+                        self[feature][statistical_metric] = f[feature][statistical_metric][()]
 
 
     def remove_only_invalid_features(self):
@@ -658,7 +851,7 @@ class Data(collections.MutableMapping):
         for feature in feature_list:
             all_nan = True
             for U in self[feature].evaluations:
-                if not np.all(np.isnan(U)):
+                if isinstance(U, SpikeTrains) or not np.all(np.isnan(U)):
                     all_nan = False
 
             if all_nan:
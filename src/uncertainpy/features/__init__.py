@@ -17,6 +17,7 @@ __all__ = ["Features",
            "Spikes",
            "NetworkFeatures",
            "GeneralNetworkFeatures",
+           "NeoSpikeTrains",
            "EfelFeatures"]
 
 from .features import Features
@@ -24,5 +25,5 @@ from .general_spiking_features import GeneralSpikingFeatures
 from .spiking_features import SpikingFeatures
 from .spikes import Spike, Spikes
 from .network_features import NetworkFeatures
-from .general_network_features import GeneralNetworkFeatures
+from .general_network_features import GeneralNetworkFeatures, NeoSpikeTrains
 from .efel_features import EfelFeatures
\ No newline at end of file
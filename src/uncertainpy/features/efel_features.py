@@ -5,8 +5,25 @@ try:
 except ImportError:
     prerequisites = False
 
+import threading
+
+import numpy as np
+
 from .features import Features
 
+
+# The names of the eFEL features, found once since efel.getFeatureNames
+# initializes eFEL each time it is called
+_efel_feature_names = None
+
+def _get_efel_feature_names():
+    global _efel_feature_names
+
+    if _efel_feature_names is None:
+        _efel_feature_names = frozenset(efel.getFeatureNames())
+
+    return _efel_feature_names
+
 class EfelFeatures(Features):
     """
     Calculating the mean value of each feature in the Electrophys Feature
@@ -96,6 +113,15 @@ class EfelFeatures(Features):
     Efel features take the parameters ``(time, values, info)`` and require
     info["stimulus_start"] and info["stimulus_end"] to be set.
 
+    When the features of a model evaluation are calculated, all Efel
+    features in ``features_to_run`` are calculated with a single call to
+    eFEL, so the spikes are only found once. If this call fails, each feature
+    is calculated separately.
+    The time spent in the single call is split evenly between the features
+    calculated by it in the timings from
+    ``calculate_features_with_timings``, so the time of each of these
+    features is the average time and not the time of that feature alone.
+
     Implemented Efel features are:
 
     ===============================  ===============================  ===============================
@@ -171,74 +197,210 @@ class EfelFeatures(Features):
 
         implemented_labels = {}
 
-        def efel_wrapper(feature_name):
-            def feature_function(time, values, info):
-                disable = False
+        # The wrappers of the eFEL features are created when first used
+        self._efel_feature_names = _get_efel_feature_names()
 
-                if "stimulus_start" not in info:
-                    if strict:
-                        raise ValueError("Efel features require info['stimulus_start']. "
-                                           "No 'stimulus_start' found in info, "
-                                           "Set 'stimulus_start', or set strict to "
-                                           "False to use initial time as stimulus start")
-                    else:
-                        info["stimulus_start"] = time[0]
-                        self.logger.warning("Efel features require info['stimulus_start']. "
-                                            "No 'stimulus_start' found in info, "
-                                            "setting stimulus start as initial time")
+        super(EfelFeatures, self).__init__(new_features=new_features,
+                                           features_to_run=features_to_run,
+                                           adaptive=adaptive,
+                                           new_utility_methods=[],
+                                           labels=implemented_labels,
+                                           verbose_level=verbose_level,
+                                           verbose_filename=verbose_filename)
 
-                if "stimulus_end" not in info:
-                    if strict:
-                        raise ValueError("Efel features require info['stimulus_end']. "
-                                           "No 'stimulus_end' found in info, "
-                                           "Set 'stimulus_start', or set strict to "
-                                           "False to use end time as stimulus end")
-                    else:
-                        info["stimulus_end"] = time[-1]
-                        self.logger.warning("Efel features require info['stimulus_start']. "
-                                            "No 'stimulus_end' found in info, "
-                                            "setting stimulus end as end time")
+        self.add_intermediates({"efel_trace": self._efel_trace,
+                                "efel_values": self._efel_values})
 
+        # The eFEL features calculated together in the current feature
+        # calculation, for each thread that measures the feature timings
+        self._efel_batches = {}
 
-                if info["stimulus_start"] >= info["stimulus_end"]:
-                    raise ValueError("stimulus_start >= stimulus_end.")
+        self.labels = labels
+        self.features_to_run = features_to_run
+        self.strict = strict
 
 
-                trace = {}
-                trace["T"] = time
-                trace["V"] = values
-                trace["stim_start"] = [info["stimulus_start"]]
-                trace["stim_end"] = [info["stimulus_end"]]
+    def __getattr__(self, name):
+        # Only called for attributes that are not found, the eFEL feature
+        # functions are created here the first time they are used
+        if name in self.__dict__.get("_efel_feature_names", ()):
+            feature_function = self._efel_wrapper(name)
+            setattr(self, name, feature_function)
 
+            return feature_function
 
+        raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
 
-                # Disable decay_time_constant_after_stim if no time points left
-                # in simulation after stimulation has ended.
-                # Otherwise it thros an error
-                if feature_name == "decay_time_constant_after_stim":
-                    if info["stimulus_end"] >= time[-1]:
-                        return None, None
 
-                result = efel.getMeanFeatureValues([trace], [feature_name], raise_warnings=False)
+    def calculate_features_with_timings(self, *preprocess_results):
+        """
+        Calculate all features in ``features_to_run`` with
+        ``calculate_features``, and measure the time spent calculating each
+        feature.
 
-                return None, result[0][feature_name]
+        Parameters
+        ----------
+        *preprocess_results
+            The values returned by ``preprocess``, see ``calculate_features``.
 
-            feature_function.__name__ = feature_name
-            return feature_function
+        Returns
+        -------
+        results : dictionary
+            A dictionary where the keys are the feature names
+            and the values are a dictionary with the time values `time` and feature
+            results on `values`, on the form ``{"time": time, "values": values}``.
+        timings : dictionary
+            A dictionary where the keys are the feature names and the values
+            are the time in seconds spent calculating each feature.
+
+        Notes
+        -----
+        The Efel features calculated with a single call to eFEL are all
+        charged the same time, the total time of these features divided by
+        the number of features. Otherwise the whole call would be charged to
+        the first of these features.
 
-        super(EfelFeatures, self).__init__(new_features=new_features,
-                                           features_to_run=features_to_run,
-                                           adaptive=adaptive,
-                                           new_utility_methods=[],
-                                           labels=implemented_labels,
-                                           verbose_level=verbose_level,
-                                           verbose_filename=verbose_filename)
+        See also
+        --------
+        uncertainpy.features.Features.calculate_features_with_timings
+        """
+        ident = threading.current_thread().ident
 
-        for feature_name in efel.getFeatureNames():
-            self.add_features(efel_wrapper(feature_name))
+        self._efel_batches[ident] = []
+        try:
+            results, timings = super(EfelFeatures, self).calculate_features_with_timings(*preprocess_results)
+        finally:
+            batch = self._efel_batches.pop(ident, [])
 
-        self.labels = labels
-        self.features_to_run = features_to_run
+        batch = [feature_name for feature_name in batch if feature_name in timings]
+
+        if batch:
+            average = sum(timings[feature_name] for feature_name in batch)/float(len(batch))
+
+            for feature_name in batch:
+                timings[feature_name] = average
+
+        return results, timings
+
+
+    def _find_features(self):
+        features = super(EfelFeatures, self)._find_features()
+
+        return sorted(set(features) | self._efel_feature_names)
+
+
+    def _efel_wrapper(self, feature_name):
+        """
+        Create the feature function calculating the eFEL feature with
+        `feature_name`.
+        """
+        def feature_function(time, values, info):
+            trace = self.intermediate("efel_trace", time, values, info)
+
+            # Disable decay_time_constant_after_stim if no time points left
+            # in simulation after stimulation has ended.
+            # Otherwise it thros an error
+            if feature_name == "decay_time_constant_after_stim":
+                if info["stimulus_end"] >= time[-1]:
+                    return None, None
+
+            # Use the eFEL call shared by all features of this model
+            # evaluation, features not in it are calculated separately
+            result = {}
+            if self._intermediates_started():
+                result = self.intermediate("efel_values", time, values, info)
+
+            if feature_name not in result:
+                result = efel.getMeanFeatureValues([trace], [feature_name], raise_warnings=False)[0]
+
+            return None, result[feature_name]
+
+        feature_function.__name__ = feature_name
+        return feature_function
+
+
+    def _efel_trace(self, time, values, info):
+        """
+        Check the stimulus start and end, and create the trace given to eFEL.
+        """
+        if "stimulus_start" not in info:
+            if self.strict:
+                raise ValueError("Efel features require info['stimulus_start']. "
+                                   "No 'stimulus_start' found in info, "
+                                   "Set 'stimulus_start', or set strict to "
+                                   "False to use initial time as stimulus start")
+            else:
+                info["stimulus_start"] = time[0]
+                self.logger.warning("Efel features require info['stimulus_start']. "
+                                    "No 'stimulus_start' found in info, "
+                                    "setting stimulus start as initial time")
+
+        if "stimulus_end" not in info:
+            if self.strict:
+                raise ValueError("Efel features require info['stimulus_end']. "
+                                   "No 'stimulus_end' found in info, "
+                                   "Set 'stimulus_start', or set strict to "
+                                   "False to use end time as stimulus end")
+            else:
+                info["stimulus_end"] = time[-1]
+                self.logger.warning("Efel features require info['stimulus_start']. "
+                                    "No 'stimulus_end' found in info, "
+                                    "setting stimulus end as end time")
+
+
+        if info["stimulus_start"] >= info["stimulus_end"]:
+            raise ValueError("stimulus_start >= stimulus_end.")
+
+
+        trace = {}
+        trace["T"] = time
+        trace["V"] = values
+        trace["stim_start"] = [info["stimulus_start"]]
+        trace["stim_end"] = [info["stimulus_end"]]
+
+        return trace
+
+
+    def _efel_values(self, time, values, info):
+        """
+        Calculate all eFEL features in ``features_to_run`` with a single call
+        to eFEL, so the spikes are only found once. Returns an empty
+        dictionary if eFEL fails, so each feature is calculated separately
+        instead. Features that are nan are left out and calculated
+        separately, so the results are the same as for single features.
+        """
+        trace = self.intermediate("efel_trace", time, values, info)
+
+        feature_names = [feature_name for feature_name in self.features_to_run
+                         if feature_name in self._efel_feature_names]
+
+        if "decay_time_constant_after_stim" in feature_names \
+                and info["stimulus_end"] >= time[-1]:
+            feature_names.remove("decay_time_constant_after_stim")
+
+        if not feature_names:
+            return {}
+
+        try:
+            result = efel.getMeanFeatureValues([trace], feature_names, raise_warnings=False)[0]
+        except Exception as error:
+            self.logger.debug("Calculating the eFEL features together failed, "
+                              "calculating each feature separately: {}".format(error))
+            return {}
+
+        # Some features give nan when calculated together with other features,
+        # but None when calculated alone, so these are calculated separately
+        for feature_name in list(feature_names):
+            if result[feature_name] is not None and np.isnan(result[feature_name]):
+                del result[feature_name]
+                feature_names.remove(feature_name)
+
+        # Record the features calculated together, to split the time
+        batch = self._efel_batches.get(threading.current_thread().ident)
+        if batch is not None:
+            batch.extend(feature_names)
+
+        return result
 
 
 
@@ -1,3 +1,6 @@
+import time
+import threading
+
 from ..utils import create_logger
 
 class Features(object):
@@ -64,12 +67,25 @@ class Features(object):
         that is not in the list of utility methods is considered to be a feature.
     labels : dictionary
         Labels for the axes of each feature, used when plotting.
+    intermediates : dictionary
+        The functions that calculate the intermediate quantities shared
+        between features, with the name of each intermediate as key.
     logger : logging.Logger
         Logger object responsible for logging to screen or file.
 
+    Notes
+    -----
+    Quantities that several features need, such as the interspike intervals
+    of each spike train, can be added as intermediates with
+    ``add_intermediates``, and retrieved in the features with
+    ``intermediate``. Each intermediate is calculated the first time it is
+    needed, and reused by the other features calculated for the same model
+    evaluation.
+
     See also
     --------
     uncertainpy.features.Features.reference_feature : reference_feature showing the requirements of a feature function.
+    uncertainpy.features.Features.intermediate : Retrieving intermediate quantities.
     """
     def __init__(self,
                  new_features=None,
@@ -83,12 +99,17 @@ class Features(object):
 
         self.utility_methods = ["calculate_feature",
                                 "calculate_features",
+                                "calculate_features_with_timings",
                                 "calculate_all_features",
                                 "__init__",
                                 "implemented_features",
                                 "preprocess",
                                 "add_features",
                                 "reference_feature",
+                                "setup_worker",
+                                "teardown_worker",
+                                "intermediate",
+                                "add_intermediates",
                                 "_preprocess"]
 
         if new_utility_methods is None:
@@ -98,6 +119,19 @@ class Features(object):
         self._adaptive = None
         self._labels = {}
 
+        # Cached list of implemented features, cleared when features are added
+        self._implemented_features = None
+
+        self.intermediates = {}
+
+        # The intermediates calculated in the current feature calculation,
+        # for each thread calculating features
+        self._intermediate_values = {}
+
+        # The time spent calculating each feature, for each thread that
+        # measures the feature timings
+        self._feature_timings = {}
+
         self.utility_methods += new_utility_methods
 
         self.adaptive = adaptive
@@ -299,10 +333,15 @@ class Features(object):
         The features added are not added to ``features_to_run``.
         ``features_to_run`` must be set manually afterwards.
 
+        Features must be added with this method, and not by setting an
+        attribute directly, to be included in ``implemented_features``.
+
         See also
         --------
         uncertainpy.features.Features.reference_feature : reference_feature showing the requirements of a feature function.
         """
+        self._implemented_features = None
+
         if callable(new_features):
             setattr(self, new_features.__name__, new_features)
             # self.features_to_run.append(new_features.__name__)
@@ -367,6 +406,9 @@ class Features(object):
         -----
         Checks that the feature returns two arguments.
 
+        When called from ``calculate_features_with_timings``, the time spent
+        calculating the feature is recorded.
+
 
         See also
         --------
@@ -376,6 +418,8 @@ class Features(object):
             raise TypeError("{} is a utility method".format(feature_name))
 
 
+        start = time.time()
+
         try:
             feature_result = getattr(self, feature_name)(*preprocess_results)
         except Exception as error:
@@ -385,6 +429,10 @@ class Features(object):
             error.args = error.args + (msg,)
             raise
 
+        timings = self._feature_timings.get(threading.current_thread().ident)
+        if timings is not None:
+            timings[feature_name] = time.time() - start
+
         # Check that time, and values is returned
         try:
             time_feature, values_feature = feature_result
@@ -435,14 +483,61 @@ class Features(object):
         uncertainpy.features.Features.calculate_feature : Method for calculating a single feature.
         """
         results = {}
-        for feature in self.features_to_run:
-            time_feature, values_feature = self.calculate_feature(feature, *preprocess_results)
 
-            results[feature] = {"time": time_feature, "values": values_feature}
+        self._start_intermediates()
+        try:
+            for feature in self.features_to_run:
+                time_feature, values_feature = self.calculate_feature(feature, *preprocess_results)
+
+                results[feature] = {"time": time_feature, "values": values_feature}
+        finally:
+            self._stop_intermediates()
 
         return results
 
 
+    def calculate_features_with_timings(self, *preprocess_results):
+        """
+        Calculate all features in ``features_to_run`` with
+        ``calculate_features``, and measure the time spent calculating each
+        feature.
+
+        Parameters
+        ----------
+        *preprocess_results
+            The values returned by ``preprocess``, see ``calculate_features``.
+
+        Returns
+        -------
+        results : dictionary
+            A dictionary where the keys are the feature names
+            and the values are a dictionary with the time values `time` and feature
+            results on `values`, on the form ``{"time": time, "values": values}``.
+        timings : dictionary
+            A dictionary where the keys are the feature names and the values
+            are the time in seconds spent calculating each feature.
+
+        Notes
+        -----
+        The timings are recorded by ``calculate_feature``, so a reimplemented
+        ``calculate_features`` is used, but only the features it calculates
+        with ``calculate_feature`` are timed.
+
+        See also
+        --------
+        uncertainpy.features.Features.calculate_features
+        """
+        ident = threading.current_thread().ident
+
+        self._feature_timings[ident] = {}
+        try:
+            results = self.calculate_features(*preprocess_results)
+        finally:
+            timings = self._feature_timings.pop(ident, {})
+
+        return results, timings
+
+
     def calculate_all_features(self, *args):
         """
         Calculate all implemented features.
@@ -479,14 +574,147 @@ class Features(object):
         uncertainpy.features.Features.calculate_feature : Method for calculating a single feature.
         """
         results = {}
-        for feature in self.implemented_features():
-            time_feature, values_feature = self.calculate_feature(feature, *args)
 
-            results[feature] = {"time": time_feature, "values": values_feature}
+        self._start_intermediates()
+        try:
+            for feature in self.implemented_features():
+                time_feature, values_feature = self.calculate_feature(feature, *args)
+
+                results[feature] = {"time": time_feature, "values": values_feature}
+        finally:
+            self._stop_intermediates()
 
         return results
 
 
+    def add_intermediates(self, new_intermediates):
+        """
+        Add intermediate quantities that are shared between features.
+
+        Parameters
+        ----------
+        new_intermediates : dictionary
+            A dictionary with the name of each intermediate as key, and the
+            function that calculates it as value. The functions take the
+            values returned by ``preprocess`` as input arguments, in the same
+            way as the features, and any keyword arguments given to
+            ``intermediate``.
+
+        Raises
+        ------
+        TypeError
+            If an intermediate function is not callable.
+
+        See also
+        --------
+        uncertainpy.features.Features.intermediate : Retrieving intermediate quantities.
+        """
+        for name, function in new_intermediates.items():
+            if not callable(function):
+                raise TypeError("Intermediate {} is not callable".format(name))
+
+            self.intermediates[name] = function
+
+
+    def intermediate(self, name, *preprocess_results, **kwargs):
+        """
+        Get an intermediate quantity shared between features.
+
+        While the features of a model evaluation are calculated (by
+        ``calculate_features`` or ``calculate_all_features``), each
+        intermediate is only calculated the first time it is requested, and
+        the same value is returned to all later features. Outside of the
+        feature calculations the intermediate is calculated each time.
+
+        Parameters
+        ----------
+        name : str
+            Name of the intermediate.
+        *preprocess_results
+            The values returned by ``preprocess``, sent to the function that
+            calculates the intermediate.
+        **kwargs
+            Keyword arguments sent to the function that calculates the
+            intermediate. Intermediates calculated with different keyword
+            arguments are stored separately.
+
+        Returns
+        -------
+        value
+            The value of the intermediate.
+
+        Raises
+        ------
+        ValueError
+            If no intermediate with `name` has been added.
+
+        Notes
+        -----
+        The intermediates are shared between the features, so features must
+        not change them.
+
+        See also
+        --------
+        uncertainpy.features.Features.add_intermediates : Adding intermediate quantities.
+        """
+        if name not in self.intermediates:
+            raise ValueError("No intermediate with name {}".format(name))
+
+        values = self._intermediate_values.get(threading.current_thread().ident)
+
+        if values is None:
+            return self.intermediates[name](*preprocess_results, **kwargs)
+
+        key = (name, tuple(sorted(kwargs.items())))
+        if key not in values:
+            values[key] = self.intermediates[name](*preprocess_results, **kwargs)
+
+        return values[key]
+
+
+    def _start_intermediates(self):
+        self._intermediate_values[threading.current_thread().ident] = {}
+
+
+    def _stop_intermediates(self):
+        self._intermediate_values.pop(threading.current_thread().ident, None)
+
+
+    def _intermediates_started(self):
+        return threading.current_thread().ident in self._intermediate_values
+
+
+    def setup_worker(self):
+        """
+        One-time setup of the features in each worker, called once when a
+        worker starts and before the features are calculated for the first
+        time in that worker.
+
+        Reimplement this method to perform expensive setup that is the same
+        for all feature calculations, for example ``efel.reset()``, instead
+        of doing it in ``preprocess`` for every model evaluation. The time
+        spent in the setup is reported separately from the model evaluations.
+        Does nothing by default.
+
+        See Also
+        --------
+        uncertainpy.features.Features.teardown_worker
+        """
+        pass
+
+
+    def teardown_worker(self):
+        """
+        Clean up after ``setup_worker``, called once when a worker is shut
+        down. Does nothing by default.
+
+        See Also
+        --------
+        uncertainpy.features.Features.setup_worker
+        """
+        pass
+
+
     def implemented_features(self):
         """
         Return a list of all callable methods in feature, that are not utility
@@ -497,7 +725,19 @@ class Features(object):
         list
             A list of all callable methods in feature, that are not utility
             methods.
+
+        Notes
+        -----
+        The list is found the first time this method is called, and reused
+        until new features are added with ``add_features``.
         """
+        if self._implemented_features is None:
+            self._implemented_features = self._find_features()
+
+        return list(self._implemented_features)
+
+
+    def _find_features(self):
         return [method for method in dir(self) if callable(getattr(self, method)) and method not in self.utility_methods and method not in dir(object) and not method.startswith("_")]
 
 
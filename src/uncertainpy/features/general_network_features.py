@@ -9,6 +9,124 @@ except ImportError:
     prerequisites = False
 
 from .features import Features
+from ..utils import SpikeTrains
+
+
+class NeoSpikeTrains(object):
+    """
+    A list of Neo spiketrains, where each Neo spiketrain is only created the
+    first time it is used.
+
+    The spike times of all spiketrains are also stored in a single array,
+    together with an array of offsets that gives where each spiketrain starts
+    and ends, as in ``SpikeTrains``. Features that only need the spike times
+    use these arrays directly, and avoid creating the Neo spiketrains.
+
+    Parameters
+    ----------
+    spiketrains : list
+        A list of the spike times of each neuron.
+    simulation_end : {int, float}
+        The simulation end time, used as the end time of each spiketrain.
+    units : Quantities unit
+        The Quantities unit of the spike times.
+
+    Attributes
+    ----------
+    times : array
+        The spike times of all neurons, ordered by neuron.
+    offsets : array
+        The spike times of neuron ``i`` are ``times[offsets[i]:offsets[i + 1]]``.
+    simulation_end : {int, float}
+        The simulation end time.
+    units : Quantities unit
+        The Quantities unit of the spike times.
+
+    Raises
+    ------
+    ValueError
+        If any spike time is before 0 or after `simulation_end`.
+
+    Notes
+    -----
+    NeoSpikeTrains can be indexed and iterated over as a list, but can not be
+    changed. Features that need a list of Neo spiketrains, for example to
+    send them to Elephant, should get it with ``neo_spiketrains``.
+
+    See also
+    --------
+    uncertainpy.utils.SpikeTrains
+    """
+    def __init__(self, spiketrains, simulation_end, units):
+        self._spiketrains = list(spiketrains)
+        self._neo_spiketrains = [None]*len(self._spiketrains)
+
+        spike_trains = SpikeTrains.from_spiketrains(self._spiketrains, simulation_end, None)
+
+        self.times = spike_trains.times
+        self.offsets = spike_trains.offsets
+        self.simulation_end = simulation_end
+        self.units = units
+
+        # The same checks as when creating the Neo spiketrains
+        if np.any(self.times < 0):
+            raise ValueError("Spike times before the simulation start (0) found.")
+
+        if np.any(self.times > simulation_end):
+            raise ValueError("Spike times after the simulation end ({}) found.".format(simulation_end))
+
+
+    def __len__(self):
+        return len(self._spiketrains)
+
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+    def __getitem__(self, i):
+        """
+        Return the Neo spiketrain of neuron `i`.
+
+        Parameters
+        ----------
+        i: {int, slice}
+            Index of the neuron.
+
+        Returns
+        -------
+        {neo.core.SpikeTrain, list}
+            The Neo spiketrain of neuron `i`, or a list of Neo spiketrains if
+            `i` is a slice.
+        """
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+
+        if i < 0 or i >= len(self):
+            raise IndexError("spiketrain index out of range")
+
+        if self._neo_spiketrains[i] is None:
+            self._neo_spiketrains[i] = neo.core.SpikeTrain(self._spiketrains[i],
+                                                           t_stop=self.simulation_end,
+                                                           units=self.units)
+
+        return self._neo_spiketrains[i]
+
+
+    def neo_spiketrains(self):
+        """
+        Create all Neo spiketrains.
+
+        Returns
+        -------
+        neo_spiketrains : list
+            A list of the Neo spiketrain of each neuron.
+        """
+        return [self[i] for i in range(len(self))]
 
 
 class GeneralNetworkFeatures(Features):
@@ -146,6 +264,10 @@ class GeneralNetworkFeatures(Features):
         necessary calculations. The values returned must therefore be compatible
         with the input arguments to each features.
 
+        The spiketrains are returned as a ``NeoSpikeTrains`` object, that
+        can be indexed as a list of Neo spiketrains, but only creates each
+        Neo spiketrain when it is used.
+
 
         See also
         --------
@@ -156,10 +278,7 @@ class GeneralNetworkFeatures(Features):
         if simulation_end is None or np.isnan(simulation_end):
             raise ValueError("simulation_end is NaN or None. simulation_end must be the time when the simulation ends.")
 
-        neo_spiketrains = []
-        for spiketrain in spiketrains:
-            neo_spiketrain = neo.core.SpikeTrain(spiketrain, t_stop=simulation_end, units=self.units)
-            neo_spiketrains.append(neo_spiketrain)
+        neo_spiketrains = NeoSpikeTrains(spiketrains, simulation_end, self.units)
 
         return simulation_end, neo_spiketrains
 
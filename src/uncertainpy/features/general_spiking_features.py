@@ -97,10 +97,14 @@ class GeneralSpikingFeatures(Features):
                  threshold=-30,
                  extended_spikes=False,
                  labels={},
+                 new_utility_methods=None,
                  verbose_level="info",
                  verbose_filename=None):
 
-        new_utility_methods = ["calculate_spikes"]
+        if new_utility_methods is None:
+            new_utility_methods = []
+
+        new_utility_methods = ["calculate_spikes"] + new_utility_methods
 
         super(GeneralSpikingFeatures, self).__init__(new_features=new_features,
                                                      features_to_run=features_to_run,
@@ -8,7 +8,8 @@ try:
 except ImportError:
     prerequisites = False
 
-from .general_network_features import GeneralNetworkFeatures
+from .general_network_features import GeneralNetworkFeatures, NeoSpikeTrains
+from ..utils import SpikeTrains
 
 
 class NetworkFeatures(GeneralNetworkFeatures):
@@ -99,6 +100,29 @@ class NetworkFeatures(GeneralNetworkFeatures):
     covariance_bin_size : int
         The size of each bin in the ``covariance`` method.
         Default is 1.
+    intermediates : dictionary
+        The intermediate quantities shared between the features:
+        ``"spike_times"``, the spike times of all spiketrains and the offsets
+        of each spiketrain,
+        ``"isi"``, the interspike intervals of all spiketrains and the offsets
+        of each spiketrain,
+        ``"cv"``, the coefficient of variation of each spiketrain,
+        ``"local_variation"``, the local variation of each spiketrain,
+        and ``"binned_spiketrains"``, the binned spiketrains used by
+        ``corrcoef`` and ``covariance``.
+
+    Notes
+    -----
+    The intermediates are calculated once for each model evaluation, and
+    shared between the features that need them. ``corrcoef`` and
+    ``covariance`` only share the binned spiketrains if
+    `corrcoef_bin_size` and `covariance_bin_size` are equal.
+
+    ``cv``, ``mean_cv``, ``binned_isi``, ``mean_isi``, ``local_variation``,
+    ``mean_local_variation``, ``mean_firing_rate`` and ``fanofactor`` are
+    calculated for all spiketrains at once from the spike times, without
+    using Neo or Elephant. The remaining features use Elephant, and the Neo
+    spiketrains are only created when one of these features is calculated.
 
     See also
     --------
@@ -154,6 +178,110 @@ class NetworkFeatures(GeneralNetworkFeatures):
         self.corrcoef_bin_size = corrcoef_bin_size
         self.covariance_bin_size = covariance_bin_size
 
+        self.add_intermediates({"neo_spiketrains": self._neo_spiketrains,
+                                "spike_times": self._spike_times,
+                                "isi": self._isi,
+                                "cv": self._cv,
+                                "local_variation": self._local_variation,
+                                "binned_spiketrains": self._binned_spiketrains})
+
+
+    def _neo_spiketrains(self, simulation_end, spiketrains):
+        """
+        Get a list of the Neo spiketrains, for the features calculated with
+        Elephant.
+        """
+        if isinstance(spiketrains, NeoSpikeTrains):
+            return spiketrains.neo_spiketrains()
+
+        return list(spiketrains)
+
+
+    def _spike_times(self, simulation_end, spiketrains):
+        """
+        Get the spike times of all spiketrains in a single array, and the
+        offsets where each spiketrain starts and ends.
+        """
+        if isinstance(spiketrains, NeoSpikeTrains):
+            return spiketrains.times, spiketrains.offsets
+
+        spike_trains = SpikeTrains.from_spiketrains(spiketrains, simulation_end, None)
+
+        return spike_trains.times, spike_trains.offsets
+
+
+    def _isi(self, simulation_end, spiketrains):
+        """
+        Calculate the interspike intervals of all spiketrains, in a single
+        array with the offsets where the intervals of each spiketrain starts
+        and ends.
+        """
+        times, offsets = self.intermediate("spike_times", simulation_end, spiketrains)
+
+        nr_spikes = np.diff(offsets)
+        neurons = np.repeat(np.arange(len(nr_spikes)), nr_spikes)
+
+        # Only intervals between spikes of the same neuron
+        isi = np.diff(times)[neurons[1:] == neurons[:-1]]
+
+        isi_offsets = np.zeros(len(offsets), dtype=offsets.dtype)
+        isi_offsets[1:] = np.cumsum(np.maximum(nr_spikes - 1, 0))
+
+        return isi, isi_offsets
+
+
+    def _cv(self, simulation_end, spiketrains):
+        """
+        Calculate the coefficient of variation of the spike times of each
+        spiketrain, NaN for spiketrains without spikes.
+        """
+        times, offsets = self.intermediate("spike_times", simulation_end, spiketrains)
+
+        nr_spikes = np.diff(offsets)
+        neurons = np.repeat(np.arange(len(nr_spikes)), nr_spikes)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(neurons, weights=times, minlength=len(nr_spikes))/nr_spikes
+            variance = np.bincount(neurons,
+                                   weights=(times - mean[neurons])**2,
+                                   minlength=len(nr_spikes))/nr_spikes
+
+            return np.sqrt(variance)/mean
+
+
+    def _local_variation(self, simulation_end, spiketrains):
+        """
+        Calculate the local variation of each spiketrain, None for
+        spiketrains with less than two interspike intervals.
+        """
+        isi, isi_offsets = self.intermediate("isi", simulation_end, spiketrains)
+
+        nr_isi = np.diff(isi_offsets)
+        neurons = np.repeat(np.arange(len(nr_isi)), nr_isi)
+
+        nr_terms = np.maximum(nr_isi - 1, 0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Only pairs of consecutive intervals of the same neuron
+            same = neurons[1:] == neurons[:-1]
+            terms = (np.diff(isi)/(isi[:-1] + isi[1:]))[same]**2
+
+            local_variation = 3.*(np.bincount(neurons[1:][same],
+                                              weights=terms,
+                                              minlength=len(nr_isi))/nr_terms)
+
+        return [lv if nr > 0 else None for lv, nr in zip(local_variation, nr_terms)]
+
+
+    def _binned_spiketrains(self, simulation_end, spiketrains, bin_size):
+        """
+        Bin the spiketrains with bins of `bin_size`.
+        """
+        neo_spiketrains = self.intermediate("neo_spiketrains", simulation_end, spiketrains)
+
+        return elephant.conversion.BinnedSpikeTrain(neo_spiketrains,
+                                                    binsize=bin_size*self.units)
+
 
     def cv(self, simulation_end, spiketrains):
         """
@@ -172,9 +300,7 @@ class NetworkFeatures(GeneralNetworkFeatures):
         values : array
             The coefficient of variation for each spiketrain.
         """
-        cv = []
-        for spiketrain in spiketrains:
-            cv.append(elephant.statistics.cv(spiketrain))
+        cv = self.intermediate("cv", simulation_end, spiketrains)
 
         return None, np.array(cv)
 
@@ -196,9 +322,7 @@ class NetworkFeatures(GeneralNetworkFeatures):
         values : float
             The mean coefficient of variation of each spiketrain.
         """
-        cv = []
-        for spiketrain in spiketrains:
-            cv.append(elephant.statistics.cv(spiketrain))
+        cv = self.intermediate("cv", simulation_end, spiketrains)
 
         return None, np.mean(cv)
 
@@ -222,16 +346,24 @@ class NetworkFeatures(GeneralNetworkFeatures):
         binned_isi : array
             The binned interspike intervals.
         """
-        binned_isi = []
-        bins = np.arange(0, spiketrains[0].t_stop.magnitude + self.isi_bin_size, self.isi_bin_size)
+        bins = np.arange(0, simulation_end + self.isi_bin_size, self.isi_bin_size)
+        nr_bins = len(bins) - 1
 
-        for spiketrain in spiketrains:
-            if len(spiketrain) > 1:
-                isi = elephant.statistics.isi(spiketrain)
-                binned_isi.append(np.histogram(isi, bins=bins)[0])
+        isi, isi_offsets = self.intermediate("isi", simulation_end, spiketrains)
+        nr_isi = np.diff(isi_offsets)
+        neurons = np.repeat(np.arange(len(nr_isi)), nr_isi)
 
-            else:
-                binned_isi.append(np.zeros(len(bins) - 1))
+        # The same bins as numpy.histogram, the last bin includes the right edge
+        indices = np.searchsorted(bins, isi, side="right") - 1
+        indices[isi == bins[-1]] = nr_bins - 1
+        inside = (indices >= 0) & (indices < nr_bins)
+
+        binned_isi = np.bincount(neurons[inside]*nr_bins + indices[inside],
+                                 minlength=len(nr_isi)*nr_bins)
+        binned_isi = binned_isi.reshape(len(nr_isi), nr_bins)
+
+        # Spiketrains without interspike intervals give a row of float zeros
+        binned_isi = [row if nr > 0 else np.zeros(nr_bins) for row, nr in zip(binned_isi, nr_isi)]
 
         centers = bins[1:] - 0.5
         return centers, binned_isi
@@ -254,13 +386,15 @@ class NetworkFeatures(GeneralNetworkFeatures):
         mean_isi : float
            The mean interspike interval.
         """
-        isi = []
-        for spiketrain in spiketrains:
-            if len(spiketrain) > 1:
-                isi.append(np.mean(elephant.statistics.isi(spiketrain)))
+        isi, isi_offsets = self.intermediate("isi", simulation_end, spiketrains)
+        nr_isi = np.diff(isi_offsets)
+        neurons = np.repeat(np.arange(len(nr_isi)), nr_isi)
 
+        # The mean interspike interval of each spiketrain with intervals
+        sum_isi = np.bincount(neurons, weights=isi, minlength=len(nr_isi))
+        mean_isi = sum_isi[nr_isi > 0]/nr_isi[nr_isi > 0]
 
-        return None, np.mean(isi)
+        return None, np.mean(mean_isi)
 
 
     def local_variation(self, simulation_end, spiketrains):
@@ -280,15 +414,9 @@ class NetworkFeatures(GeneralNetworkFeatures):
         local_variation : list
             The local variation for each spiketrain.
         """
-        local_variation = []
-        for spiketrain in spiketrains:
-            isi = elephant.statistics.isi(spiketrain)
-            if len(isi) > 1:
-                local_variation.append(elephant.statistics.lv(isi))
-            else:
-                local_variation.append(None)
+        local_variation = self.intermediate("local_variation", simulation_end, spiketrains)
 
-        return None, local_variation
+        return None, list(local_variation)
 
 
 
@@ -309,11 +437,8 @@ class NetworkFeatures(GeneralNetworkFeatures):
         mean_local_variation : float
             The mean of the local variation for each spiketrain.
         """
-        local_variation = []
-        for spiketrain in spiketrains:
-            isi = elephant.statistics.isi(spiketrain)
-            if len(isi) > 1:
-                local_variation.append(elephant.statistics.lv(isi))
+        local_variation = [lv for lv in self.intermediate("local_variation", simulation_end, spiketrains)
+                           if lv is not None]
 
         return None, np.mean(local_variation)
 
@@ -335,14 +460,14 @@ class NetworkFeatures(GeneralNetworkFeatures):
         mean_firing_rate : float
             The mean firing rate of all neurons.
         """
-        mean_firing_rates = []
+        times, offsets = self.intermediate("spike_times", simulation_end, spiketrains)
+
+        # Convert from spikes per time unit of the model to Hz
+        to_Hz = float((1/self.units).rescale(pq.Hz).magnitude)
 
-        for spiketrain in spiketrains:
-            mean_firing_rate = elephant.statistics.mean_firing_rate(spiketrain)
-            mean_firing_rate.units = pq.Hz
-            mean_firing_rates.append(mean_firing_rate.magnitude)
+        mean_firing_rates = np.diff(offsets)/float(simulation_end)*to_Hz
 
-        return None, mean_firing_rates
+        return None, list(mean_firing_rates)
 
 
     def instantaneous_rate(self, simulation_end, spiketrains):
@@ -363,9 +488,11 @@ class NetworkFeatures(GeneralNetworkFeatures):
         instantaneous_rate : float
             The instantaneous firing rate.
         """
+        neo_spiketrains = self.intermediate("neo_spiketrains", simulation_end, spiketrains)
+
         instantaneous_rates = []
         t = None
-        for spiketrain in spiketrains:
+        for spiketrain in neo_spiketrains:
             if len(spiketrain) > 2:
                 sampling_period = spiketrain.t_stop/self.instantaneous_rate_nr_samples
                 # try/except to solve problem with elephant
@@ -405,7 +532,14 @@ class NetworkFeatures(GeneralNetworkFeatures):
         fanofactor : float
             The fanofactor.
         """
-        return None, elephant.statistics.fanofactor(spiketrains)
+        times, offsets = self.intermediate("spike_times", simulation_end, spiketrains)
+
+        spike_counts = np.diff(offsets)
+
+        if np.all(spike_counts == 0):
+            return None, np.nan
+
+        return None, spike_counts.var()/spike_counts.mean()
 
 
     def van_rossum_dist(self, simulation_end, spiketrains):
@@ -425,7 +559,9 @@ class NetworkFeatures(GeneralNetworkFeatures):
         van_rossum_dist : 2D array
             The van Rossum distance.
         """
-        van_rossum_dist = elephant.spike_train_dissimilarity.van_rossum_dist(spiketrains)
+        neo_spiketrains = self.intermediate("neo_spiketrains", simulation_end, spiketrains)
+
+        van_rossum_dist = elephant.spike_train_dissimilarity.van_rossum_dist(neo_spiketrains)
 
         # van_rossum_dist returns 0.j imaginary parts in some cases
         van_rossum_dist = np.real_if_close(van_rossum_dist)
@@ -451,7 +587,9 @@ class NetworkFeatures(GeneralNetworkFeatures):
         values : 2D array
             The Victor-Purpura's distance.
         """
-        victor_purpura_dist = elephant.spike_train_dissimilarity.victor_purpura_dist(spiketrains)
+        neo_spiketrains = self.intermediate("neo_spiketrains", simulation_end, spiketrains)
+
+        victor_purpura_dist = elephant.spike_train_dissimilarity.victor_purpura_dist(neo_spiketrains)
 
         return None, victor_purpura_dist
 
@@ -473,8 +611,10 @@ class NetworkFeatures(GeneralNetworkFeatures):
         values : 2D array
             The pairwise Pearson's correlation coefficients.
         """
-        binned_sts = elephant.conversion.BinnedSpikeTrain(spiketrains,
-                                                          binsize=self.corrcoef_bin_size*self.units)
+        binned_sts = self.intermediate("binned_spiketrains",
+                                       simulation_end,
+                                       spiketrains,
+                                       bin_size=self.corrcoef_bin_size)
         corrcoef = elephant.spike_train_correlation.corrcoef(binned_sts)
 
         return None, corrcoef
@@ -496,8 +636,10 @@ class NetworkFeatures(GeneralNetworkFeatures):
         values : 2D array
             The pairwise covariances.
         """
-        binned_sts = elephant.conversion.BinnedSpikeTrain(spiketrains,
-                                                          binsize=self.covariance_bin_size*self.units)
+        binned_sts = self.intermediate("binned_spiketrains",
+                                       simulation_end,
+                                       spiketrains,
+                                       bin_size=self.covariance_bin_size)
         covariance = elephant.spike_train_correlation.covariance(binned_sts)
 
         return None, covariance
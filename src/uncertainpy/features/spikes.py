@@ -83,10 +83,10 @@ class Spike:
 
 
 
-class Spikes:
+class Spikes(object):
     """
     Finds spikes in the given voltage trace and is a container for the resulting
-    Spike objects.
+    spikes.
 
     Parameters
     ----------
@@ -110,6 +110,20 @@ class Spikes:
 
     Attributes
     ----------
+    time : {None, array}
+        The time of the voltage trace.
+    V : {None, array}
+        The voltage trace.
+    global_index : array
+        Index of the peak of each spike in the voltage trace.
+    time_spike : array
+        The timing of the peak of each spike.
+    V_spike : array
+        The voltage at the peak of each spike.
+    start : array
+        Index of the first sample of each spike in the voltage trace.
+    end : array
+        Index after the last sample of each spike in the voltage trace.
     spikes : list
         A list of Spike objects.
     nr_spikes : int
@@ -129,6 +143,11 @@ class Spikes:
     extended around the above area until the derivative of the voltage trace
     falls below 0.5.
 
+    The spikes are stored as arrays with one element for each spike, and
+    features should use these arrays directly. The Spike objects returned when
+    iterating over or indexing the spikes are created when requested, with
+    `time` and `V` as views into the voltage trace.
+
     See also
     --------
     Spike : The class for a single spike.
@@ -141,7 +160,15 @@ class Spikes:
                  extended_spikes=False,
                  xlabel="",
                  ylabel=""):
-        self.spikes = []
+        self.time = None
+        self.V = None
+
+        self.global_index = np.array([], dtype=int)
+        self.time_spike = np.array([])
+        self.V_spike = np.array([])
+        self.start = np.array([], dtype=int)
+        self.end = np.array([], dtype=int)
+
         self.nr_spikes = 0
 
         self.xlabel = xlabel
@@ -160,8 +187,8 @@ class Spikes:
         Spike object
             A spike object.
         """
-        for spike in self.spikes:
-            yield spike
+        for i in range(len(self.global_index)):
+            yield self._spike(i)
 
 
     def __len__(self):
@@ -182,15 +209,120 @@ class Spikes:
 
         Parameters
         ----------
-        i: int
+        i: {int, slice}
          Spike number `i`.
 
         Returns
         -------
-        Spike object
-            The spike object number `i`.
+        {Spike object, list}
+            The spike object number `i`, or a list of Spike objects if `i` is
+            a slice.
+        """
+        if isinstance(i, slice):
+            return [self._spike(j) for j in range(*i.indices(len(self.global_index)))]
+
+        if i < 0:
+            i += len(self.global_index)
+
+        if i < 0 or i >= len(self.global_index):
+            raise IndexError("spike index out of range")
+
+        return self._spike(i)
+
+
+    @property
+    def spikes(self):
+        """
+        A list of Spike objects, one for each spike.
+
+        Returns
+        -------
+        list
+            A list of Spike objects.
+        """
+        return list(self)
+
+
+    @spikes.setter
+    def spikes(self, new_spikes):
+        """
+        Set the spikes from a list of Spike objects.
+
+        Parameters
+        ----------
+        new_spikes : list
+            A list of Spike objects.
+
+        Notes
+        -----
+        The arrays with one element for each spike are rebuilt from the Spike
+        objects, and `global_index`, `start` and `end` always index into `time`
+        and `V`. If the spikes are windows of the current voltage trace, for
+        example a subset of the spikes found in it, the voltage trace is kept
+        and `global_index` is the index of each peak in the voltage trace.
+        Otherwise `time` and `V` are set to the time and voltage arrays of the
+        spikes joined together, and `global_index` is the index of each peak
+        in these arrays.
+        """
+        new_spikes = list(new_spikes)
+
+        lengths = np.array([len(spike.time) for spike in new_spikes], dtype=int)
+
+        # Index of the peak in the time and voltage arrays of each spike
+        peaks = np.array([np.argmin(np.abs(np.asarray(spike.time) - spike.time_spike))
+                          for spike in new_spikes], dtype=int)
+
+        global_index = np.array([spike.global_index for spike in new_spikes], dtype=int)
+        start = global_index - peaks
+
+        if not self._in_trace(new_spikes, start):
+            end = np.cumsum(lengths)
+            start = end - lengths
+            global_index = start + peaks
+
+            if new_spikes:
+                self.time = np.concatenate([np.asarray(spike.time) for spike in new_spikes])
+                self.V = np.concatenate([np.asarray(spike.V) for spike in new_spikes])
+            else:
+                self.time = np.array([])
+                self.V = np.array([])
+
+        self.global_index = global_index
+        self.time_spike = np.array([spike.time_spike for spike in new_spikes], dtype=float)
+        self.V_spike = np.array([spike.V_spike for spike in new_spikes], dtype=float)
+        self.start = start
+        self.end = start + lengths
+
+        self.nr_spikes = len(new_spikes)
+
+
+    def _in_trace(self, spikes, start):
         """
-        return self.spikes[i]
+        Check if each spike is the window of the current voltage trace that
+        starts at `start`.
+        """
+        if self.time is None or self.V is None:
+            return False
+
+        for spike, spike_start in zip(spikes, start):
+            spike_end = spike_start + len(spike.time)
+
+            if spike_start < 0 or spike_end > len(self.time):
+                return False
+
+            if not np.array_equal(self.time[spike_start:spike_end], spike.time) \
+                    or not np.array_equal(self.V[spike_start:spike_end], spike.V):
+                return False
+
+        return True
+
+
+    def _spike(self, i):
+        return Spike(self.time[self.start[i]:self.end[i]],
+                     self.V[self.start[i]:self.end[i]],
+                     self.time_spike[i],
+                     self.V_spike[i],
+                     self.global_index[i])
 
 
     def find_spikes(self, time, V, threshold=-30, extended_spikes=False):
@@ -215,8 +347,9 @@ class Spikes:
 
         Notes
         -----
-        The spikes are added to ``self.spikes`` and ``self.nr_spikes`` is
-        updated.
+        The spikes are stored in ``self.global_index``, ``self.time_spike``,
+        ``self.V_spike``, ``self.start`` and ``self.end``, and
+        ``self.nr_spikes`` is updated.
 
         The spikes are found by finding where the voltage trace goes above the
         threshold, and then later falls below this threshold. The spike is
@@ -229,13 +362,17 @@ class Spikes:
         min_dist_from_peak = 1
         derivative_cutoff = 0.5
 
-        self.spikes = []
+        time = np.asarray(time)
+        V = np.asarray(V)
+
         if threshold == "auto":
             threshold = np.sqrt(V.var())
 
+        starts, ends = self._threshold_crossings(V, threshold)
 
-        spike_start = 0
-        start_flag = False
+        global_index = np.zeros(len(starts), dtype=int)
+        start = np.zeros(len(starts), dtype=int)
+        end = np.zeros(len(starts), dtype=int)
 
         if extended_spikes:
             dVdt = np.gradient(V)
@@ -245,44 +382,92 @@ class Spikes:
 
         prev_spike_end = 0
 
-        for i in range(len(V)):
-            if V[i] > threshold and start_flag is False:
-                spike_start = i
-                start_flag = True
-                continue
+        # Only the spikes are looped over, not each sample of the voltage trace
+        for j, (spike_start, spike_end) in enumerate(zip(starts, ends)):
+            peak_index = np.argmax(V[spike_start:spike_end]) + spike_start
 
-            elif V[i] < threshold and start_flag is True:
-                spike_end = i + 1
-                start_flag = False
+            if extended_spikes:
+                # The first index with a large positive derivative after the
+                # previous spike
+                i = np.searchsorted(gt_derivative, prev_spike_end, side="right")
+                if i >= len(gt_derivative) or gt_derivative[i] >= peak_index:
+                    raise IndexError("No rising phase found before the spike peak at index {}".format(peak_index))
+                spike_start = gt_derivative[i]
 
-                time_spike = time[spike_start:spike_end]
-                V_spike = V[spike_start:spike_end]
+                # The first index with a large negative derivative after the
+                # peak, the same as the last element of
+                # consecutive(lt_derivative[lt_derivative > peak_index])
+                i = np.searchsorted(lt_derivative, peak_index, side="right")
+                if i >= len(lt_derivative):
+                    raise IndexError("No falling phase found after the spike peak at index {}".format(peak_index))
+                spike_end = lt_derivative[i] + 1
 
-                spike_index = np.argmax(V_spike)
-                global_index = spike_index + spike_start
-                time_max = time[global_index]
-                V_max = V[global_index]
+            else:
+                if peak_index - min_dist_from_peak < spike_start:
+                    spike_start = peak_index - min_dist_from_peak
 
-                if extended_spikes:
-                    spike_start = gt_derivative[(gt_derivative > prev_spike_end) & (gt_derivative < global_index)][0]
-                    spike_end = self.consecutive(lt_derivative[lt_derivative > global_index])[-1] + 1
+                if peak_index + min_dist_from_peak + 1 > spike_end:
+                    spike_end = peak_index + min_dist_from_peak + 1
 
-                else:
-                    if global_index - min_dist_from_peak < spike_start:
-                        spike_start = global_index - min_dist_from_peak
+            global_index[j] = peak_index
+            start[j] = spike_start
+            end[j] = spike_end
 
-                    if global_index + min_dist_from_peak + 1 > spike_end:
-                        spike_end = global_index + min_dist_from_peak + 1
+            prev_spike_end = spike_end
 
-                time_spike = time[spike_start:spike_end]
-                V_spike = V[spike_start:spike_end]
+        self.time = time
+        self.V = V
+
+        self.global_index = global_index
+        self.time_spike = time[global_index]
+        self.V_spike = V[global_index]
+        self.start = start
+        self.end = end
+
+        self.nr_spikes = len(global_index)
+
+
+    def _threshold_crossings(self, V, threshold):
+        """
+        Find the start and end index of each interval where the voltage trace
+        is above the threshold.
+
+        An interval starts at the first sample above the threshold, and ends
+        after the first sample below the threshold (samples equal to the
+        threshold do not start or end an interval). Intervals that have not
+        ended at the end of the voltage trace are not included.
+
+        Parameters
+        ----------
+        V : array
+            The voltage trace.
+        threshold : {int, float}
+            The threshold.
+
+        Returns
+        -------
+        starts : array
+            The index of the first sample of each interval.
+        ends : array
+            The index after the last sample of each interval, the last sample
+            being the first sample below the threshold.
+        """
+        with np.errstate(invalid="ignore"):
+            above = V > threshold
+            below = V < threshold
 
+        # Carry the last sample that was either above or below the threshold
+        # forward over the samples equal to (or not comparable with) the threshold
+        indices = np.where(above | below, np.arange(len(V)), -1)
+        indices = np.maximum.accumulate(indices)
+        state = np.where(indices >= 0, above[np.maximum(indices, 0)], False)
 
-                self.spikes.append(Spike(time_spike, V_spike, time_max, V_max, global_index))
-                prev_spike_end = spike_end
+        change = np.diff(np.concatenate(([False], state)).astype(np.int8))
 
-        self.nr_spikes = len(self.spikes)
+        starts = np.where(change == 1)[0]
+        ends = np.where(change == -1)[0] + 1
 
+        return starts[:len(ends)], ends
 
 
     def consecutive(self, data):
@@ -333,7 +518,7 @@ class Spikes:
 
         create_figure(nr_colors=self.nr_spikes)
 
-        for spike in self.spikes:
+        for spike in self:
             V_max.append(max(spike.V))
             V_min.append(min(spike.V))
             time_max.append(len(spike.time))
@@ -1,10 +1,4 @@
-try:
-    import scipy.interpolate
-    import scipy.optimize
-
-    prerequisites = True
-except ImportError:
-    prerequisites = False
+import numpy as np
 
 from .general_spiking_features import GeneralSpikingFeatures
 
@@ -106,9 +100,13 @@ class SpikingFeatures(GeneralSpikingFeatures):
     nr_spikes                   time_before_first_spike
     spike_rate                  average_AP_overshoot
     average_AHP_depth           average_AP_width
-    accommodation_index
+    accommodation_index         AP_widths
     ==========================  ==========================
 
+    AP_widths is an optional feature, it is not calculated when
+    `features_to_run` is ``"all"`` and must be given by name. It is always
+    adaptive, since the number of spikes varies between model evaluations.
+
     The features are from:
     Druckmann, S., Banitt, Y., Gidon, A. A., Schurmann, F., Markram, H., and Segev, I.
     (2007). A novel multiple objective optimization framework for constraining conductance-
@@ -131,16 +129,14 @@ class SpikingFeatures(GeneralSpikingFeatures):
                  verbose_level="info",
                  verbose_filename=None):
 
-        if not prerequisites:
-            raise ImportError("Spiking features require: scipy")
-
         implemented_labels = {"nr_spikes": ["Number of spikes"],
                               "spike_rate": ["Spike rate (Hz)"],
                               "time_before_first_spike": ["Time (ms)"],
                               "accommodation_index": ["Accommodation index"],
                               "average_AP_overshoot": ["Voltage (mV)"],
                               "average_AHP_depth": ["Voltage (mV)"],
-                              "average_AP_width": ["Time (ms)"]
+                              "average_AP_width": ["Time (ms)"],
+                              "AP_widths": ["Time (ms)", "AP width (ms)"]
                              }
 
         super(SpikingFeatures, self).__init__(new_features=new_features,
@@ -149,11 +145,48 @@ class SpikingFeatures(GeneralSpikingFeatures):
                                               threshold=threshold,
                                               extended_spikes=extended_spikes,
                                               labels=implemented_labels,
+                                              new_utility_methods=["calculate_AP_widths"],
                                               verbose_level=verbose_level,
                                               verbose_filename=verbose_filename)
         self.labels = labels
         self.strict = strict
 
+        if "AP_widths" not in self.adaptive:
+            self.adaptive = self.adaptive + ["AP_widths"]
+
+
+    @property
+    def features_to_run(self):
+        """
+        Which features to calculate uncertainties for.
+
+        Parameters
+        ----------
+        new_features_to_run : {"all", None, str, list of feature names}
+            Which features to calculate uncertainties for.
+            If ``"all"``, the uncertainties are calculated for all
+            implemented and assigned features, except the optional AP_widths.
+            If None, or an empty list , no features are
+            calculated.
+            If str, only that feature is calculated.
+            If list of feature names, all listed features are
+            calculated. Default is ``"all"``.
+
+        Returns
+        -------
+        list
+            A list of features to calculate uncertainties for.
+        """
+        return self._features_to_run
+
+
+    @features_to_run.setter
+    def features_to_run(self, new_features_to_run):
+        GeneralSpikingFeatures.features_to_run.fset(self, new_features_to_run)
+
+        if new_features_to_run == "all":
+            self._features_to_run.remove("AP_widths")
+
 
     def nr_spikes(self, time, spikes, info):
         """
@@ -212,12 +245,10 @@ class SpikingFeatures(GeneralSpikingFeatures):
         if info["stimulus_start"] >= info["stimulus_end"]:
             raise ValueError("stimulus_start >= stimulus_end.")
 
-        nr_spikes = 0
-        for spike in spikes:
-            if info["stimulus_start"] < spike.time_spike < info["stimulus_end"]:
-                nr_spikes += 1
+        nr_spikes = np.count_nonzero((info["stimulus_start"] < spikes.time_spike)
+                                     & (spikes.time_spike < info["stimulus_end"]))
 
-        return None, nr_spikes
+        return None, int(nr_spikes)
 
 
     def time_before_first_spike(self, time, spikes, info):
@@ -263,7 +294,7 @@ class SpikingFeatures(GeneralSpikingFeatures):
         if spikes.nr_spikes <= 0:
             return None, None
 
-        time = spikes.spikes[0].time_spike - info["stimulus_start"]
+        time = spikes.time_spike[0] - info["stimulus_start"]
 
         return None, time
 
@@ -360,9 +391,7 @@ class SpikingFeatures(GeneralSpikingFeatures):
         if spikes.nr_spikes <= 0:
             return None, None
 
-        sum_AP_overshoot = 0
-        for spike in spikes:
-            sum_AP_overshoot += spike.V_spike
+        sum_AP_overshoot = np.sum(spikes.V_spike)
 
         return None, sum_AP_overshoot/float(spikes.nr_spikes)
 
@@ -395,9 +424,9 @@ class SpikingFeatures(GeneralSpikingFeatures):
         if spikes.nr_spikes <= 0:
             return None, None
 
-        sum_AHP_depth = 0
-        for i in range(spikes.nr_spikes - 1):
-            sum_AHP_depth += min(self.values[spikes[i].global_index:spikes[i+1].global_index])
+        # Minimum between each pair of consecutive spike peaks
+        AHP_depths = np.minimum.reduceat(np.asarray(self.values), spikes.global_index)[:-1]
+        sum_AHP_depth = np.sum(AHP_depths)
 
         return None, sum_AHP_depth/float(spikes.nr_spikes)
 
@@ -408,6 +437,7 @@ class SpikingFeatures(GeneralSpikingFeatures):
 
         The average of the width of every spike (action potential) at the
         midpoint between the start and maximum of each spike.
+        See ``calculate_AP_widths`` for details.
 
         Parameters
         ----------
@@ -429,21 +459,130 @@ class SpikingFeatures(GeneralSpikingFeatures):
         if spikes.nr_spikes <= 0:
             return None, None
 
-        sum_AP_width = 0
-        for spike in spikes:
-            V_width = (spike.V_spike + spike.V[0])/2.
+        sum_AP_width = np.sum(self.calculate_AP_widths(spikes))
 
-            V_interpolation = scipy.interpolate.interp1d(spike.time, spike.V - V_width)
+        return None, sum_AP_width/float(spikes.nr_spikes)
 
-            # root1 = scipy.optimize.fsolve(U_interpolation, (spike.t_spike - spike.t[0])/2. + spike.t[0])
-            # root2 = scipy.optimize.fsolve(U_interpolation, (spike.t[-1] - spike.t_spike)/2. + spike.t_spike)
 
-            root1 = scipy.optimize.brentq(V_interpolation, spike.time[0], spike.time_spike)
-            root2 = scipy.optimize.brentq(V_interpolation, spike.time_spike, spike.time[-1])
+    def AP_widths(self, time, spikes, info):
+        """
+        The width of each spike (action potential).
 
-            sum_AP_width += abs(root2 - root1)
+        The width of each spike at the midpoint between the start and maximum
+        of the spike, see ``calculate_AP_widths`` for details. This feature is
+        optional and not calculated when `features_to_run` is ``"all"``.
 
-        return None, sum_AP_width/float(spikes.nr_spikes)
+        Parameters
+        ----------
+        time : {None, numpy.nan, array_like}
+            Time values of the model. If no time values it is None or numpy.nan.
+        spikes : Spikes
+            Spikes found in the model result.
+        info : dictionary
+            Not used in this feature.
+
+        Returns
+        -------
+        time_spike : {array, None}
+            The time of the peak of each spike. Returns None if there are no
+            spikes in the model result.
+        AP_widths : {array, None}
+            The width of each spike. Returns None if there are no spikes in
+            the model result.
+
+        Notes
+        -----
+        The number of spikes varies between model evaluations, so AP_widths
+        is always adaptive.
+        """
+        if spikes.nr_spikes <= 0:
+            return None, None
+
+        return spikes.time_spike, self.calculate_AP_widths(spikes)
+
+
+    def calculate_AP_widths(self, spikes):
+        """
+        Calculate the width of each spike (action potential) at the midpoint
+        between the start and maximum of the spike.
+
+        Parameters
+        ----------
+        spikes : Spikes
+            Spikes found in the model result.
+
+        Returns
+        -------
+        AP_widths : array
+            The width of each spike.
+
+        Raises
+        ------
+        ValueError
+            If a spike does not cross the midpoint both before and after the
+            peak of the spike.
+
+        Notes
+        -----
+        The times where a spike crosses the midpoint are found by linear
+        interpolation between the two samples on each side of the midpoint,
+        for all spikes at once. If a spike crosses the midpoint several times
+        on one side of the peak, the crossing closest to the peak is used.
+        This gives the same widths as finding the roots of the linearly
+        interpolated spike with ``scipy.optimize.brentq``, within the
+        tolerance of ``brentq`` (about 1e-12), when each side of the spike
+        crosses the midpoint once.
+
+        The width of each spike is calculated as a feature by ``AP_widths``.
+        """
+        start = np.asarray(spikes.start)
+        end = np.asarray(spikes.end)
+
+        if len(start) == 0:
+            return np.array([])
+
+        V_trace = np.asarray(spikes.V)
+        time_trace = np.asarray(spikes.time)
+
+        # Concatenate the samples of all spikes, spikes may share samples
+        lengths = end - start
+        offsets = np.cumsum(lengths) - lengths
+        spike_id = np.repeat(np.arange(len(start)), lengths)
+        indices = np.arange(np.sum(lengths)) - offsets[spike_id] + start[spike_id]
+
+        V_width = (spikes.V_spike + V_trace[start])/2.
+        V = V_trace[indices] - V_width[spike_id]
+        time = time_trace[indices]
+
+        # Pairs of consecutive samples in the same spike that are on each side
+        # of (or at) the midpoint, crossings[i] is the first sample of the pair
+        crossings = np.where((V[:-1]*V[1:] <= 0)
+                             & ((V[:-1] != 0) | (V[1:] != 0))
+                             & (spike_id[:-1] == spike_id[1:]))[0]
+
+        if len(crossings) == 0:
+            raise ValueError("No spike crosses the midpoint on both sides of the peak")
+
+        peaks = offsets + spikes.global_index - start
+
+        # The last crossing before the peak and the first crossing after
+        falling = np.searchsorted(crossings, peaks)
+        rising = falling - 1
+
+        found = (rising >= 0) & (falling < len(crossings)) & (start >= 0)
+        rising = crossings[np.clip(rising, 0, len(crossings) - 1)]
+        falling = crossings[np.clip(falling, 0, len(crossings) - 1)]
+        found &= (spike_id[rising] == np.arange(len(start))) & (spike_id[falling] == np.arange(len(start)))
+
+        if not np.all(found):
+            index = spikes.global_index[np.argmin(found)]
+            raise ValueError("The spike at index {} does not cross the midpoint "
+                             "on both sides of the peak".format(index))
+
+        def crossing_time(i):
+            return time[i] + (time[i + 1] - time[i])*V[i]/(V[i] - V[i + 1])
+
+        return np.abs(crossing_time(falling) - crossing_time(rising))
 
 
     def accommodation_index(self, time, spikes, info):
@@ -492,12 +631,8 @@ class SpikingFeatures(GeneralSpikingFeatures):
 
         k = min(4, int(round(N-1)/5.))
 
-        ISIs = []
-        for i in range(N-1):
-            ISIs.append(spikes[i+1].time_spike - spikes[i].time_spike)
+        ISIs = np.diff(spikes.time_spike)
 
-        A = 0
-        for i in range(k+1, N-1):
-            A += (ISIs[i] - ISIs[i-1])/(ISIs[i] + ISIs[i-1])
+        A = np.sum((ISIs[k+1:] - ISIs[k:-1])/(ISIs[k+1:] + ISIs[k:-1]))
 
         return None, A/(N - k - 1)
@@ -29,6 +29,10 @@ class Model(object):
     ignore : bool, optional
         Ignore the model results when calculating uncertainties, which means the
         uncertainty is not calculated for the model. Default is False.
+    vectorized : bool, optional
+        True if ``run`` evaluates a whole batch of parameter sets in a single
+        call, see ``run`` for the requirements. False if not.
+        Default is False.
 
     Attributes
     ----------
@@ -47,6 +51,9 @@ class Model(object):
     ignore : bool
         Ignore the model results when calculating uncertainties, which means the
         uncertainty is not calculated for the model. Default is False.
+    vectorized : bool
+        True if ``run`` evaluates a whole batch of parameter sets in a single
+        call.
 
     See Also
     --------
@@ -59,9 +66,11 @@ class Model(object):
                  labels=[],
                  postprocess=None,
                  suppress_graphics=False,
-                 ignore=False):
+                 ignore=False,
+                 vectorized=False):
 
         self.adaptive = adaptive
+        self.vectorized = vectorized
         self.labels = labels
         self.ignore = ignore
         self.suppress_graphics = suppress_graphics
@@ -173,9 +182,20 @@ class Model(object):
         uncertainty quantification, you can implement the postprocessing in the
         ``postprocess`` method.
 
+        If the model is `vectorized`, each parameter is instead given as an
+        array with one value for each parameter set in the batch, and the
+        model must return the results for the whole batch:
+        `values` must have one element (or row) for each parameter set, while
+        `time` is either shared by all parameter sets, or a list with one time
+        array for each parameter set. The info objects are shared by all
+        parameter sets. The results are split into the results for each
+        parameter set by ``split_run_result`` before they are postprocessed and
+        the features are calculated.
+
         See also
         --------
         uncertainpy.features
+        uncertainpy.models.Model.split_run_result
         uncertainpy.features.Features.preprocess : Preprocessing of model results before feature calculation
         uncertainpy.model.Model.postprocess : Postprocessing of model result.
         """
@@ -352,6 +372,91 @@ class Model(object):
             raise
 
 
+    def split_run_result(self, model_result, nr_evaluations):
+        """
+        Split the results from a vectorized ``run()`` into the results for
+        each parameter set in the batch.
+
+        Parameters
+        ----------
+        model_result
+            The model results returned by a vectorized ``run``, on the form
+            ``time, values, info_1, info_2, ...``.
+        nr_evaluations : int
+            The number of parameter sets in the batch.
+
+        Returns
+        -------
+        model_results : list
+            A list with the model results ``(time, values, info_1, ...)`` for
+            each parameter set in the batch.
+
+        Raises
+        ------
+        ValueError
+            If the number of `values` or `time` arrays does not match the
+            number of parameter sets.
+
+        Notes
+        -----
+        `time` is split if it is a list or tuple of arrays, one for each
+        parameter set, otherwise it is shared by all parameter sets. The info
+        objects are shared by all parameter sets. Override this method if the
+        model returns the results in another form.
+        """
+        time, values = model_result[:2]
+        info = tuple(model_result[2:])
+
+        if len(values) != nr_evaluations:
+            raise ValueError("A vectorized model.run() must return values for each of the "
+                             + "{} parameter sets, not {}".format(nr_evaluations, len(values)))
+
+        if isinstance(time, (list, tuple)) and all(np.ndim(time_tmp) > 0 for time_tmp in time):
+            if len(time) != nr_evaluations:
+                raise ValueError("A vectorized model.run() must return time values for each of the "
+                                 + "{} parameter sets, not {}".format(nr_evaluations, len(time)))
+            times = time
+        else:
+            times = [time]*nr_evaluations
+
+        return [(times[i], values[i]) + info for i in range(nr_evaluations)]
+
+
+    def setup_worker(self):
+        """
+        One-time setup of the model in each worker, called once when a worker
+        starts and before the first model evaluation in that worker.
+
+        Reimplement this method to perform expensive setup that is the same
+        for all model evaluations, for example loading a mechanism library or
+        compiling a kernel, instead of doing it in ``run`` for every
+        evaluation. The time spent in the setup is reported separately from
+        the model evaluations. Does nothing by default.
+
+        See Also
+        --------
+        uncertainpy.models.Model.teardown_worker
+        """
+        pass
+
+
+    def teardown_worker(self):
+        """
+        Clean up after ``setup_worker``, called once when a worker is shut
+        down. Does nothing by default.
+
+        Notes
+        -----
+        Workers that are terminated, for example when the program is
+        interrupted, do not call ``teardown_worker``.
+
+        See Also
+        --------
+        uncertainpy.models.Model.setup_worker
+        """
+        pass
+
+
     def set_parameters(self, **parameters):
         """
         Set all named arguments as attributes of the model class.
@@ -8,6 +8,7 @@ except ImportError:
 import numpy as np
 
 from .model import Model
+from ..utils import SpikeTrains
 
 
 class NestModel(Model):
@@ -30,6 +31,12 @@ class NestModel(Model):
     run : {None, function}, optional
         A function that implements the model. See Note for requirements of the
         function. Default is None.
+    sparse : bool, optional
+        If the postprocessed spike trains are stored as a sparse SpikeTrains
+        object, instead of as a dense array with the spike probability at each
+        time step. The uncertainty of the model itself is not calculated for
+        sparse spike trains, only the uncertainty of the features.
+        Default is False.
 
     Attributes
     ----------
@@ -39,6 +46,9 @@ class NestModel(Model):
     adaptive : bool
         True if the model is adaptive, meaning it has a varying number of
         return values. False if not. Default is False.
+    sparse : bool
+        If the postprocessed spike trains are stored as a sparse SpikeTrains
+        object.
 
     See Also
     --------
@@ -47,7 +57,8 @@ class NestModel(Model):
     def __init__(self,
                  run=None,
                  adaptive=False,
-                 labels=["Time (ms)", "Neuron nr", "Spiking probability"]):
+                 labels=["Time (ms)", "Neuron nr", "Spiking probability"],
+                 sparse=False):
 
 
         if not prerequisites:
@@ -55,7 +66,10 @@ class NestModel(Model):
 
         super(NestModel, self).__init__(run=run,
                                         adaptive=adaptive,
-                                        labels=labels)
+                                        labels=labels,
+                                        ignore=sparse)
+
+        self.sparse = sparse
 
 
     @Model.run.getter
@@ -136,30 +150,27 @@ class NestModel(Model):
 
         Returns
         -------
-        time : array
+        time : {array, None}
             A time array of all time points in the Nest simulation.
-        spiketrains : list
+            None if `sparse` is True.
+        spiketrains : {array, SpikeTrains}
             A list of the probability for a spike at each timestep, for each
-            neuron.
+            neuron. If `sparse` is True, the spike trains as a SpikeTrains
+            object, which only stores the spike times.
 
         Example
         -------
         In a simulation that gives the spiketrain ``[0, 2, 3]``, with a
         time resolution of 0.5 ms and that ends after 4 ms,
         the resulting spike train become:
-        ``[1, 0, 0, 0, 1, 0, 1, 0, 0]``.
+        ``[1, 0, 0, 0, 1, 0, 1, 0]``.
         """
 
         dt = nest.GetKernelStatus()["resolution"]
-        time = np.arange(0, simulation_end, dt)
-
-        expanded_spiketrains = []
-        for spiketrain in spiketrains:
-            binary_spike = np.zeros(len(time))
-            binary_spike[np.in1d(time, spiketrain)] = 1
 
-            expanded_spiketrains.append(binary_spike)
+        spike_trains = SpikeTrains.from_spiketrains(spiketrains, simulation_end, dt)
 
-        values = np.array(expanded_spiketrains)
+        if self.sparse:
+            return None, spike_trains
 
-        return time, values
\ No newline at end of file
+        return spike_trains.to_dense()
\ No newline at end of file
@@ -1,10 +1,23 @@
 import os
+import re
 
 import numpy as np
 
 from .model import Model
 
 
+# The Neuron model loaded in this process, used by models with
+# ``load_once=True`` to avoid loading the same model for each evaluation.
+# ``initial_values`` contains the value each parameter had before it was
+# first changed.
+# ``sections`` and ``vectors`` are the cached sections and recording Vectors.
+_loaded_neuron = {"key": None,
+                  "h": None,
+                  "initial_values": {},
+                  "sections": None,
+                  "vectors": {}}
+
+
 class NeuronModel(Model):
     """
     Class for Neuron simulator models.
@@ -33,6 +46,19 @@ class NeuronModel(Model):
     suppress_graphics : bool, optional
         Suppress all graphics created by the Neuron model.
         Default is True.
+    load_once : bool, optional
+        Only load the Neuron model the first time it is run in each process,
+        instead of once for each model evaluation. Parameters that have been
+        changed by a previous evaluation, but are not set in the current
+        evaluation, are reset to their initial value before each evaluation.
+        Default is False.
+    recordings : {None, dict}, optional
+        Additional variables to record, in addition to the voltage in the
+        soma. A dictionary with the name of each recording as key and a
+        ``(section name, position, variable)`` tuple as value, for example
+        ``{"dendrite": ("dend", 0.5, "v")}``. The recordings are added to
+        info as a dictionary with key ``"recordings"``.
+        Default is None.
     **kwargs :
         Additional key-value pairs added to info.
 
@@ -48,15 +74,26 @@ class NeuronModel(Model):
         time values. False if not. Default is False.
     suppress_graphics : bool
         Suppress all graphics created by the model.
+    load_once : bool
+        Only load the Neuron model the first time it is run in each process.
+    recordings : {None, dict}
+        Additional variables to record.
 
     Raises
     ------
     RuntimeError
         If no section with name ``soma`` is found in the Neuron model.
+    RuntimeError
+        If a section in ``recordings`` is not found in the Neuron model.
 
     Notes
     -----
     Measures the voltage in the section with name ``soma``.
+
+    With ``load_once=True`` only the parameters are reset between model
+    evaluations. Models whose hoc code changes other variables after it is
+    loaded, and that relies on those changes being undone before the next
+    evaluation, must use ``load_once=False``.
     """
     def __init__(self,
                  file="mosinit.hoc",
@@ -68,6 +105,8 @@ class NeuronModel(Model):
                  stimulus_start=None,
                  stimulus_end=None,
                  suppress_graphics=True,
+                 load_once=False,
+                 recordings=None,
                  **kwargs):
 
         super(NeuronModel, self).__init__(adaptive=adaptive,
@@ -76,6 +115,8 @@ class NeuronModel(Model):
 
         self.file = file
         self.path = path
+        self.load_once = load_once
+        self.recordings = recordings
         self.info = {}
 
         if stimulus_end:
@@ -98,19 +139,36 @@ class NeuronModel(Model):
     def load_neuron(self):
         """
         Import neuron and load neuron simulation file.
+
+        If ``load_once`` is True, the file is only loaded if it is not the
+        file already loaded in this process.
         """
+        key = (os.path.abspath(self.path or os.curdir), self.file)
+
+        if self.load_once and _loaded_neuron["key"] == key:
+            self.h = _loaded_neuron["h"]
+            return
+
         current_dir = os.getcwd()
-        os.chdir(self.path)
+        if self.path is not None:
+            os.chdir(self.path)
 
         try:
-            import neuron
-        except ImportError:
-            raise ImportError("NeuronModel requires: neuron")
+            try:
+                import neuron
+            except ImportError:
+                raise ImportError("NeuronModel requires: neuron")
 
-        self.h = neuron.h
-        self.h.load_file(1, self.file)
+            self.h = neuron.h
+            self.h.load_file(1, self.file)
+        finally:
+            os.chdir(current_dir)
 
-        os.chdir(current_dir)
+        _loaded_neuron["key"] = key
+        _loaded_neuron["h"] = self.h
+        _loaded_neuron["initial_values"] = {}
+        _loaded_neuron["sections"] = None
+        _loaded_neuron["vectors"] = {}
 
 
 
@@ -119,10 +177,66 @@ class NeuronModel(Model):
     def _record(self, ref_data):
         """
         Record data from a neuron simulation.
+
+        The recording Vectors are reused in later model evaluations in the
+        same process, until the Neuron model is loaded again. Neuron resizes
+        recorded Vectors to zero when the simulation is initialized, so the
+        memory allocated in the first simulation is reused.
+
+        Parameters
+        ----------
+        ref_data : {str, tuple}
+            Name of a top level variable to record (for example ``"_ref_t"``),
+            or a ``(section name, position, variable)`` tuple
+            (for example ``("soma", 0.5, "v")``).
+
+        Returns
+        -------
+        data : A Neuron Vector object
+            The Vector the data is recorded in.
+        """
+        vectors = _loaded_neuron["vectors"]
+
+        if ref_data not in vectors:
+            if isinstance(ref_data, tuple):
+                section_name, position, variable = ref_data
+                section = self._find_section(section_name)
+                reference = getattr(section(position), "_ref_" + variable)
+            else:
+                reference = getattr(self.h, ref_data)
+
+            data = self.h.Vector()
+            data.record(reference)
+            vectors[ref_data] = data
+
+        return vectors[ref_data]
+
+
+    def _find_section(self, name):
+        """
+        Find a section by name. The sections are cached until the Neuron model
+        is loaded again.
+
+        Parameters
+        ----------
+        name : str
+            Name of the section, the comparison is case insensitive.
+
+        Returns
+        -------
+        section : {A Neuron Section object, None}
+            The section, or None if no section with the given name exists.
         """
-        data = self.h.Vector()
-        data.record(getattr(self.h, ref_data))
-        return data
+        sections = _loaded_neuron["sections"]
+
+        if sections is None:
+            sections = {}
+            for section in self.h.allsec():
+                sections.setdefault(section.name().lower(), section)
+
+            _loaded_neuron["sections"] = sections
+
+        return sections.get(name.lower())
 
 
     def _to_array(self, hocObject):
@@ -138,10 +252,20 @@ class NeuronModel(Model):
         -------
         array : array
             The converted array.
+
+        Notes
+        -----
+        The recording Vectors are reused between model evaluations, so the
+        array is always a copy of the data in the Vector. If Neuron supports
+        ``Vector.as_numpy`` the data is copied directly from the memory of the
+        Vector.
         """
-        array = np.zeros(int(round(hocObject.size())))
-        hocObject.to_python(array)
-        return array
+        try:
+            return np.array(hocObject.as_numpy(), dtype=float)
+        except AttributeError:
+            array = np.zeros(int(round(hocObject.size())))
+            hocObject.to_python(array)
+            return array
 
 
     def _record_v(self):
@@ -153,15 +277,10 @@ class NeuronModel(Model):
         RuntimeError
             If no section with name ``soma`` is found in the Neuron model.
         """
-        self.V = None
-        for section in self.h.allsec():
-            if section.name().lower() == "soma":
-                self.V = self.h.Vector()
-                self.V.record(section(0.5)._ref_v)
-                break
+        if self._find_section("soma") is None:
+            raise RuntimeError("Soma not found in Neuron model: {model_name}".format(model_name=self.name))
 
-        if self.V is None:
-            raise RuntimeError("Soma not found in Neuron model: {model_name}".format(self.name))
+        self.V = self._record(("soma", 0.5, "v"))
 
 
     def _record_t(self):
@@ -171,6 +290,27 @@ class NeuronModel(Model):
         self.time = self._record("_ref_t")
 
 
+    def _record_recordings(self):
+        """
+        Record the additional variables given in ``recordings``.
+
+        Raises
+        ------
+        RuntimeError
+            If a section in ``recordings`` is not found in the Neuron model.
+        """
+        self.recorded = {}
+
+        for name in self.recordings:
+            section_name, position, variable = self.recordings[name]
+
+            if self._find_section(section_name) is None:
+                raise RuntimeError("Section {section} not found in Neuron model: {model_name}".format(section=section_name,
+                                                                                                  model_name=self.name))
+
+            self.recorded[name] = self._record((section_name, position, variable))
+
+
 
     @Model.run.setter
     def run(self, new_run):
@@ -202,17 +342,29 @@ class NeuronModel(Model):
     def _run(self, **parameters):
         self.load_neuron()
 
+        if self.load_once:
+            self.reset_parameters(parameters)
+
         self.set_parameters(parameters)
 
         self._record_t()
         self._record_v()
 
+        if self.recordings:
+            self._record_recordings()
+
         self.h.run()
 
         values = self._to_array(self.V)
         time = self._to_array(self.time)
 
-        return time, values, self.info
+        info = self.info
+        if self.recordings:
+            info = dict(self.info)
+            info["recordings"] = dict((name, self._to_array(self.recorded[name]))
+                                      for name in self.recorded)
+
+        return time, values, info
 
 
     def set_parameters(self, parameters):
@@ -226,7 +378,80 @@ class NeuronModel(Model):
             value.
         """
         for parameter in parameters:
-            self.h(parameter + " = " + str(parameters[parameter]))
+            self._set_parameter(parameter, parameters[parameter])
+
+
+    def reset_parameters(self, parameters):
+        """
+        Reset parameters changed by previous model evaluations in this
+        process to their initial value, and store the initial value of
+        parameters that are changed for the first time.
+        Used when ``load_once`` is True.
+
+        Parameters
+        ----------
+        parameters : dict
+            A dictionary with the parameters that are about to be set as keys
+            and the parameter value as value.
+
+        Notes
+        -----
+        The parameters are reset with ``set_parameters``, so a reimplemented
+        ``set_parameters`` that updates quantities derived from the
+        parameters is also used when the parameters are reset.
+        """
+        initial_values = _loaded_neuron["initial_values"]
+
+        reset = {}
+        for parameter in initial_values:
+            if parameter not in parameters:
+                reset[parameter] = initial_values[parameter]
+
+        if reset:
+            self.set_parameters(reset)
+
+        for parameter in parameters:
+            if parameter not in initial_values:
+                initial_values[parameter] = self._get_parameter(parameter)
+
+
+    def _is_variable(self, parameter):
+        """
+        If a parameter is a top level variable in Neuron that can be accessed
+        directly as an attribute of ``h``.
+        """
+        return re.match(r"^[A-Za-z_]\w*$", parameter) is not None \
+            and hasattr(self.h, parameter)
+
+
+    def _set_parameter(self, parameter, value):
+        """
+        Set a single parameter in the neuron model. Top level variables are
+        assigned directly, other parameters (for example ``"soma Ra"``) are
+        set through the hoc interpreter.
+        """
+        if self._is_variable(parameter):
+            setattr(self.h, parameter, value)
+        else:
+            self.h(parameter + " = " + str(value))
+
+
+    def _get_parameter(self, parameter):
+        """
+        Get the current value of a single parameter in the neuron model.
+        """
+        if self._is_variable(parameter):
+            return getattr(self.h, parameter)
+
+        # Parameters on the form "section variable" are evaluated with the
+        # section as the currently accessed section
+        words = parameter.rsplit(" ", 1)
+        if len(words) == 2:
+            self.h(words[0] + " hoc_ac_ = " + words[1])
+        else:
+            self.h("hoc_ac_ = " + parameter)
+
+        return self.h.hoc_ac_
 
 
     def postprocess(self, time, values, info):
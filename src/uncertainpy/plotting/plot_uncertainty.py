@@ -10,7 +10,7 @@ from .prettyplot import get_colormap_tableu20, set_style
 from .prettyplot import axis_grey, labelsize, fontsize, titlesize, linewidth
 
 from ..data import Data
-from ..utils import create_logger
+from ..utils import create_logger, SpikeTrains
 
 
 # TODO compare plots in a grid of all plots,
@@ -351,13 +351,24 @@ class PlotUncertainty(object):
         labels = self.data.get_labels(feature)
         xlabel, ylabel, zlabel = labels
 
-        if self.data[feature].time is None or np.all(np.isnan(self.data[feature].time)):
+        sparse = any(isinstance(evaluation, SpikeTrains) for evaluation in self.data[feature].evaluations)
+
+        if sparse:
+            time = None
+        elif self.data[feature].time is None or np.all(np.isnan(self.data[feature].time)):
             time = np.arange(0, len(self.data[feature].evaluations[0]))
         else:
             time = self.data[feature].time
 
         padding = len(str(len(self.data[feature].evaluations) + 1))
         for i, evaluation in enumerate(self.data[feature].evaluations):
+            # Sparse spike trains are only converted to dense arrays when plotted
+            if sparse:
+                if not isinstance(evaluation, SpikeTrains):
+                    continue
+
+                time, evaluation = evaluation.to_dense()
+
             fig = plt.figure()
             ax = fig.add_subplot(111)
             ax.set_title("{}, evaluation {:d}".format(feature.replace("_", " "), i))
@@ -1,4 +1,5 @@
 import os
+import time
 import types
 import multiprocess as mp
 import numpy as np
@@ -53,6 +54,70 @@ class UncertaintyQuantification(ParameterBase):
     CPUs : int, optional
         The number of CPUs used when calculating the model and features.
         By default all CPUs are used.
+    backend : {"process", "thread", "serial", "mpi", Executor}, optional
+        The backend used to evaluate the model. "process" uses a pool of
+        worker processes, "thread" a pool of threads, "serial" evaluates
+        the model in the current process, and "mpi" uses a pool of MPI
+        processes (requires mpi4py).
+        Default is "process".
+    timeout : {None, float}, optional
+        The maximum time in seconds a single model evaluation, including the
+        calculation of the features, is allowed to take. If None, there is no
+        time limit. The timeout is not supported by the "thread" backend.
+        Default is None.
+    retries : int, optional
+        The number of times a failed or timed out model evaluation is retried
+        before it is given up.
+        Default is 0.
+    on_error : {"raise", "nan"}, optional
+        What to do when a model evaluation has failed after all retries.
+        "raise" aborts the uncertainty quantification by re-raising the
+        exception. "nan" records the evaluation as failed, and the model and
+        all features get numpy.nan as result for that evaluation. The failed
+        evaluations are listed in ``data.failures``.
+        Default is "raise".
+    cache : {None, EvaluationCache}, optional
+        Cache of model evaluations. Model evaluations found in the cache are
+        not performed again, for example when repeating an uncertainty
+        quantification with a different polynomial order. If None, no cache
+        is used.
+        Default is None.
+    time_grid : {None, array, int, "pilot"}, optional
+        The common time grid adaptive model/features are interpolated onto
+        by the workers directly after each model evaluation. An array is used
+        as the time grid for all adaptive model/features, "pilot" uses the
+        time values from a pilot run of the first node, and an integer ``N``
+        uses ``N`` evenly spaced time points over the time range of the pilot
+        run. If None, the results are interpolated onto the longest time array
+        after all model evaluations are finished.
+        Default is None.
+    batch_size : {None, int}, optional
+        The number of parameter sets sent to a worker at the time, for
+        vectorized models (see Model.run). If None, the parameter sets are
+        divided evenly between the workers.
+        Default is None.
+    max_inflight : {None, int}, optional
+        The maximum number of model evaluations that are submitted to the
+        workers but not yet stored. Limits the memory used when the workers
+        are faster than the results are stored. If None, all model evaluations
+        are submitted at once.
+        Default is None.
+    max_memory : {None, int}, optional
+        The maximum memory in bytes used by the results of the model
+        evaluations that are submitted to the workers but not yet stored.
+        If None, there is no memory limit.
+        Default is None.
+    memmap_threshold : {None, int}, optional
+        Numerical arrays in the model and feature results larger than this
+        number of bytes are sent from the workers through memory-mapped files
+        instead of being pickled, which is faster for large results. Only
+        supported by the "process" backend. If None, all results are pickled.
+        Default is None.
+    scratch_folder : {None, str}, optional
+        The folder where the memory-mapped files are stored. If None,
+        ``/dev/shm`` is used if it exists, otherwise the temporary folder of
+        the system.
+        Default is None.
     verbose_level : {"info", "debug", "warning", "error", "critical"}, optional
         Set the threshold for the logging level. Logging messages less severe
         than this level is ignored.
@@ -79,6 +144,19 @@ class UncertaintyQuantification(ParameterBase):
     logger : logging.Logger
         Logger object responsible for logging to screen or file.
 
+    Notes
+    -----
+    The workers used to evaluate the model are reused for every uncertainty
+    quantification performed. Use UncertaintyQuantification as a context
+    manager, or call ``close``, to shut down the workers when they are no
+    longer needed:
+
+    .. code-block:: Python
+
+        with un.UncertaintyQuantification(model, parameters) as UQ:
+            UQ.quantify(method="pc")
+            UQ.quantify(method="mc")
+
     See Also
     --------
     uncertainpy.features
@@ -98,7 +176,18 @@ class UncertaintyQuantification(ParameterBase):
                  custom_uncertainty_quantification=None,
                  verbose_level="info",
                  verbose_filename=None,
-                 CPUs=mp.cpu_count()):
+                 CPUs=mp.cpu_count(),
+                 backend="process",
+                 timeout=None,
+                 retries=0,
+                 on_error="raise",
+                 cache=None,
+                 time_grid=None,
+                 batch_size=None,
+                 max_inflight=None,
+                 max_memory=None,
+                 memmap_threshold=None,
+                 scratch_folder=None):
 
 
         if uncertainty_calculations is None:
@@ -109,6 +198,17 @@ class UncertaintyQuantification(ParameterBase):
                 create_PCE_custom=create_PCE_custom,
                 custom_uncertainty_quantification=custom_uncertainty_quantification,
                 CPUs=CPUs,
+                backend=backend,
+                timeout=timeout,
+                retries=retries,
+                on_error=on_error,
+                cache=cache,
+                time_grid=time_grid,
+                batch_size=batch_size,
+                max_inflight=max_inflight,
+                max_memory=max_memory,
+                memmap_threshold=memmap_threshold,
+                scratch_folder=scratch_folder,
                 verbose_level=verbose_level,
                 verbose_filename=verbose_filename
             )
@@ -134,6 +234,30 @@ class UncertaintyQuantification(ParameterBase):
                                         verbose_filename=verbose_filename)
 
 
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """
+        Shut down the workers used to evaluate the model.
+
+        The same workers are reused for every uncertainty quantification
+        performed, so the cost of starting the workers is only paid once.
+        Call this method when no more uncertainty quantifications are going
+        to be performed.
+
+        See also
+        --------
+        uncertainpy.core.RunModel.close
+        """
+        self.uncertainty_calculations.close()
+
+
     @ParameterBase.features.setter
     def features(self, new_features):
         ParameterBase.features.fset(self, new_features)
@@ -207,6 +331,14 @@ class UncertaintyQuantification(ParameterBase):
                  save=True,
                  data_folder="data",
                  filename=None,
+                 backend=None,
+                 memmap_threshold=None,
+                 scratch_folder=None,
+                 checkpoint=False,
+                 resume=False,
+                 profile=False,
+                 store_model_outputs=False,
+                 reuse_model_outputs=False,
                  **custom_kwargs):
         """
         Perform an uncertainty quantification and sensitivity analysis
@@ -290,6 +422,59 @@ class UncertaintyQuantification(ParameterBase):
         filename : {None, str}, optional
             Name of the data file. If None the model name is used.
             Default is None.
+        backend : {None, "process", "thread", "serial", "mpi", Executor}, optional
+            The backend used to evaluate the model. If None, the current
+            backend is used (set when creating UncertaintyQuantification).
+            If given, the backend is changed to `backend` for this and all
+            later uncertainty quantifications. "process" uses a pool of
+            worker processes, "thread" a pool of threads, "serial" evaluates
+            the model in the current process, and "mpi" uses a pool of MPI
+            processes (requires mpi4py).
+            Default is None.
+        memmap_threshold : {None, int}, optional
+            Numerical arrays in the model and feature results larger than this
+            number of bytes are sent from the workers through memory-mapped
+            files instead of being pickled. Only supported by the "process"
+            backend. If None, the current setting is used (set when creating
+            UncertaintyQuantification). If given, it is used for this and all
+            later uncertainty quantifications.
+            Default is None.
+        scratch_folder : {None, str}, optional
+            The folder where the memory-mapped files are stored. If None, the
+            current folder is used.
+            Default is None.
+        checkpoint : bool, optional
+            If each model evaluation should be stored in a checkpoint file,
+            ``data_folder/filename_checkpoint.h5``, as soon as it is finished.
+            Default is False.
+        resume : bool, optional
+            If the finished model evaluations in an existing checkpoint file
+            should be reused, so only the missing and failed evaluations are
+            performed.
+            Implies `checkpoint`. The evaluations are matched by the values of
+            the uncertain parameters, so the same `seed` must be used as in
+            the interrupted run.
+            Default is False.
+        profile : bool, optional
+            If each model evaluation should be profiled with cProfile in the
+            workers. The profile statistics of all model evaluations are
+            merged and saved as ``data_folder/filename.prof``, which can be
+            read with ``pstats.Stats``.
+            Default is False.
+        store_model_outputs : bool, optional
+            If the raw output of each model evaluation, everything returned by
+            the model function, should be stored in the folder
+            ``data_folder/filename_model_outputs``, so the features can be
+            recalculated with ``recompute_features`` without running the model
+            again.
+            Default is False.
+        reuse_model_outputs : bool, optional
+            If the features should be calculated from the model outputs stored
+            in ``data_folder/filename_model_outputs`` instead of running the
+            model. Implies `store_model_outputs`. The model outputs are matched
+            by the values of the model parameters, so the same `seed` must be
+            used as when the model outputs were stored.
+            Default is False.
         **custom_kwargs
             Any number of arguments for either the custom polynomial chaos method,
             ``create_PCE_custom``, or the custom uncertainty quantification,
@@ -351,6 +536,15 @@ class UncertaintyQuantification(ParameterBase):
         uncertainpy.core.UncertaintyCalculations.create_PCE_custom : Requirements for create_PCE_custom
         uncertainpy.core.UncertaintyCalculations.custom_uncertainty_quantification : Requirements for custom_uncertainty_quantification
         """
+        if backend is not None:
+            self.uncertainty_calculations.runmodel.backend = backend
+
+        if memmap_threshold is not None:
+            self.uncertainty_calculations.runmodel.memmap_threshold = memmap_threshold
+
+        if scratch_folder is not None:
+            self.uncertainty_calculations.runmodel.scratch_folder = scratch_folder
+
         uncertain_parameters = self.uncertainty_calculations.convert_uncertain_parameters(uncertain_parameters)
 
         if method.lower() == "pc":
@@ -369,6 +563,11 @@ class UncertaintyQuantification(ParameterBase):
                                   save=save,
                                   data_folder=data_folder,
                                   filename=filename,
+                                  checkpoint=checkpoint,
+                                  resume=resume,
+                                  profile=profile,
+                                  store_model_outputs=store_model_outputs,
+                                  reuse_model_outputs=reuse_model_outputs,
                                   **custom_kwargs)
 
         elif method.lower() == "mc":
@@ -380,7 +579,12 @@ class UncertaintyQuantification(ParameterBase):
                              save=save,
                              data_folder=data_folder,
                              filename=filename,
-                             seed=seed)
+                             seed=seed,
+                             checkpoint=checkpoint,
+                             resume=resume,
+                             profile=profile,
+                             store_model_outputs=store_model_outputs,
+                             reuse_model_outputs=reuse_model_outputs)
 
         elif method.lower() == "custom":
             self.custom_uncertainty_quantification(plot=plot,
@@ -397,6 +601,58 @@ class UncertaintyQuantification(ParameterBase):
         return self.data
 
 
+    def recompute_features(self, features=None, **kwargs):
+        """
+        Recalculate the features from the model outputs stored by a previous
+        uncertainty quantification with ``store_model_outputs=True``, and
+        perform the uncertainty quantification and sensitivity analysis again,
+        without running the model.
+
+        Parameters
+        ----------
+        features : {None, Features or Features subclass instance, list of feature functions}, optional
+            The new features to calculate. If None, the current features
+            are recalculated.
+            Default is None.
+        **kwargs
+            Any number of arguments for ``quantify``. The same method, uncertain
+            parameters, `seed`, `data_folder` and `filename` must be used as
+            when the model outputs were stored, so the same nodes are created
+            and the stored model outputs are found.
+
+        Returns
+        -------
+        data : Data
+            A data object that contains the results from the uncertainty quantification.
+            Contains all model and feature evaluations, as well as all calculated
+            statistical metrics.
+
+        Raises
+        ------
+        ValueError
+            If ``method="custom"``.
+
+        Notes
+        -----
+        The model is run for the nodes that have no stored model output, and
+        their model outputs are stored.
+
+        See also
+        --------
+        uncertainpy.UncertaintyQuantification.quantify
+        uncertainpy.core.ModelOutputs
+        """
+        if kwargs.get("method", "pc").lower() == "custom":
+            raise ValueError("recompute_features does not support custom uncertainty quantification methods")
+
+        if features is not None:
+            self.features = features
+
+        kwargs["reuse_model_outputs"] = True
+
+        return self.quantify(**kwargs)
+
+
     def custom_uncertainty_quantification(self,
                                           plot="condensed_first",
                                           figure_folder="figures",
@@ -492,6 +748,11 @@ class UncertaintyQuantification(ParameterBase):
                          save=True,
                          data_folder="data",
                          filename=None,
+                         checkpoint=False,
+                         resume=False,
+                         profile=False,
+                         store_model_outputs=False,
+                         reuse_model_outputs=False,
                          **custom_kwargs):
         """
         Perform an uncertainty quantification and sensitivity analysis
@@ -562,6 +823,38 @@ class UncertaintyQuantification(ParameterBase):
         filename : {None, str}, optional
             Name of the data file. If None the model name is used.
             Default is None.
+        checkpoint : bool, optional
+            If each model evaluation should be stored in a checkpoint file,
+            ``data_folder/filename_checkpoint.h5``, as soon as it is finished.
+            Default is False.
+        resume : bool, optional
+            If the finished model evaluations in an existing checkpoint file
+            should be reused, so only the missing and failed evaluations are
+            performed.
+            Implies `checkpoint`. The evaluations are matched by the values of
+            the uncertain parameters, so the same `seed` must be used as in
+            the interrupted run.
+            Default is False.
+        profile : bool, optional
+            If each model evaluation should be profiled with cProfile in the
+            workers. The profile statistics of all model evaluations are
+            merged and saved as ``data_folder/filename.prof``, which can be
+            read with ``pstats.Stats``.
+            Default is False.
+        store_model_outputs : bool, optional
+            If the raw output of each model evaluation, everything returned by
+            the model function, should be stored in the folder
+            ``data_folder/filename_model_outputs``, so the features can be
+            recalculated with ``recompute_features`` without running the model
+            again.
+            Default is False.
+        reuse_model_outputs : bool, optional
+            If the features should be calculated from the model outputs stored
+            in ``data_folder/filename_model_outputs`` instead of running the
+            model. Implies `store_model_outputs`. The model outputs are matched
+            by the values of the model parameters, so the same `seed` must be
+            used as when the model outputs were stored.
+            Default is False.
         **custom_kwargs
             Any number of arguments for the custom polynomial chaos method,
             ``create_PCE_custom``.
@@ -623,22 +916,34 @@ class UncertaintyQuantification(ParameterBase):
                                  + "The Monte-Carlo method might be faster.")
 
 
-        self.data = self.uncertainty_calculations.polynomial_chaos(
-            method=method,
-            rosenblatt=rosenblatt,
-            uncertain_parameters=uncertain_parameters,
-            polynomial_order=polynomial_order,
-            nr_collocation_nodes=nr_collocation_nodes,
-            quadrature_order=quadrature_order,
-            nr_pc_mc_samples=nr_pc_mc_samples,
-            allow_incomplete=allow_incomplete,
-            seed=seed,
-            **custom_kwargs
-            )
-
         if filename is None:
             filename = self.model.name
 
+        self.set_checkpoint(checkpoint, resume, data_folder, filename)
+        self.set_model_outputs(store_model_outputs, reuse_model_outputs, data_folder, filename)
+        self.uncertainty_calculations.runmodel.profile = profile
+
+        try:
+            self.data = self.uncertainty_calculations.polynomial_chaos(
+                method=method,
+                rosenblatt=rosenblatt,
+                uncertain_parameters=uncertain_parameters,
+                polynomial_order=polynomial_order,
+                nr_collocation_nodes=nr_collocation_nodes,
+                quadrature_order=quadrature_order,
+                nr_pc_mc_samples=nr_pc_mc_samples,
+                allow_incomplete=allow_incomplete,
+                seed=seed,
+                **custom_kwargs
+                )
+        finally:
+            self.set_checkpoint(False, False)
+            self.set_model_outputs(False, False)
+            self.uncertainty_calculations.runmodel.profile = False
+
+        if profile:
+            self.save_profile(filename, folder=data_folder)
+
         if save:
             self.save(filename, folder=data_folder)
 
@@ -658,7 +963,12 @@ class UncertaintyQuantification(ParameterBase):
                     figureformat=".png",
                     save=True,
                     data_folder="data",
-                    filename=None):
+                    filename=None,
+                    checkpoint=False,
+                    resume=False,
+                    profile=False,
+                    store_model_outputs=False,
+                    reuse_model_outputs=False):
         """
         Perform an uncertainty quantification using the quasi-Monte Carlo method.
 
@@ -700,6 +1010,38 @@ class UncertaintyQuantification(ParameterBase):
         filename : {None, str}, optional
             Name of the data file. If None the model name is used.
             Default is None.
+        checkpoint : bool, optional
+            If each model evaluation should be stored in a checkpoint file,
+            ``data_folder/filename_checkpoint.h5``, as soon as it is finished.
+            Default is False.
+        resume : bool, optional
+            If the finished model evaluations in an existing checkpoint file
+            should be reused, so only the missing and failed evaluations are
+            performed.
+            Implies `checkpoint`. The evaluations are matched by the values of
+            the uncertain parameters, so the same `seed` must be used as in
+            the interrupted run.
+            Default is False.
+        profile : bool, optional
+            If each model evaluation should be profiled with cProfile in the
+            workers. The profile statistics of all model evaluations are
+            merged and saved as ``data_folder/filename.prof``, which can be
+            read with ``pstats.Stats``.
+            Default is False.
+        store_model_outputs : bool, optional
+            If the raw output of each model evaluation, everything returned by
+            the model function, should be stored in the folder
+            ``data_folder/filename_model_outputs``, so the features can be
+            recalculated with ``recompute_features`` without running the model
+            again.
+            Default is False.
+        reuse_model_outputs : bool, optional
+            If the features should be calculated from the model outputs stored
+            in ``data_folder/filename_model_outputs`` instead of running the
+            model. Implies `store_model_outputs`. The model outputs are matched
+            by the values of the model parameters, so the same `seed` must be
+            used as when the model outputs were stored.
+            Default is False.
 
         Returns
         -------
@@ -737,13 +1079,25 @@ class UncertaintyQuantification(ParameterBase):
         """
         uncertain_parameters = self.uncertainty_calculations.convert_uncertain_parameters(uncertain_parameters)
 
-        self.data = self.uncertainty_calculations.monte_carlo(uncertain_parameters=uncertain_parameters,
-                                                              nr_samples=nr_samples,
-                                                              seed=seed)
-
         if filename is None:
            filename = self.model.name
 
+        self.set_checkpoint(checkpoint, resume, data_folder, filename)
+        self.set_model_outputs(store_model_outputs, reuse_model_outputs, data_folder, filename)
+        self.uncertainty_calculations.runmodel.profile = profile
+
+        try:
+            self.data = self.uncertainty_calculations.monte_carlo(uncertain_parameters=uncertain_parameters,
+                                                                  nr_samples=nr_samples,
+                                                                  seed=seed)
+        finally:
+            self.set_checkpoint(False, False)
+            self.set_model_outputs(False, False)
+            self.uncertainty_calculations.runmodel.profile = False
+
+        if profile:
+            self.save_profile(filename, folder=data_folder)
+
         if save:
             self.save(filename, folder=data_folder)
 
@@ -924,10 +1278,10 @@ class UncertaintyQuantification(ParameterBase):
                 uncertain_parameter
             )
 
+            tmp_figure_folder = os.path.join(figure_folder, tmp_filename)
             if save:
                 self.save(tmp_filename, folder=data_folder)
 
-            tmp_figure_folder = os.path.join(figure_folder, tmp_filename)
             self.plot(type=plot,
                       folder=tmp_figure_folder,
                       figureformat=figureformat)
@@ -1045,11 +1399,11 @@ class UncertaintyQuantification(ParameterBase):
 
             self.data.seed = seed
 
+            tmp_figure_folder = os.path.join(figure_folder, tmp_filename)
+
             if save:
                 self.save(tmp_filename, folder=data_folder)
 
-            tmp_figure_folder = os.path.join(figure_folder, tmp_filename)
-
             self.plot(type=plot,
                       folder=tmp_figure_folder,
                       figureformat=figureformat)
@@ -1059,6 +1413,82 @@ class UncertaintyQuantification(ParameterBase):
         return data_dict
 
 
+    def set_checkpoint(self, checkpoint, resume, folder="data", filename=None):
+        """
+        Set if the model evaluations should be stored in, and reused from,
+        a checkpoint file ``folder/filename_checkpoint.h5``.
+
+        Parameters
+        ----------
+        checkpoint : bool
+            If each model evaluation should be stored in the checkpoint file as
+            soon as it is finished.
+        resume : bool
+            If the finished model evaluations in an existing checkpoint file
+            should be reused. Implies `checkpoint`.
+        folder : str, optional
+            The folder to store the checkpoint file in.
+            Default is "data".
+        filename : {None, str}, optional
+            Name of the data file the checkpoint file is named after.
+            If None the model name is used.
+            Default is None.
+
+        See also
+        --------
+        uncertainpy.core.RunModel
+        """
+        runmodel = self.uncertainty_calculations.runmodel
+
+        if checkpoint or resume:
+            if filename is None:
+                filename = self.model.name
+
+            runmodel.checkpoint = os.path.join(folder, filename + "_checkpoint.h5")
+        else:
+            runmodel.checkpoint = None
+
+        runmodel.resume = resume
+
+
+    def set_model_outputs(self, store_model_outputs, reuse_model_outputs, folder="data", filename=None):
+        """
+        Set if the raw output of each model evaluation should be stored in,
+        and reused from, the folder ``folder/filename_model_outputs``.
+
+        Parameters
+        ----------
+        store_model_outputs : bool
+            If the raw output of each model evaluation should be stored.
+        reuse_model_outputs : bool
+            If the features should be calculated from the stored model
+            outputs instead of running the model. Implies `store_model_outputs`.
+        folder : str, optional
+            The folder to store the model outputs in.
+            Default is "data".
+        filename : {None, str}, optional
+            Name of the data file the folder of model outputs is named after.
+            If None the model name is used.
+            Default is None.
+
+        See also
+        --------
+        uncertainpy.core.RunModel
+        uncertainpy.core.ModelOutputs
+        """
+        runmodel = self.uncertainty_calculations.runmodel
+
+        if store_model_outputs or reuse_model_outputs:
+            if filename is None:
+                filename = self.model.name
+
+            runmodel.model_outputs = os.path.join(folder, filename + "_model_outputs")
+        else:
+            runmodel.model_outputs = None
+
+        runmodel.reuse_model_outputs = reuse_model_outputs
+
+
     def save(self, filename, folder="data"):
         """
         Save ``data`` to disk.
@@ -1069,7 +1499,7 @@ class UncertaintyQuantification(ParameterBase):
             Name of the data file.
         folder : str, optional
             The folder to store the data in. Creates the folder if it does not
-            exist. Default is "/data".
+            exist. Default is "data".
 
         See also
         --------
@@ -1085,6 +1515,39 @@ class UncertaintyQuantification(ParameterBase):
         self.data.save(save_path)
 
 
+    def save_profile(self, filename, folder="data"):
+        """
+        Save the merged profile statistics of the model evaluations in the
+        last uncertainty quantification to disk, as ``folder/filename.prof``.
+        Nothing is saved if the model evaluations were not profiled.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the profile file, without the ".prof" extension.
+        folder : str, optional
+            The folder to store the profile in. Creates the folder if it does
+            not exist. Default is "data".
+
+        See also
+        --------
+        pstats.Stats : Reading and sorting the profile statistics.
+        """
+        profile_stats = self.uncertainty_calculations.runmodel.profile_stats
+
+        if profile_stats is None:
+            return
+
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        save_path = os.path.join(folder, filename + ".prof")
+
+        self.logger.info("Saving profile as: {}".format(save_path))
+
+        profile_stats.dump_stats(save_path)
+
+
     def load(self, filename):
         """
         Load data from disk.
@@ -1134,6 +1597,7 @@ class UncertaintyQuantification(ParameterBase):
         These plots are intended as quick way to get an overview of the results,
         and not to create publication ready plots. Custom plots of the data can
         easily be created by retrieving the data from the Data class.
+        The time spent plotting is stored in ``data.timings["plotting"]``.
 
         See also
         --------
@@ -1143,6 +1607,8 @@ class UncertaintyQuantification(ParameterBase):
         if type is None:
             return
         else:
+            start = time.time()
+
             self.plotting.data = self.data
             self.plotting.folder = folder
             self.plotting.figureformat = ".png"
@@ -1166,4 +1632,6 @@ class UncertaintyQuantification(ParameterBase):
             else:
                 raise ValueError('type must one of: "condensed_first", '
                                 '"condensed_total", "condensed_no_sensitivity" '
-                                '"all", "evaluations", None, not {}'.format(type))
\ No newline at end of file
+                                '"all", "evaluations", None, not {}'.format(type))
+
+            self.data.timings["plotting"] = time.time() - start
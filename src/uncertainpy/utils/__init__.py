@@ -2,6 +2,7 @@
 Small utility functions for various purposes.
 """
 
-__all__ = ["create_logger"]
+__all__ = ["create_logger", "SpikeTrains"]
 
 from .logger import create_logger
+from .spike_trains import SpikeTrains
@@ -0,0 +1,194 @@
+import numpy as np
+
+
+class SpikeTrains(object):
+    """
+    Sparse representation of the spike trains from a network of neurons.
+
+    The spike times of all neurons are stored in a single array, together with
+    an array of offsets that gives where the spike train of each neuron starts
+    and ends (the compressed sparse row format). The dense representation,
+    where each spike train is an array with one element for each time step,
+    is only created on demand, for example when plotting.
+
+    Parameters
+    ----------
+    times : array_like
+        The spike times of all neurons, ordered by neuron.
+    offsets : array_like
+        The spike times of neuron ``i`` are ``times[offsets[i]:offsets[i + 1]]``.
+        Has one more element than the number of neurons.
+    simulation_end : {int, float}
+        The final simulation time.
+    dt : float
+        The time resolution of the simulation.
+
+    Attributes
+    ----------
+    times : array
+        The spike times of all neurons, ordered by neuron.
+    offsets : array
+        The spike times of neuron ``i`` are ``times[offsets[i]:offsets[i + 1]]``.
+    simulation_end : {int, float}
+        The final simulation time.
+    dt : float
+        The time resolution of the simulation.
+    nr_trains : int
+        The number of spike trains (neurons).
+    ndim : int
+        The number of dimensions of the dense representation, always 2.
+
+    See Also
+    --------
+    uncertainpy.models.NestModel.postprocess
+    """
+    ndim = 2
+
+    def __init__(self, times, offsets, simulation_end, dt):
+        self.times = np.asarray(times, dtype=float)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.simulation_end = simulation_end
+        self.dt = dt
+
+
+    @classmethod
+    def from_spiketrains(cls, spiketrains, simulation_end, dt):
+        """
+        Create a SpikeTrains object from a list of spike trains.
+
+        Parameters
+        ----------
+        spiketrains : list
+            A list of spike trains for each neuron.
+        simulation_end : {int, float}
+            The final simulation time.
+        dt : float
+            The time resolution of the simulation.
+
+        Returns
+        -------
+        spike_trains : SpikeTrains
+            The spike trains in the sparse representation.
+        """
+        spiketrains = [np.atleast_1d(np.asarray(spiketrain, dtype=float)) for spiketrain in spiketrains]
+
+        offsets = np.zeros(len(spiketrains) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(spiketrain) for spiketrain in spiketrains])
+
+        if spiketrains:
+            times = np.concatenate(spiketrains)
+        else:
+            times = np.zeros(0)
+
+        return cls(times, offsets, simulation_end, dt)
+
+
+    @property
+    def nr_trains(self):
+        return len(self.offsets) - 1
+
+
+    @property
+    def time(self):
+        """
+        The time array of the dense representation, all time points in the
+        simulation.
+
+        Returns
+        -------
+        time : array
+            A time array of all time points in the simulation.
+        """
+        return np.arange(0, self.simulation_end, self.dt)
+
+
+    def spiketrain(self, index):
+        """
+        Get the spike train of a single neuron.
+
+        Parameters
+        ----------
+        index : int
+            Index of the neuron.
+
+        Returns
+        -------
+        spiketrain : array
+            The spike times of the neuron.
+        """
+        return self.times[self.offsets[index]:self.offsets[index + 1]]
+
+
+    def spiketrains(self):
+        """
+        Get the spike trains of all neurons.
+
+        Returns
+        -------
+        spiketrains : list
+            A list of the spike times of each neuron.
+        """
+        return [self.spiketrain(i) for i in range(self.nr_trains)]
+
+
+    def to_dense(self):
+        """
+        Convert the spike trains to the dense representation. For each time
+        step in the simulation the result is 0 if there is no spike and 1 if
+        there is a spike.
+
+        Returns
+        -------
+        time : array
+            A time array of all time points in the simulation.
+        values : array
+            A 2D array with the dense spike train of each neuron.
+
+        Example
+        -------
+        In a simulation that gives the spiketrain ``[0, 2, 3]``, with a
+        time resolution of 0.5 ms and that ends after 4 ms,
+        the dense spike train become:
+        ``[1, 0, 0, 0, 1, 0, 1, 0]``.
+        """
+        time = self.time
+        values = np.zeros((self.nr_trains, len(time)))
+
+        neurons = np.repeat(np.arange(self.nr_trains), np.diff(self.offsets))
+
+        # Only spikes at exactly a time step are included
+        indices = np.searchsorted(time, self.times)
+        valid = indices < len(time)
+        valid[valid] = time[indices[valid]] == self.times[valid]
+
+        values[neurons[valid], indices[valid]] = 1
+
+        return time, values
+
+
+    def __eq__(self, other):
+        if not isinstance(other, SpikeTrains):
+            return NotImplemented
+
+        return self.simulation_end == other.simulation_end \
+            and self.dt == other.dt \
+            and np.array_equal(self.offsets, other.offsets) \
+            and np.array_equal(self.times, other.times)
+
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+
+    __hash__ = None
+
+
+    def __repr__(self):
+        return "SpikeTrains(nr_trains={}, nr_spikes={}, simulation_end={}, dt={})".format(self.nr_trains,
+                                                                                       len(self.times),
+                                                                                       self.simulation_end,
+                                                                                       self.dt)
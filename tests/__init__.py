@@ -29,7 +29,12 @@
 #            "TestBase",
 #            "TestParameterBase",
 #            "TestEfelFeatures",
-#            "TestNestModel"]
+#            "TestNestModel",
+#            "TestExecutors",
+#            "TestCheckpoint",
+#            "TestEvaluationCache",
+#            "TestSpikeTrains",
+#            "TestModelOutputs"]
 
 from .test_distribution import TestDistribution
 from .test_features import TestFeatures, TestGeneralSpikingFeatures, TestSpikingFeatures
@@ -52,3 +57,8 @@ from .test_uncertainty_calculations import TestUncertaintyCalculations
 from .test_parallel import TestParallel
 from .test_examples import TestExamples
 from .test_base import TestBase, TestParameterBase
+from .test_executors import TestExecutors
+from .test_checkpoint import TestCheckpoint
+from .test_cache import TestEvaluationCache
+from .test_spike_trains import TestSpikeTrains
+from .test_model_outputs import TestModelOutputs
@@ -0,0 +1,144 @@
+import unittest
+import os
+import shutil
+
+import numpy as np
+
+from uncertainpy.core import EvaluationCache
+from uncertainpy.features import Features
+
+from .testing_classes import TestingModel1d, TestingModel2d, TestingFeatures
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.folder = os.path.join(self.output_test_dir, "cache")
+
+        self.model = TestingModel1d()
+        self.features = TestingFeatures(features_to_run=["feature0d"])
+
+        self.result = {"TestingModel1d": {"values": np.arange(0, 10) + 1.,
+                                          "time": np.arange(0, 10)},
+                       "feature0d": {"values": 1,
+                                     "time": np.nan}}
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def test_init(self):
+        EvaluationCache()
+
+
+    def test_init_folder(self):
+        EvaluationCache(folder=self.folder)
+
+        self.assertTrue(os.path.isdir(self.folder))
+
+
+    def test_key(self):
+        cache = EvaluationCache()
+
+        key = cache.key(self.model, self.features, {"a": 1, "b": 2})
+
+        self.assertEqual(key, cache.key(TestingModel1d(),
+                                        TestingFeatures(features_to_run=["feature0d"]),
+                                        {"b": 2, "a": np.int64(1)}))
+
+        self.assertEqual(cache.key(self.model, self.features, {"a": 1.5}),
+                         cache.key(self.model, self.features, {"a": np.float64(1.5)}))
+
+        self.assertNotEqual(key, cache.key(self.model, self.features, {"a": 1, "b": 3}))
+        self.assertNotEqual(key, cache.key(TestingModel2d(), self.features, {"a": 1, "b": 2}))
+        self.assertNotEqual(key, cache.key(self.model, Features(), {"a": 1, "b": 2}))
+        self.assertNotEqual(key, cache.key(self.model,
+                                           TestingFeatures(features_to_run=["feature1d"]),
+                                           {"a": 1, "b": 2}))
+
+        model = TestingModel1d()
+        model.adaptive = True
+        self.assertNotEqual(key, cache.key(model, self.features, {"a": 1, "b": 2}))
+
+        model = TestingModel1d()
+        model.version = 2
+        self.assertNotEqual(key, cache.key(model, self.features, {"a": 1, "b": 2}))
+
+
+    def test_get_set_memory(self):
+        cache = EvaluationCache()
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.misses, 1)
+
+        cache.set("key", self.result)
+        result = cache.get("key")
+
+        self.assertEqual(cache.hits, 1)
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                       self.result["TestingModel1d"]["values"]))
+
+        # Changing the returned result does not change the cache
+        result["TestingModel1d"]["values"] = None
+        self.assertIsNotNone(cache.get("key")["TestingModel1d"]["values"])
+
+
+    def test_memory_eviction(self):
+        cache = EvaluationCache(max_items=2)
+
+        cache.set("key1", self.result)
+        cache.set("key2", self.result)
+        cache.get("key1")
+        cache.set("key3", self.result)
+
+        self.assertIn("key1", cache)
+        self.assertNotIn("key2", cache)
+        self.assertIn("key3", cache)
+        self.assertEqual(len(cache), 2)
+
+
+    def test_get_set_disk(self):
+        cache = EvaluationCache(folder=self.folder)
+        cache.set("key", self.result)
+
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, "key.pickle")))
+
+        cache = EvaluationCache(folder=self.folder)
+        self.assertEqual(len(cache), 1)
+
+        result = cache.get("key")
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                       self.result["TestingModel1d"]["values"]))
+        self.assertEqual(result["feature0d"]["values"], 1)
+
+
+    def test_disk_eviction(self):
+        cache = EvaluationCache(folder=self.folder, max_items=0)
+        cache.set("key1", self.result)
+
+        size = cache.disk_size
+        cache.max_disk_size = 2*size
+
+        cache.set("key2", self.result)
+        cache.get("key1")
+        cache.set("key3", self.result)
+
+        self.assertEqual(sorted(os.listdir(self.folder)), ["key1.pickle", "key3.pickle"])
+        self.assertLessEqual(cache.disk_size, 2*size)
+
+
+    def test_clear(self):
+        cache = EvaluationCache(folder=self.folder)
+        cache.set("key", self.result)
+
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(os.listdir(self.folder), [])
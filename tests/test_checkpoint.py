@@ -0,0 +1,168 @@
+import unittest
+import os
+import shutil
+
+import numpy as np
+
+from uncertainpy.core import Checkpoint
+from uncertainpy.utils import SpikeTrains
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+
+        self.result = {"TestingModel1d": {"values": np.arange(0, 10) + 1.,
+                                          "time": np.arange(0, 10)},
+                       "feature0d": {"values": 1,
+                                     "time": np.nan},
+                       "feature_invalid": {"values": np.nan,
+                                           "time": np.nan}}
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def test_init(self):
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"]):
+            pass
+
+        self.assertTrue(os.path.isfile(self.filename))
+
+
+    def test_init_folder(self):
+        filename = os.path.join(self.output_test_dir, "folder", "checkpoint.h5")
+
+        with Checkpoint(filename, "TestingModel1d", ["a", "b"]):
+            pass
+
+        self.assertTrue(os.path.isfile(filename))
+
+
+    def test_save_load(self):
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"]) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), self.result)
+            checkpoint.save(1, np.array([1, 2]), None, "ValueError: error")
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"], resume=True) as checkpoint:
+            evaluations = checkpoint.load()
+
+        self.assertEqual(set(evaluations.keys()), set([(0, 1), (1, 2)]))
+
+        result, error = evaluations[(0, 1)]
+        self.assertIsNone(error)
+        self.assertEqual(set(result.keys()), set(self.result.keys()))
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                       np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["time"],
+                                       np.arange(0, 10)))
+        self.assertEqual(result["feature0d"]["values"], 1)
+        self.assertTrue(np.isnan(result["feature0d"]["time"]))
+        self.assertTrue(np.isnan(result["feature_invalid"]["values"]))
+
+        result, error = evaluations[(1, 2)]
+        self.assertIsNone(result)
+        self.assertEqual(error, "ValueError: error")
+
+
+    def test_save_load_spike_trains(self):
+        spike_trains = SpikeTrains([1., 2., 3.5, 0.5], [0, 3, 3, 4], 10, 0.1)
+
+        result = {"NestModel": {"values": spike_trains,
+                                "time": np.nan},
+                  "feature0d": {"values": 1,
+                                "time": np.nan}}
+
+        with Checkpoint(self.filename, "NestModel", ["a", "b"]) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), result)
+
+        with Checkpoint(self.filename, "NestModel", ["a", "b"], resume=True) as checkpoint:
+            evaluations = checkpoint.load()
+
+        result, error = evaluations[(0, 1)]
+        self.assertIsNone(error)
+
+        values = result["NestModel"]["values"]
+        self.assertIsInstance(values, SpikeTrains)
+        self.assertTrue(np.array_equal(values.times, spike_trains.times))
+        self.assertTrue(np.array_equal(values.offsets, spike_trains.offsets))
+        self.assertEqual(values.simulation_end, 10)
+        self.assertEqual(values.dt, 0.1)
+        self.assertTrue(np.isnan(result["NestModel"]["time"]))
+        self.assertEqual(result["feature0d"]["values"], 1)
+
+
+    def test_save_overwrite_index(self):
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"]) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), self.result)
+            checkpoint.save(0, np.array([1, 2]), self.result)
+
+            evaluations = checkpoint.load()
+
+        self.assertEqual(list(evaluations.keys()), [(1, 2)])
+
+
+    def test_no_resume(self):
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"]) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), self.result)
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"]) as checkpoint:
+            self.assertEqual(checkpoint.load(), {})
+
+
+    def test_resume_other_model(self):
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"]) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), self.result)
+
+        with Checkpoint(self.filename, "TestingModel2d", ["a", "b"],
+                        resume=True, verbose_level="error") as checkpoint:
+            self.assertEqual(checkpoint.load(), {})
+
+        with Checkpoint(self.filename, "TestingModel2d", ["a"],
+                        resume=True, verbose_level="error") as checkpoint:
+            self.assertEqual(checkpoint.load(), {})
+
+
+    def test_resume_other_features(self):
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        feature_names=["feature0d", "feature1d"]) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), self.result)
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        feature_names=["feature1d", "feature0d"], resume=True) as checkpoint:
+            self.assertEqual(list(checkpoint.load().keys()), [(0, 1)])
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        feature_names=["feature0d"],
+                        resume=True, verbose_level="error") as checkpoint:
+            self.assertEqual(checkpoint.load(), {})
+
+
+    def test_resume_other_time_grids(self):
+        time_grids = {"feature_adaptive": np.arange(0, 10)}
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        time_grids=time_grids) as checkpoint:
+            checkpoint.save(0, np.array([0, 1]), self.result)
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        time_grids={"feature_adaptive": np.arange(0, 10)},
+                        resume=True) as checkpoint:
+            self.assertEqual(list(checkpoint.load().keys()), [(0, 1)])
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        time_grids={"feature_adaptive": np.arange(0, 20)},
+                        resume=True, verbose_level="error") as checkpoint:
+            self.assertEqual(checkpoint.load(), {})
+
+        with Checkpoint(self.filename, "TestingModel1d", ["a", "b"],
+                        resume=True, verbose_level="error") as checkpoint:
+            self.assertEqual(checkpoint.load(), {})
@@ -7,6 +7,7 @@ import numpy as np
 
 from uncertainpy import Data
 from uncertainpy.data import DataFeature
+from uncertainpy.utils import SpikeTrains
 
 
 class TestDataFeature(unittest.TestCase):
@@ -270,6 +271,78 @@ class TestData(unittest.TestCase):
         self.assertEqual(data.seed, "")
 
 
+    def test_save_load_failures(self):
+        self.data.failures = ["Node 1 {'a': 2}: ValueError: error",
+                              "Node 3 {'a': 4}: ValueError: error"]
+
+        filename = os.path.join(self.output_test_dir, "test_save_failures")
+        self.data.save(filename)
+
+        data = Data(filename)
+        self.assertEqual(data.failures, self.data.failures)
+
+
+    def test_save_load_spike_trains(self):
+        evaluations = np.full(3, np.nan, dtype=object)
+        evaluations[0] = SpikeTrains.from_spiketrains([[0, 2, 3], [1.5]], 4, 0.5)
+        evaluations[2] = SpikeTrains.from_spiketrains([[], [1, 2], [3]], 5, 0.1)
+
+        self.data.add_features("nest_model")
+        self.data["nest_model"].evaluations = evaluations
+        self.data["nest_model"].time = np.nan
+        self.data.model_name = "nest_model"
+
+        self.assertEqual(self.data.ndim("nest_model"), 2)
+
+        filename = os.path.join(self.output_test_dir, "test_save_spike_trains")
+        self.data.save(filename)
+
+        data = Data(filename)
+
+        self.assertEqual(data["nest_model"].evaluations.dtype, object)
+        self.assertEqual(len(data["nest_model"].evaluations), 3)
+        self.assertEqual(data["nest_model"].evaluations[0], evaluations[0])
+        self.assertTrue(np.isnan(data["nest_model"].evaluations[1]))
+        self.assertEqual(data["nest_model"].evaluations[2], evaluations[2])
+        self.assertEqual(data.ndim("nest_model"), 2)
+
+
+    def test_save_load_timings(self):
+        self.data.add_features("model")
+        self.data["model"].evaluations = [1, 2]
+        self.data.model_name = "model"
+
+        self.data.node_timings = {"run": np.array([2., np.nan]),
+                                  "feature: spike_rate": np.array([1., 3.])}
+        self.data.timings = {"model evaluation": 6., "plotting": 0.5}
+
+        filename = os.path.join(self.output_test_dir, "test_save_timings")
+        self.data.save(filename)
+
+        data = Data(filename)
+
+        self.assertEqual(list(data.keys()), ["model"])
+        self.assertEqual(set(data.node_timings.keys()), set(["run", "feature: spike_rate"]))
+        self.assertEqual(data.node_timings["run"][0], 2)
+        self.assertTrue(np.isnan(data.node_timings["run"][1]))
+        self.assertTrue(np.array_equal(data.node_timings["feature: spike_rate"], [1, 3]))
+        self.assertEqual(data.timings, {"model evaluation": 6., "plotting": 0.5})
+
+
+    def test_timing_summary(self):
+        self.data.node_timings = {"run": np.array([2., np.nan]),
+                                  "feature: spike_rate": np.array([1., 3.])}
+        self.data.timings = {"model evaluation": 6.}
+
+        lines = self.data.timing_summary().split("\n")
+
+        self.assertEqual(lines[0].split(), ["Phase", "Total", "(s)", "Mean", "(s)", "Max", "(s)", "Share"])
+        self.assertEqual(lines[1].split(), ["run", "2", "2", "2", "33.3%"])
+        self.assertEqual(lines[2].split(), ["feature:", "spike_rate", "4", "2", "3", "66.7%"])
+        self.assertEqual(lines[3], "")
+        self.assertEqual(lines[4].split(), ["model", "evaluation", "6"])
+
+
     def test_save_empty(self):
         data = Data()
 
@@ -435,6 +508,7 @@ class TestData(unittest.TestCase):
         self.data.model_name = -1
         self.data.data = -1
         self.data.incomplete = -1
+        self.data.failures = -1
         self.data.method = -1
         self.data.seed = -1
 
@@ -444,6 +518,7 @@ class TestData(unittest.TestCase):
         self.assertEqual(self.data.data, {})
         self.assertEqual(self.data.uncertain_parameters, [])
         self.assertEqual(self.data.incomplete, [])
+        self.assertEqual(self.data.failures, [])
         self.assertEqual(self.data.model_name, "")
         self.assertEqual(self.data.method, "")
         self.assertEqual(self.data.seed, "")
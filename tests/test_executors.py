@@ -0,0 +1,313 @@
+import unittest
+import os
+import shutil
+
+import numpy as np
+
+from uncertainpy.core import Parallel, Executor, SerialExecutor, ThreadExecutor
+from uncertainpy.core import ProcessExecutor, MPIExecutor
+from uncertainpy.core.executors import create_executor, prerequisites
+from uncertainpy.core.executors import _share_arrays, _load_arrays, _SharedArray
+from uncertainpy.core.executors import _bounded_imap
+
+from .testing_classes import TestingFeatures, TestingModel1d, model_function
+
+
+def initializer(filename):
+    with open(filename, "a") as f:
+        f.write("initialized\n")
+
+
+class SetupModel(TestingModel1d):
+    def __init__(self, filename):
+        super(SetupModel, self).__init__()
+
+        self.filename = filename
+
+    def setup_worker(self):
+        with open(self.filename, "a") as f:
+            f.write("setup\n")
+
+    def teardown_worker(self):
+        with open(self.filename, "a") as f:
+            f.write("teardown\n")
+
+
+class TestExecutors(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.parallel = Parallel(model=TestingModel1d(),
+                                 features=TestingFeatures(features_to_run=["feature0d",
+                                                                           "feature1d"]))
+
+        self.model_parameters = [{"a": 0, "b": 1}, {"a": 1, "b": 2}, {"a": 2, "b": 3}]
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def check_results(self, results):
+        self.assertEqual(len(results), 3)
+
+        for (result, error), parameters in zip(results, self.model_parameters):
+            self.assertIsNone(error)
+            self.assertEqual(set(result.keys()),
+                             set(["TestingModel1d", "feature0d", "feature1d"]))
+
+            values = np.arange(0, 10) + parameters["a"] + parameters["b"]
+            self.assertTrue(np.array_equal(result["TestingModel1d"]["values"], values))
+
+
+    def check_executor(self, executor):
+        filename = os.path.join(self.output_test_dir, "initializer")
+
+        with executor:
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+            self.assertTrue(executor.running)
+
+            results = list(executor.imap(self.model_parameters))
+            self.check_results(results)
+
+            # The workers are reused
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+            results = list(executor.imap(self.model_parameters))
+            self.check_results(results)
+
+            results = []
+            for batch_results in executor.imap_batches([self.model_parameters[:2],
+                                                        self.model_parameters[2:]]):
+                results.extend(batch_results)
+            self.check_results(results)
+
+            results = list(executor.imap(self.model_parameters, max_inflight=2))
+            self.check_results(results)
+
+            results = []
+            for batch_results in executor.imap_batches([self.model_parameters[:2],
+                                                        self.model_parameters[2:]],
+                                                       max_inflight=1):
+                results.extend(batch_results)
+            self.check_results(results)
+
+        self.assertFalse(executor.running)
+
+        with open(filename) as f:
+            self.assertEqual(f.read(), "initialized\n")
+
+
+    def test_serial(self):
+        self.check_executor(SerialExecutor())
+
+
+    def test_thread(self):
+        self.check_executor(ThreadExecutor(CPUs=1))
+
+
+    def test_process(self):
+        self.check_executor(ProcessExecutor(CPUs=1))
+
+
+    def test_process_memmap(self):
+        executor = ProcessExecutor(CPUs=1,
+                                   memmap_threshold=0,
+                                   scratch_folder=self.output_test_dir)
+
+        self.check_executor(executor)
+
+        # The scratch folder is removed when the executor is closed
+        self.assertFalse([folder for folder in os.listdir(self.output_test_dir)
+                          if folder.startswith("uncertainpy_")])
+
+
+    def check_setup_worker(self, executor):
+        filename = os.path.join(self.output_test_dir, "setup")
+
+        parallel = Parallel(model=SetupModel(filename),
+                            features=TestingFeatures(features_to_run=["feature0d"]))
+
+        with executor:
+            executor.start(parallel)
+
+            list(executor.imap(self.model_parameters))
+            list(executor.imap(self.model_parameters))
+
+            with open(filename) as f:
+                self.assertEqual(f.read(), "setup\n")
+
+        with open(filename) as f:
+            self.assertEqual(f.read(), "setup\nteardown\n")
+
+        self.assertEqual(len(executor.setup_times), 1)
+        self.assertGreaterEqual(executor.setup_times[0], 0)
+
+
+    def test_setup_worker_serial(self):
+        self.check_setup_worker(SerialExecutor())
+
+
+    def test_setup_worker_thread(self):
+        self.check_setup_worker(ThreadExecutor(CPUs=2))
+
+
+    def test_setup_worker_process(self):
+        self.check_setup_worker(ProcessExecutor(CPUs=1))
+
+
+    def test_setup_worker_batches(self):
+        filename = os.path.join(self.output_test_dir, "setup")
+
+        parallel = Parallel(model=SetupModel(filename),
+                            features=TestingFeatures(features_to_run=["feature0d"]))
+
+        with ProcessExecutor(CPUs=1) as executor:
+            executor.start(parallel)
+            list(executor.imap_batches([self.model_parameters[:2], self.model_parameters[2:]]))
+
+        self.assertEqual(len(executor.setup_times), 1)
+
+        with open(filename) as f:
+            self.assertEqual(f.read(), "setup\nteardown\n")
+
+
+    def test_bounded_imap(self):
+        submitted = []
+        inflight = []
+
+        def submit(item):
+            submitted.append(item)
+            inflight.append(len(submitted) - len(results))
+
+            return lambda: item*2
+
+        results = []
+        for result in _bounded_imap(submit, range(10), 3):
+            results.append(result)
+
+        self.assertEqual(results, [2*i for i in range(10)])
+        self.assertEqual(max(inflight), 3)
+
+        # Only the first items are submitted before the first result is used
+        results = []
+        submitted = []
+        iterator = _bounded_imap(submit, range(10), 3)
+        next(iterator)
+        self.assertEqual(submitted, [0, 1, 2])
+
+
+    def test_share_load_arrays(self):
+        result = {"TestingModel1d": {"values": np.arange(0, 1000, dtype=float),
+                                     "time": np.arange(0, 10)},
+                  "feature0d": {"values": 1,
+                                "time": np.nan}}
+
+        result = _share_arrays(result, self.output_test_dir, 1000)
+
+        self.assertIsInstance(result["TestingModel1d"]["values"], _SharedArray)
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["time"], np.arange(0, 10)))
+        self.assertEqual(result["feature0d"]["values"], 1)
+        self.assertEqual(len(os.listdir(self.output_test_dir)), 1)
+
+        result = _load_arrays(result)
+
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["values"], np.arange(0, 1000)))
+        self.assertEqual(os.listdir(self.output_test_dir), [])
+
+
+    def test_restart_changed(self):
+        executor = SerialExecutor()
+
+        executor.start(self.parallel)
+        self.parallel.model = model_function
+        executor.start(self.parallel)
+
+        result, error = list(executor.imap(self.model_parameters))[0]
+        self.assertIn("model_function", result)
+
+        executor.close()
+
+
+    def test_process_restart(self):
+        filename = os.path.join(self.output_test_dir, "initializer")
+
+        with ProcessExecutor(CPUs=1) as executor:
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+            results = list(executor.imap(self.model_parameters))
+            self.check_results(results)
+
+            # The features have been evaluated, which does not restart the workers
+            self.parallel.features.implemented_features()
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+
+            with open(filename) as f:
+                self.assertEqual(f.read(), "initialized\n")
+
+            self.parallel.features.features_to_run = ["feature0d"]
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+
+            result, error = list(executor.imap(self.model_parameters))[0]
+            self.assertEqual(set(result.keys()), set(["TestingModel1d", "feature0d"]))
+
+            self.parallel.timeout = 10
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+
+            self.parallel.model = TestingModel1d()
+            executor.start(self.parallel, initializer=initializer, initargs=(filename,))
+
+            executor.start(self.parallel, initializer=initializer, initargs=(filename + "2",))
+
+        with open(filename) as f:
+            self.assertEqual(f.read(), "initialized\n"*4)
+
+
+    def test_close_not_running(self):
+        executor = ProcessExecutor()
+        executor.close()
+
+        self.assertFalse(executor.running)
+
+
+    def test_base(self):
+        executor = Executor()
+
+        with self.assertRaises(NotImplementedError):
+            executor.start(self.parallel)
+
+        with self.assertRaises(NotImplementedError):
+            executor.imap(self.model_parameters)
+
+
+    def test_create_executor(self):
+        self.assertIsInstance(create_executor("serial"), SerialExecutor)
+        self.assertIsInstance(create_executor("thread"), ThreadExecutor)
+        self.assertIsInstance(create_executor("process"), ProcessExecutor)
+
+        executor = create_executor("process", CPUs=2)
+        self.assertEqual(executor.CPUs, 2)
+
+        executor = create_executor("process", memmap_threshold=100, scratch_folder="folder")
+        self.assertEqual(executor.memmap_threshold, 100)
+        self.assertEqual(executor.scratch_folder, "folder")
+
+        executor = SerialExecutor()
+        self.assertIs(create_executor(executor), executor)
+
+
+    def test_create_executor_error(self):
+        with self.assertRaises(ValueError):
+            create_executor("not_existing")
+
+        with self.assertRaises(ValueError):
+            create_executor("thread", memmap_threshold=100)
+
+
+    @unittest.skipIf(prerequisites, "mpi4py is installed")
+    def test_mpi_no_mpi4py(self):
+        with self.assertRaises(ImportError):
+            MPIExecutor()
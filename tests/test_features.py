@@ -1,5 +1,7 @@
 import unittest
 import os
+import time
+import pickle
 import neo
 import elephant
 import efel
@@ -8,8 +10,8 @@ import numpy as np
 import quantities as pq
 
 from uncertainpy.features import Features, GeneralSpikingFeatures
-from uncertainpy.features import SpikingFeatures, NetworkFeatures, GeneralNetworkFeatures
-from uncertainpy.features import EfelFeatures
+from uncertainpy.features import SpikingFeatures, NetworkFeatures, GeneralNetworkFeatures, NeoSpikeTrains
+from uncertainpy.features import EfelFeatures, Spikes
 from uncertainpy.features import Spikes
 from .testing_classes import TestingFeatures
 
@@ -93,10 +95,73 @@ class TestFeatures(unittest.TestCase):
         self.assertEqual(self.features.implemented_features(), [])
 
 
+    def test_implemented_features_cached(self):
+        def feature_function(time, values):
+            return "t", "U"
+
+        implemented_features = self.features.implemented_features()
+        implemented_features.append("changed")
+        self.assertEqual(self.features.implemented_features(), [])
+
+        self.features.add_features(feature_function)
+        self.assertEqual(self.features.implemented_features(), ["feature_function"])
+
+
     def test_calculate_all_features(self):
         self.assertEqual(self.features.calculate_all_features(self.time, self.values), {})
 
 
+    def test_intermediate(self):
+        calls = []
+
+        def square(time, values, power=2):
+            calls.append(power)
+            return values**power
+
+        def feature_a(time, values):
+            return None, np.sum(features.intermediate("square", time, values))
+
+        def feature_b(time, values):
+            return None, np.max(features.intermediate("square", time, values))
+
+        def feature_c(time, values):
+            return None, np.max(features.intermediate("square", time, values, power=3))
+
+        features = Features(new_features=[feature_a, feature_b, feature_c],
+                            features_to_run=["feature_a", "feature_b", "feature_c"])
+        features.add_intermediates({"square": square})
+
+        results = features.calculate_features(self.time, self.values)
+
+        self.assertEqual(results["feature_a"]["values"], np.sum(self.values**2))
+        self.assertEqual(results["feature_b"]["values"], np.max(self.values**2))
+        self.assertEqual(results["feature_c"]["values"], np.max(self.values**3))
+
+        # Calculated once for each set of keyword arguments
+        self.assertEqual(sorted(calls), [2, 3])
+
+        # Not reused between model evaluations
+        features.calculate_features(self.time, self.values)
+        self.assertEqual(len(calls), 4)
+
+        # Calculated each time outside of the feature calculations
+        features.feature_a(self.time, self.values)
+        features.feature_a(self.time, self.values)
+        self.assertEqual(len(calls), 6)
+
+        self.assertNotIn("intermediate", features.implemented_features())
+
+
+    def test_intermediate_error(self):
+        features = Features()
+
+        with self.assertRaises(ValueError):
+            features.intermediate("unknown", self.time, self.values)
+
+        with self.assertRaises(TypeError):
+            features.add_intermediates({"unknown": 1})
+
+
     # def test_calculate(self):
     #     self.assertEqual(self.features.calculate(self.time, self.values), {})
 
@@ -285,7 +350,8 @@ class TestSpikingFeatures(unittest.TestCase):
                                    "accommodation_index": ["Accommodation index"],
                                    "average_AP_overshoot": ["Voltage (mV)"],
                                    "average_AHP_depth": ["Voltage (mV)"],
-                                   "average_AP_width": ["Time (ms)"]
+                                   "average_AP_width": ["Time (ms)"],
+                                   "AP_widths": ["Time (ms)", "AP width (ms)"]
                                    }
 
         self.features = SpikingFeatures(verbose_level="error")
@@ -319,7 +385,8 @@ class TestSpikingFeatures(unittest.TestCase):
                   "accommodation_index": ["Accommodation index"],
                   "average_AP_overshoot": ["Voltage (mV)"],
                   "average_AHP_depth": ["Voltage (mV)"],
-                  "average_AP_width": ["Time (ms)"]
+                  "average_AP_width": ["Time (ms)"],
+                  "AP_widths": ["Time (ms)", "AP width (ms)"]
                   }
 
         self.assertEqual(features.labels, labels)
@@ -331,11 +398,24 @@ class TestSpikingFeatures(unittest.TestCase):
 
     def test_adaptive_all(self):
         features = SpikingFeatures(adaptive="all")
-        self.assertEqual(set(features.adaptive), set(self.implemented_features))
+        self.assertEqual(set(features.adaptive), set(self.implemented_features + ["AP_widths"]))
 
 
     def test_implemented_features(self):
-        self.assertEqual(set(self.features.implemented_features()), set(self.implemented_features))
+        self.assertEqual(set(self.features.implemented_features()),
+                         set(self.implemented_features + ["AP_widths"]))
+
+
+    def test_features_to_run_AP_widths(self):
+        features = SpikingFeatures(features_to_run=["nr_spikes", "AP_widths"])
+        self.assertEqual(features.features_to_run, ["nr_spikes", "AP_widths"])
+        self.assertEqual(features.adaptive, ["AP_widths"])
+
+        features.features_to_run = "all"
+        self.assertNotIn("AP_widths", features.features_to_run)
+
+        features = SpikingFeatures(adaptive="nr_spikes")
+        self.assertEqual(features.adaptive, ["nr_spikes", "AP_widths"])
 
 
     def test_nr_spikes(self):
@@ -428,6 +508,87 @@ class TestSpikingFeatures(unittest.TestCase):
         self.assertEqual(self.features.average_AP_width(self.time, self.spikes, self.info), (None, None))
 
 
+    def test_calculate_AP_widths(self):
+        AP_widths = self.features.calculate_AP_widths(self.spikes)
+
+        self.assertEqual(len(AP_widths), 12)
+        self.assertAlmostEqual(np.mean(AP_widths),
+                               self.features.average_AP_width(self.time, self.spikes, self.info)[1])
+        self.assertNotIn("calculate_AP_widths", self.features.features_to_run)
+
+
+    def test_AP_widths(self):
+        time, values = self.features.AP_widths(self.time, self.spikes, self.info)
+
+        self.assertTrue(np.array_equal(time, self.spikes.time_spike))
+        self.assertTrue(np.array_equal(values, self.features.calculate_AP_widths(self.spikes)))
+        self.assertAlmostEqual(np.mean(values),
+                               self.features.average_AP_width(self.time, self.spikes, self.info)[1])
+
+
+    def test_AP_widthsNone(self):
+        self.features.spikes.nr_spikes = 0
+        self.assertEqual(self.features.AP_widths(self.time, self.spikes, self.info), (None, None))
+
+
+    def test_calculate_features_AP_widths(self):
+        self.features.features_to_run = ["AP_widths"]
+
+        results = self.features.calculate_features(self.time, self.spikes, self.info)
+
+        self.assertEqual(len(results["AP_widths"]["time"]), 12)
+        self.assertEqual(len(results["AP_widths"]["values"]), 12)
+
+
+    def test_calculate_AP_widths_linear(self):
+        time = np.arange(0, 8)
+        values = np.array([-80, -60, -20, 0, -20, -40, -60, -80])
+        spikes = Spikes(time, values, threshold=-30)
+
+        # The spike starts at -20, so the midpoint is -10, crossed at 2.5 and 3.5
+        AP_widths = self.features.calculate_AP_widths(spikes)
+        self.assertTrue(np.allclose(AP_widths, [1]))
+
+
+    def test_set_spikes_features(self):
+        AP_widths = self.features.calculate_AP_widths(self.spikes)
+        global_index = self.spikes.global_index
+
+        # A subset of the spikes keeps the voltage trace
+        self.spikes.spikes = self.spikes.spikes[1:]
+
+        self.assertTrue(np.array_equal(self.spikes.global_index, global_index[1:]))
+        self.assertTrue(np.allclose(self.features.calculate_AP_widths(self.spikes), AP_widths[1:]))
+
+        AHP_depth = 0
+        for i in range(len(global_index) - 2):
+            AHP_depth += min(self.features.values[global_index[i + 1]:global_index[i + 2]])
+
+        self.assertAlmostEqual(self.features.average_AHP_depth(self.time, self.spikes, self.info)[1],
+                               AHP_depth/float(len(global_index) - 1))
+
+        for feature in self.implemented_features:
+            getattr(self.features, feature)(self.time, self.spikes, self.info)
+
+        # Spikes without a voltage trace use the spikes joined together
+        spikes = Spikes()
+        spikes.spikes = self.spikes.spikes
+
+        self.assertTrue(np.allclose(self.features.calculate_AP_widths(spikes), AP_widths[1:]))
+        self.assertTrue(np.array_equal(spikes.V[spikes.global_index], spikes.V_spike))
+
+
+    def test_calculate_AP_widths_error(self):
+        time = np.arange(0, 6)
+        values = np.array([-80, -60, -20, 0, -20, -80])
+        spikes = Spikes(time, values, threshold=-30)
+
+        # The spike ends at the peak, above the midpoint at -10
+        spikes.end[0] = 4
+        with self.assertRaises(ValueError):
+            self.features.calculate_AP_widths(spikes)
+
+
     # TODO Find correct testime, this is a rough bound only
     def test_accommodation_index(self):
         self.assertIsNotNone(self.features.accommodation_index(self.time, self.spikes, self.info)[1])
@@ -441,7 +602,7 @@ class TestSpikingFeatures(unittest.TestCase):
     def test_calculate_all_features(self):
         result = self.features.calculate_all_features(self.time, self.spikes, self.info)
         self.assertEqual(set(result.keys()),
-                         set(self.implemented_features))
+                         set(self.implemented_features + ["AP_widths"]))
 
 
     def test_reference_feature(self):
@@ -489,6 +650,17 @@ class TestEfelFeatures(unittest.TestCase):
         self.assertEqual(set(self.features.implemented_features()), set(self.implemented_features))
 
 
+    def test_efel_features_lazy(self):
+        self.assertNotIn("Spikecount", self.features.__dict__)
+
+        time, values = self.features.Spikecount(self.time, self.values, self.info)
+        self.assertEqual(values, 12)
+        self.assertIn("Spikecount", self.features.__dict__)
+
+        with self.assertRaises(AttributeError):
+            self.features.not_a_feature
+
+
     def test_spikecount(self):
         time, values = self.features.Spikecount(self.time, self.values, self.info)
 
@@ -502,6 +674,102 @@ class TestEfelFeatures(unittest.TestCase):
                          set(self.implemented_features))
 
 
+    def test_calculate_features_single_efel_call(self):
+        features_to_run = ["Spikecount", "AP_amplitude", "mean_frequency"]
+        self.features = EfelFeatures(features_to_run=features_to_run,
+                                     verbose_level="error")
+
+        calls = []
+        getMeanFeatureValues = efel.getMeanFeatureValues
+
+        def counted(traces, feature_names, *args, **kwargs):
+            calls.append(feature_names)
+            return getMeanFeatureValues(traces, feature_names, *args, **kwargs)
+
+        efel.getMeanFeatureValues = counted
+        try:
+            result = self.features.calculate_features(self.time, self.values, self.info)
+        finally:
+            efel.getMeanFeatureValues = getMeanFeatureValues
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(calls[0]), set(features_to_run))
+
+        for feature in features_to_run:
+            time, values = getattr(self.features, feature)(self.time, self.values, self.info)
+            self.assertIsNone(result[feature]["time"])
+            self.assertEqual(result[feature]["values"], values)
+
+
+    def test_calculate_features_same_as_single(self):
+        result = self.features.calculate_features(self.time, self.values, self.info)
+
+        trace = {"T": self.time,
+                 "V": self.values,
+                 "stim_start": [self.info["stimulus_start"]],
+                 "stim_end": [self.info["stimulus_end"]]}
+
+        self.assertEqual(set(result.keys()), set(self.implemented_features))
+
+        for feature in self.implemented_features:
+            values = efel.getMeanFeatureValues([trace], [feature], raise_warnings=False)[0][feature]
+
+            if values is None:
+                self.assertIsNone(result[feature]["values"], feature)
+            else:
+                self.assertTrue(np.allclose(result[feature]["values"], values, equal_nan=True), feature)
+
+
+    def test_calculate_features_with_timings_efel_call(self):
+        features_to_run = ["Spikecount", "AP_amplitude", "mean_frequency"]
+        self.features = EfelFeatures(features_to_run=features_to_run,
+                                     verbose_level="error")
+
+        getMeanFeatureValues = efel.getMeanFeatureValues
+
+        def slow(traces, feature_names, *args, **kwargs):
+            time.sleep(0.3)
+            return getMeanFeatureValues(traces, feature_names, *args, **kwargs)
+
+        efel.getMeanFeatureValues = slow
+        try:
+            result, timings = self.features.calculate_features_with_timings(self.time, self.values, self.info)
+        finally:
+            efel.getMeanFeatureValues = getMeanFeatureValues
+
+        self.assertEqual(set(timings.keys()), set(features_to_run))
+
+        # The time of the single eFEL call is split between the features
+        for feature in features_to_run:
+            self.assertAlmostEqual(timings[feature], timings["Spikecount"])
+            self.assertGreater(timings[feature], 0.05)
+            self.assertLess(timings[feature], 0.3)
+
+        self.assertEqual(self.features._efel_batches, {})
+
+
+    def test_calculate_features_efel_fallback(self):
+        features_to_run = ["Spikecount", "AP_amplitude"]
+        self.features = EfelFeatures(features_to_run=features_to_run,
+                                     verbose_level="error")
+
+        getMeanFeatureValues = efel.getMeanFeatureValues
+
+        def single(traces, feature_names, *args, **kwargs):
+            if len(feature_names) > 1:
+                raise RuntimeError("Failing eFEL call")
+            return getMeanFeatureValues(traces, feature_names, *args, **kwargs)
+
+        efel.getMeanFeatureValues = single
+        try:
+            result = self.features.calculate_features(self.time, self.values, self.info)
+        finally:
+            efel.getMeanFeatureValues = getMeanFeatureValues
+
+        self.assertEqual(result["Spikecount"]["values"], 12)
+        self.assertIsNotNone(result["AP_amplitude"]["values"])
+
+
     def test_reference_feature(self):
         time, values = self.features.reference_feature(self.time, self.values, self.info)
 
@@ -589,6 +857,72 @@ class TestGeneralNetworkFeatures(unittest.TestCase):
         self.assertEqual(spiketrains[0].t_stop, self.time_original)
 
 
+    def test_preprocess_neo_spiketrains(self):
+        self.features = GeneralNetworkFeatures()
+
+        time, spiketrains = self.features.preprocess(self.time_original, self.values)
+
+        self.assertIsInstance(spiketrains, NeoSpikeTrains)
+        self.assertEqual(len(spiketrains), 4)
+        self.assertTrue(np.array_equal(spiketrains.times, [1, 3, 5, 6, 1, 3, 5, 6, 1, 3, 5, 6, 1]))
+        self.assertTrue(np.array_equal(spiketrains.offsets, [0, 4, 8, 12, 13]))
+
+        # The Neo spiketrains are created when used
+        self.assertEqual(spiketrains._neo_spiketrains, [None]*4)
+
+        self.assertIsInstance(spiketrains[-1], neo.core.SpikeTrain)
+        self.assertIs(spiketrains[3], spiketrains[-1])
+        self.assertEqual(len(spiketrains[1:3]), 2)
+        self.assertEqual(len(list(spiketrains)), 4)
+
+        with self.assertRaises(IndexError):
+            spiketrains[4]
+
+
+    def test_neo_spiketrains_neo_spiketrains(self):
+        self.features = GeneralNetworkFeatures()
+
+        time, spiketrains = self.features.preprocess(self.time_original, self.values)
+
+        neo_spiketrains = spiketrains.neo_spiketrains()
+
+        self.assertIsInstance(neo_spiketrains, list)
+        self.assertEqual(len(neo_spiketrains), 4)
+
+        for i in range(4):
+            self.assertIsInstance(neo_spiketrains[i], neo.core.SpikeTrain)
+            self.assertIs(neo_spiketrains[i], spiketrains[i])
+            self.assertTrue(np.array_equal(neo_spiketrains[i], self.values[i]))
+
+
+    def test_neo_spiketrains_pickle(self):
+        self.features = GeneralNetworkFeatures()
+
+        time, spiketrains = self.features.preprocess(self.time_original, self.values)
+
+        loaded = pickle.loads(pickle.dumps(spiketrains, pickle.HIGHEST_PROTOCOL))
+
+        self.assertIsInstance(loaded, NeoSpikeTrains)
+        self.assertEqual(len(loaded), 4)
+        self.assertTrue(np.array_equal(loaded.times, spiketrains.times))
+        self.assertTrue(np.array_equal(loaded.offsets, spiketrains.offsets))
+        self.assertTrue(np.array_equal(loaded[2], self.values[2]))
+        self.assertEqual(loaded.simulation_end, self.time_original)
+
+
+    def test_preprocess_error(self):
+        self.features = GeneralNetworkFeatures()
+
+        with self.assertRaises(ValueError):
+            self.features.preprocess(self.time_original, [np.array([1, 9])])
+
+        with self.assertRaises(ValueError):
+            self.features.preprocess(self.time_original, [np.array([-1, 2])])
+
+        with self.assertRaises(ValueError):
+            self.features.preprocess(np.nan, self.values)
+
+
 class TestNetworkFeatures(unittest.TestCase):
     def setUp(self):
         folder = os.path.dirname(os.path.realpath(__file__))
@@ -688,6 +1022,8 @@ class TestNetworkFeatures(unittest.TestCase):
                                            [0, 1, 2, 0, 0, 0, 0, 0],
                                            [0, 0, 0, 0, 0, 0, 0, 0]]))
 
+        self.assertEqual(values[3].dtype, np.float64)
+
 
     def test_mean_isi(self):
         time, values = self.features.mean_isi(self.time, self.spiketrains)
@@ -743,6 +1079,40 @@ class TestNetworkFeatures(unittest.TestCase):
         self.assertEqual(values, 0.51923076923076927)
 
 
+    def test_fanofactor_no_spikes(self):
+        time, spiketrains = self.features.preprocess(self.time_original, [np.array([]), np.array([])])
+        time, values = self.features.fanofactor(time, spiketrains)
+
+        self.assertIsNone(time)
+        self.assertTrue(np.isnan(values))
+
+
+    def test_spike_time_features_without_neo(self):
+        features_to_run = ["cv", "mean_cv", "binned_isi", "mean_isi",
+                           "local_variation", "mean_local_variation",
+                           "mean_firing_rate", "fanofactor"]
+        self.features.features_to_run = features_to_run
+
+        results = self.features.calculate_features(self.time, self.spiketrains)
+
+        self.assertEqual(set(results.keys()), set(features_to_run))
+        self.assertEqual(self.spiketrains._neo_spiketrains, [None]*4)
+
+
+    def test_spike_time_features_list(self):
+        # Features also work on a list of Neo spiketrains
+        neo_spiketrains = list(self.spiketrains)
+
+        for feature in ["cv", "mean_cv", "binned_isi", "mean_isi",
+                        "local_variation", "mean_local_variation",
+                        "mean_firing_rate", "fanofactor"]:
+            time, values = getattr(self.features, feature)(self.time, self.spiketrains)
+            time_list, values_list = getattr(self.features, feature)(self.time, neo_spiketrains)
+
+            np.testing.assert_array_equal(np.array(values, dtype=float),
+                                          np.array(values_list, dtype=float))
+
+
     def test_van_rossum_dist(self):
         time, values = self.features.van_rossum_dist(self.time, self.spiketrains)
 
@@ -783,6 +1153,34 @@ class TestNetworkFeatures(unittest.TestCase):
         self.assertEqual(values.shape, (4, 4))
 
 
+    def test_intermediates(self):
+        calls = {"isi": 0, "binned_spiketrains": 0}
+
+        def count(name):
+            function = self.features.intermediates[name]
+
+            def counted(*args, **kwargs):
+                calls[name] += 1
+                return function(*args, **kwargs)
+
+            return counted
+
+        self.features.add_intermediates({"isi": count("isi"),
+                                         "binned_spiketrains": count("binned_spiketrains")})
+
+        results = self.features.calculate_features(self.time, self.spiketrains)
+
+        self.assertEqual(calls, {"isi": 1, "binned_spiketrains": 1})
+
+        for feature in ["cv", "mean_cv", "binned_isi", "mean_isi", "local_variation",
+                        "mean_local_variation", "corrcoef", "covariance"]:
+            time, values = getattr(self.features, feature)(self.time, self.spiketrains)
+
+            # Equal, including the nan values
+            np.testing.assert_array_equal(np.array(results[feature]["values"], dtype=float),
+                                          np.array(values, dtype=float))
+
+
     def test_reference_feature(self):
         time, values = self.features.reference_feature(1, 1)
 
@@ -826,6 +1224,29 @@ class TestTestingFeatures(unittest.TestCase):
                          set(self.implemented_features))
 
 
+    def test_calculate_features_with_timings(self):
+        results, timings = self.features.calculate_features_with_timings(None, None)
+
+        self.assertEqual(set(results.keys()), set(self.implemented_features))
+        self.assertEqual(set(timings.keys()), set(self.implemented_features))
+
+        for feature in timings:
+            self.assertGreaterEqual(timings[feature], 0)
+
+
+    def test_calculate_features_with_timings_overridden(self):
+        class OverriddenFeatures(TestingFeatures):
+            def calculate_features(self, *preprocess_results):
+                return {"feature0d": {"time": None, "values": 42.}}
+
+        self.features = OverriddenFeatures()
+        results, timings = self.features.calculate_features_with_timings(None, None)
+
+        self.assertEqual(results, {"feature0d": {"time": None, "values": 42.}})
+        self.assertEqual(timings, {})
+        self.assertEqual(self.features._feature_timings, {})
+
+
     # def test_calculate_none(self):
     #     self.assertEqual(set(self.features.calculate(None, None).keys()),
     #                      set(self.implemented_features))
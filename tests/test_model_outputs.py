@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from uncertainpy.core import ModelOutputs
+
+
+class TestModelOutputs(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.folder = os.path.join(self.output_test_dir, "model_outputs")
+
+        self.model_result = (np.arange(0, 10), np.arange(0, 10) + 1., {"stimulus_start": 1})
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def test_init(self):
+        ModelOutputs(self.folder)
+
+        self.assertTrue(os.path.isdir(self.folder))
+
+
+    def test_key(self):
+        outputs = ModelOutputs(self.folder)
+
+        key = outputs.key("TestingModel1d", {"a": 1, "b": 2})
+
+        self.assertEqual(key, outputs.key("TestingModel1d", {"b": 2, "a": np.int64(1)}))
+        self.assertEqual(outputs.key("TestingModel1d", {"a": 1.5}),
+                         outputs.key("TestingModel1d", {"a": np.float64(1.5)}))
+
+        self.assertNotEqual(key, outputs.key("TestingModel1d", {"a": 1, "b": 3}))
+        self.assertNotEqual(key, outputs.key("TestingModel2d", {"a": 1, "b": 2}))
+
+
+    def test_save_load(self):
+        outputs = ModelOutputs(self.folder)
+        key = outputs.key("TestingModel1d", {"a": 1, "b": 2})
+
+        self.assertNotIn(key, outputs)
+        self.assertIsNone(outputs.load(key))
+
+        outputs.save(key, self.model_result)
+
+        self.assertIn(key, outputs)
+        self.assertEqual(len(outputs), 1)
+
+        time, values, info = ModelOutputs(self.folder).load(key)
+
+        self.assertTrue(np.array_equal(time, np.arange(0, 10)))
+        self.assertTrue(np.array_equal(values, np.arange(0, 10) + 1))
+        self.assertEqual(info, {"stimulus_start": 1})
+
+
+    def test_save_unpicklable(self):
+        outputs = ModelOutputs(self.folder, verbose_level="error")
+        key = outputs.key("TestingModel1d", {"a": 1, "b": 2})
+
+        outputs.save(key, (None, 1, {"lock": threading.Lock()}))
+
+        self.assertNotIn(key, outputs)
+
+
+    def test_clear(self):
+        outputs = ModelOutputs(self.folder)
+
+        outputs.save(outputs.key("TestingModel1d", {"a": 1}), self.model_result)
+        outputs.save(outputs.key("TestingModel1d", {"a": 2}), self.model_result)
+        self.assertEqual(len(outputs), 2)
+
+        outputs.clear()
+
+        self.assertEqual(len(outputs), 0)
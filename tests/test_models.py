@@ -5,7 +5,9 @@ import numpy as np
 from xvfbwrapper import Xvfb
 import nest
 
+import uncertainpy.models.neuron_model
 from uncertainpy.models import Model, NeuronModel, NestModel
+from uncertainpy.utils import SpikeTrains
 
 from .models import HodgkinHuxley
 from .models import CoffeeCup
@@ -108,6 +110,35 @@ class TestModel(unittest.TestCase):
         self.assertEqual(result, (1, 2))
 
 
+    def test_split_run_result(self):
+        model_result = (np.arange(0, 10), np.array([np.arange(0, 10), np.arange(0, 10) + 1]), {"info": 1})
+
+        results = self.model.split_run_result(model_result, 2)
+
+        self.assertEqual(len(results), 2)
+        for i, (time, values, info) in enumerate(results):
+            self.assertTrue(np.array_equal(time, np.arange(0, 10)))
+            self.assertTrue(np.array_equal(values, np.arange(0, 10) + i))
+            self.assertEqual(info, {"info": 1})
+
+
+    def test_split_run_result_time_list(self):
+        model_result = ([np.arange(0, 10), np.arange(0, 5)], [np.arange(0, 10), np.arange(0, 5)])
+
+        results = self.model.split_run_result(model_result, 2)
+
+        self.assertTrue(np.array_equal(results[0][0], np.arange(0, 10)))
+        self.assertTrue(np.array_equal(results[1][0], np.arange(0, 5)))
+        self.assertTrue(np.array_equal(results[1][1], np.arange(0, 5)))
+
+
+    def test_split_run_result_error(self):
+        model_result = (np.arange(0, 10), np.array([np.arange(0, 10), np.arange(0, 10) + 1]))
+
+        with self.assertRaises(ValueError):
+            self.model.split_run_result(model_result, 3)
+
+
     def test_assign_postprocess(self):
         model = Model(run=model_function)
 
@@ -286,6 +317,240 @@ class TestNeuronModel(unittest.TestCase):
         self.assertEqual(values, "values")
 
 
+    def test_init_load_once(self):
+        model = NeuronModel()
+        self.assertFalse(model.load_once)
+
+        model = NeuronModel(load_once=True)
+        self.assertTrue(model.load_once)
+
+
+    def test_set_parameters(self):
+        model = NeuronModel()
+        model.h = FakeHoc()
+
+        model.set_parameters({"cap": 1.1, "soma Ra": 150})
+
+        self.assertEqual(model.h.cap, 1.1)
+        self.assertEqual(model.h.sections["soma"]["Ra"], 150)
+        self.assertEqual(model.h.statements, ["soma Ra = 150"])
+
+
+    def test_reset_parameters(self):
+        model = NeuronModel(load_once=True)
+        model.h = FakeHoc()
+
+        initial_values = uncertainpy.models.neuron_model._loaded_neuron["initial_values"]
+        initial_values.clear()
+
+        parameters = {"cap": 1.1, "soma Ra": 150}
+        model.reset_parameters(parameters)
+        model.set_parameters(parameters)
+
+        self.assertEqual(initial_values, {"cap": 1, "soma Ra": 100})
+
+        parameters = {"Rm": 22000}
+        model.reset_parameters(parameters)
+        model.set_parameters(parameters)
+
+        self.assertEqual(model.h.cap, 1)
+        self.assertEqual(model.h.Rm, 22000)
+        self.assertEqual(model.h.sections["soma"]["Ra"], 100)
+        self.assertEqual(initial_values, {"cap": 1, "soma Ra": 100, "Rm": 20000})
+
+        initial_values.clear()
+
+
+    def test_reset_parameters_set_parameters(self):
+        calls = []
+
+        class NeuronModelRecalculate(NeuronModel):
+            def set_parameters(self, parameters):
+                super(NeuronModelRecalculate, self).set_parameters(parameters)
+                calls.append(parameters)
+
+        model = NeuronModelRecalculate(load_once=True)
+        model.h = FakeHoc()
+
+        initial_values = uncertainpy.models.neuron_model._loaded_neuron["initial_values"]
+        initial_values.clear()
+
+        model.reset_parameters({"cap": 1.1})
+        model.set_parameters({"cap": 1.1})
+
+        model.reset_parameters({"Rm": 22000})
+
+        self.assertEqual(calls, [{"cap": 1.1}, {"cap": 1}])
+        self.assertEqual(model.h.cap, 1)
+
+        initial_values.clear()
+
+
+    def test_run_fake_neuron(self):
+        model = NeuronModel(load_once=True,
+                            recordings={"dendrite": ("dend", 0.5, "v")},
+                            stimulus_start=1)
+
+        loaded_neuron = uncertainpy.models.neuron_model._loaded_neuron
+        h = FakeHoc()
+        loaded_neuron.update({"key": (os.path.abspath(os.curdir), model.file),
+                              "h": h,
+                              "initial_values": {},
+                              "sections": None,
+                              "vectors": {}})
+
+        try:
+            time, values, info = model.run(cap=2)
+
+            self.assertTrue(np.array_equal(time, np.arange(10)))
+            self.assertTrue(np.array_equal(values, np.full(10, len("Soma(0.5).v") + 2)))
+            self.assertTrue(np.array_equal(info["recordings"]["dendrite"],
+                                           np.full(10, len("dend(0.5).v") + 2)))
+            self.assertEqual(info["stimulus_start"], 1)
+            self.assertNotIn("recordings", model.info)
+
+            time_2, values_2, info_2 = model.run(cap=3)
+
+            # The results of the previous run are not overwritten
+            self.assertTrue(np.array_equal(values, np.full(10, len("Soma(0.5).v") + 2)))
+            self.assertTrue(np.array_equal(values_2, np.full(10, len("Soma(0.5).v") + 3)))
+
+            # The Vectors and sections are reused
+            self.assertEqual(len(h.vectors), 3)
+            self.assertEqual(h.nr_allsec, 1)
+            self.assertEqual(h.nr_runs, 2)
+        finally:
+            loaded_neuron.update({"key": None,
+                                  "h": None,
+                                  "initial_values": {},
+                                  "sections": None,
+                                  "vectors": {}})
+
+
+    def test_run_fake_neuron_section_error(self):
+        model = NeuronModel(load_once=True,
+                            recordings={"axon": ("axon", 0.5, "v")})
+
+        loaded_neuron = uncertainpy.models.neuron_model._loaded_neuron
+        loaded_neuron.update({"key": (os.path.abspath(os.curdir), model.file),
+                              "h": FakeHoc(),
+                              "initial_values": {},
+                              "sections": None,
+                              "vectors": {}})
+
+        try:
+            with self.assertRaises(RuntimeError):
+                model.run(cap=2)
+        finally:
+            loaded_neuron.update({"key": None,
+                                  "h": None,
+                                  "initial_values": {},
+                                  "sections": None,
+                                  "vectors": {}})
+
+
+    def test_to_array(self):
+        model = NeuronModel()
+
+        vector = FakeVector()
+        vector.data = np.arange(5, dtype=float)
+
+        array = model._to_array(vector)
+        self.assertTrue(np.array_equal(array, np.arange(5)))
+        self.assertFalse(np.may_share_memory(array, vector.data))
+
+        # Older versions of Neuron do not have Vector.as_numpy
+        vector = FakeVectorNoNumpy()
+        vector.data = np.arange(5, dtype=float)
+
+        array = model._to_array(vector)
+        self.assertTrue(np.array_equal(array, np.arange(5)))
+
+
+class FakeVectorNoNumpy(object):
+    """
+    Minimal stand-in for a Neuron Vector.
+    """
+    def __init__(self):
+        self.reference = None
+        self.data = np.zeros(0)
+
+    def record(self, reference):
+        self.reference = reference
+
+    def size(self):
+        return float(len(self.data))
+
+    def to_python(self, array):
+        array[:] = self.data
+
+
+class FakeVector(FakeVectorNoNumpy):
+    def as_numpy(self):
+        return self.data
+
+
+
+
+class FakeSection(object):
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+    def __call__(self, position):
+        segment = FakeVector()
+        segment._ref_v = "{}({}).v".format(self._name, position)
+        return segment
+
+
+class FakeHoc(object):
+    """
+    Minimal stand-in for ``neuron.h``, supporting top level variables,
+    ``"section variable = value"`` statements, and recording Vectors.
+    """
+    def __init__(self):
+        self.cap = 1
+        self.Rm = 20000
+        self.hoc_ac_ = 0
+        self.sections = {"soma": {"Ra": 100}}
+        self.statements = []
+
+        self._ref_t = "t"
+        self.vectors = []
+        self.nr_allsec = 0
+        self.nr_runs = 0
+
+    def Vector(self):
+        vector = FakeVector()
+        self.vectors.append(vector)
+        return vector
+
+    def allsec(self):
+        self.nr_allsec += 1
+        return [FakeSection("Soma"), FakeSection("dend")]
+
+    def run(self):
+        self.nr_runs += 1
+        for vector in self.vectors:
+            if vector.reference == "t":
+                vector.data = np.arange(10, dtype=float)
+            elif vector.reference is not None:
+                vector.data = np.full(10, len(vector.reference) + self.cap, dtype=float)
+
+    def __call__(self, statement):
+        self.statements.append(statement)
+
+        left, right = [side.strip() for side in statement.split("=")]
+        words = left.split()
+
+        if words[-1] == "hoc_ac_":
+            self.hoc_ac_ = self.sections[words[0]][right]
+        else:
+            self.sections[words[0]][words[1]] = float(right)
+
+
 class TestNestModel(unittest.TestCase):
     def test_init(self):
         model = NestModel(brunel_network)
@@ -331,5 +596,28 @@ class TestNestModel(unittest.TestCase):
         self.assertTrue(np.array_equal(values, binary_spike))
 
 
+    def test_postprocess_sparse(self):
+        model = NestModel(brunel_network, sparse=True)
+
+        self.assertTrue(model.sparse)
+        self.assertTrue(model.ignore)
+
+        time, values = model.postprocess(4, [[0, 2, 3]])
+
+        self.assertIsNone(time)
+        self.assertIsInstance(values, SpikeTrains)
+        self.assertTrue(np.array_equal(values.spiketrain(0), [0, 2, 3]))
+
+        time, dense_values = values.to_dense()
+
+        binary_spike = np.zeros(40)
+        binary_spike[0] = 1
+        binary_spike[20] = 1
+        binary_spike[30] = 1
+
+        self.assertTrue(np.array_equal(time, np.arange(0, 4, 0.1)))
+        self.assertTrue(np.array_equal(dense_values, [binary_spike]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,13 @@
 import unittest
 import os
 import shutil
+import threading
 import scipy.interpolate
 
 import numpy as np
 
 from xvfbwrapper import Xvfb
-from uncertainpy.core.parallel import Parallel
+from uncertainpy.core.parallel import Parallel, EvaluationTimeoutError, StoredModelResult
 from uncertainpy.models import NeuronModel, Model
 from uncertainpy.features import Features
 
@@ -17,6 +18,9 @@ from .testing_classes import TestingModelAdaptive
 from .testing_classes import PostprocessErrorNumpy
 from .testing_classes import PostprocessErrorOne
 from .testing_classes import PostprocessErrorValue
+from .testing_classes import TestingModelFlaky
+from .testing_classes import model_function_error, model_function_sleep
+from .testing_classes import TestingModelVectorized, model_function_vectorized_error
 
 
 
@@ -174,6 +178,23 @@ class TestParallel(unittest.TestCase):
 
 
 
+    def test_create_interpolations_time_grids(self):
+        results = {"TestingModel1d": {"values": np.arange(0, 10) + 1,
+                                      "time": np.arange(0, 10)},
+                   "feature_adaptive": {"values": np.arange(0, 10) + 1,
+                                        "time": np.arange(0, 10)}}
+
+        self.parallel.time_grids = {"feature_adaptive": np.linspace(0, 9, 4)}
+
+        results = self.parallel.create_interpolations(results)
+
+        self.assertTrue(np.array_equal(results["TestingModel1d"]["time"], np.arange(0, 10)))
+        self.assertTrue(np.array_equal(results["feature_adaptive"]["time"], np.linspace(0, 9, 4)))
+        self.assertTrue(np.allclose(results["feature_adaptive"]["values"], np.linspace(0, 9, 4) + 1))
+        self.assertNotIn("interpolation", results["feature_adaptive"])
+
+
+
     def test_create_interpolations_feature_1d_no_t(self):
         results = {"feature_adaptive": {"values": np.arange(0, 10),
                                         "time": np.nan}}
@@ -241,6 +262,74 @@ class TestParallel(unittest.TestCase):
                               scipy.interpolate.fitpack2.UnivariateSpline)
 
 
+    def test_run_timings(self):
+        results = self.parallel.run(self.model_parameters)
+
+        timings = results["TestingModel1d"]["timings"]
+
+        self.assertEqual(set(timings.keys()),
+                         set(["run", "validate", "postprocess", "preprocess",
+                              "feature: feature0d", "feature: feature1d",
+                              "feature: feature2d", "feature: feature_invalid",
+                              "feature: feature_adaptive", "interpolation"]))
+
+        for phase in timings:
+            self.assertGreaterEqual(timings[phase], 0)
+
+
+    def test_run_calculate_features_overridden(self):
+        class OverriddenFeatures(TestingFeatures):
+            def calculate_features(self, *preprocess_results):
+                results = super(OverriddenFeatures, self).calculate_features(*preprocess_results)
+                results["feature0d"]["values"] = 42.
+
+                return results
+
+        self.parallel.features = OverriddenFeatures(features_to_run=["feature0d", "feature1d"])
+
+        results = self.parallel.run(self.model_parameters)
+
+        self.assertEqual(results["feature0d"]["values"], 42.)
+
+        timings = results["TestingModel1d"]["timings"]
+        self.assertIn("feature: feature0d", timings)
+        self.assertIn("feature: feature1d", timings)
+
+
+    def test_run_store_model_results(self):
+        self.parallel.store_model_results = True
+        results = self.parallel.run(self.model_parameters)
+
+        time, values = results["TestingModel1d"]["model_result"]
+        self.assertTrue(np.array_equal(time, self.t))
+        self.assertTrue(np.array_equal(values, self.values))
+
+        self.parallel.store_model_results = False
+        results = self.parallel.run(self.model_parameters)
+
+        self.assertNotIn("model_result", results["TestingModel1d"])
+
+
+    def test_run_stored_model_result(self):
+        results = self.parallel.run(StoredModelResult((self.t, self.values + 1)))
+
+        self.assertTrue(np.array_equal(results["TestingModel1d"]["values"], self.values + 1))
+        self.assertTrue(np.array_equal(results["feature1d"]["values"], np.arange(0, 10)))
+        self.assertNotIn("run", results["TestingModel1d"]["timings"])
+
+
+    def test_evaluate_batch_store_model_results(self):
+        parallel = Parallel(model=TestingModelVectorized(),
+                            features=self.features,
+                            store_model_results=True)
+
+        results = parallel.evaluate_batch([{"a": 0, "b": 1}, {"a": 1, "b": 2}])
+
+        for i, (result, error) in enumerate(results):
+            time, values = result["TestingModelVectorized"]["model_result"][:2]
+            self.assertTrue(np.array_equal(values, np.arange(0, 10) + 1 + 2*i))
+
+
     def test_run_adaptive(self):
         parallel = Parallel(model=TestingModelAdaptive(),
                             features=TestingFeatures(features_to_run="feature_adaptive"))
@@ -434,3 +523,245 @@ class TestParallel(unittest.TestCase):
 
         self.assertTrue(np.all(np.isnan(result)))
         self.assertEqual(len(result), 3)
+
+
+
+    def test_none_to_nan_array(self):
+        values = np.linspace(0, 1, 100)
+
+        result = self.parallel.none_to_nan(values)
+
+        # Regular arrays are not copied
+        self.assertIs(result, values)
+
+
+        values = [np.arange(0, 3), None, np.arange(0, 3) + 1]
+
+        result = self.parallel.none_to_nan(values)
+
+        self.assertEqual(result.dtype, float)
+        self.assertTrue(np.array_equal(result[0], [0, 1, 2]))
+        self.assertTrue(np.all(np.isnan(result[1])))
+        self.assertTrue(np.array_equal(result[2], [1, 2, 3]))
+
+
+        values = [1, None, 3.5]
+
+        result = self.parallel.none_to_nan(values)
+
+        self.assertTrue(np.array_equal(result[[0, 2]], [1, 3.5]))
+        self.assertTrue(np.isnan(result[1]))
+
+
+        values = [np.arange(0, 3), None, np.arange(0, 2)]
+
+        result = self.parallel.none_to_nan(values)
+
+        self.assertEqual(len(result), 3)
+        self.assertTrue(np.array_equal(result[2], [0, 1]))
+
+
+    def test_none_to_nan_ragged_list(self):
+        result = self.parallel.none_to_nan([[1, 2], None])
+
+        self.assertEqual(result.shape, (2, 2))
+        self.assertTrue(np.array_equal(result[0], [1, 2]))
+        self.assertTrue(np.all(np.isnan(result[1])))
+
+
+        result = self.parallel.none_to_nan([[1], [1, 2]])
+
+        self.assertEqual(len(result), 2)
+        self.assertTrue(np.array_equal(result[0], [1]))
+        self.assertTrue(np.array_equal(result[1], [1, 2]))
+
+
+    def test_init_on_error_error(self):
+        with self.assertRaises(ValueError):
+            Parallel(TestingModel1d(), on_error="ignore")
+
+
+    def test_evaluate(self):
+        result, error = self.parallel.evaluate(self.model_parameters)
+
+        self.assertIsNone(error)
+        self.assertEqual(set(result.keys()),
+                         set(["TestingModel1d", "feature0d", "feature1d",
+                              "feature2d", "feature_invalid", "feature_adaptive"]))
+        self.assertTrue(np.array_equal(result["TestingModel1d"]["values"], self.values))
+
+
+    def test_evaluate_error_raise(self):
+        parallel = Parallel(model=model_function_error)
+
+        with self.assertRaises(ValueError):
+            parallel.evaluate({"a": 2, "b": 1})
+
+
+    def test_evaluate_error_nan(self):
+        parallel = Parallel(model=model_function_error,
+                            on_error="nan",
+                            verbose_level="error")
+
+        result, error = parallel.evaluate({"a": 2, "b": 1})
+
+        self.assertIsNone(result)
+        self.assertEqual(error, "ValueError: Model fails for a > 1")
+
+
+    def test_evaluate_retries(self):
+        model = TestingModelFlaky(failures=2)
+        parallel = Parallel(model=model,
+                            retries=2,
+                            verbose_level="error")
+
+        result, error = parallel.evaluate(self.model_parameters)
+
+        self.assertIsNone(error)
+        self.assertEqual(model.attempts, 3)
+        self.assertTrue(np.array_equal(result["TestingModelFlaky"]["values"], self.values))
+
+
+    def test_evaluate_retries_exhausted(self):
+        model = TestingModelFlaky(failures=3)
+        parallel = Parallel(model=model,
+                            retries=2,
+                            on_error="nan",
+                            verbose_level="error")
+
+        result, error = parallel.evaluate(self.model_parameters)
+
+        self.assertIsNone(result)
+        self.assertEqual(error, "RuntimeError: Model failed")
+        self.assertEqual(model.attempts, 3)
+
+
+    def test_evaluate_timeout(self):
+        parallel = Parallel(model=model_function_sleep,
+                            timeout=0.1,
+                            on_error="nan",
+                            verbose_level="error")
+
+        result, error = parallel.evaluate({"a": 2, "b": 1})
+
+        self.assertIsNone(result)
+        self.assertTrue(error.startswith("EvaluationTimeoutError"))
+
+        result, error = parallel.evaluate({"a": 0, "b": 1})
+
+        self.assertIsNone(error)
+        self.assertTrue(np.array_equal(result["model_function_sleep"]["values"], self.values))
+
+
+    def test_evaluate_timeout_raise(self):
+        parallel = Parallel(model=model_function_sleep,
+                            timeout=0.1)
+
+        with self.assertRaises(EvaluationTimeoutError):
+            parallel.evaluate({"a": 2, "b": 1})
+
+
+    def test_evaluate_timeout_thread_warn_once(self):
+        parallel = Parallel(model=model_function,
+                            timeout=1)
+
+        warnings = []
+        parallel.logger.warning = warnings.append
+
+        def evaluate():
+            for i in range(3):
+                parallel.evaluate({"a": 0, "b": 1})
+
+        thread = threading.Thread(target=evaluate)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(len(warnings), 1)
+
+
+    def test_run_vectorized(self):
+        parallel = Parallel(model=TestingModelVectorized(),
+                            features=self.features)
+
+        result = parallel.run(self.model_parameters)
+
+        self.assertTrue(np.array_equal(result["TestingModelVectorized"]["time"], self.t))
+        self.assertTrue(np.array_equal(result["TestingModelVectorized"]["values"], self.values))
+        self.assertIn("feature1d", result)
+
+
+    def test_evaluate_batch(self):
+        model = TestingModelVectorized()
+        parallel = Parallel(model=model,
+                            features=self.features)
+
+        batch = [{"a": 0, "b": 1}, {"a": 1, "b": 2}, {"a": 2, "b": 3}]
+        results = parallel.evaluate_batch(batch)
+
+        self.assertEqual(model.calls[0], 1)
+        self.assertEqual(len(results), 3)
+
+        for (result, error), model_parameters in zip(results, batch):
+            self.assertIsNone(error)
+            self.assertTrue(np.array_equal(result["TestingModelVectorized"]["values"],
+                                           np.arange(0, 10) + model_parameters["a"] + model_parameters["b"]))
+            self.assertIn("run", result["TestingModelVectorized"]["timings"])
+            self.assertEqual(set(result.keys()),
+                             set(["TestingModelVectorized", "feature0d", "feature1d",
+                                  "feature2d", "feature_invalid", "feature_adaptive"]))
+
+
+    def test_evaluate_profile(self):
+        self.parallel.profile = True
+
+        result, error = self.parallel.evaluate(self.model_parameters)
+
+        self.assertIsNone(error)
+
+        functions = [function for filename, line, function in result["TestingModel1d"]["profile"]]
+        self.assertIn("run", functions)
+        self.assertIn("feature1d", functions)
+
+
+    def test_evaluate_batch_profile(self):
+        parallel = Parallel(model=TestingModelVectorized(),
+                            features=self.features,
+                            profile=True)
+
+        results = parallel.evaluate_batch([{"a": 0, "b": 1}, {"a": 1, "b": 2}])
+
+        # The batch is profiled as a whole
+        self.assertIn("profile", results[0][0]["TestingModelVectorized"])
+        self.assertNotIn("profile", results[1][0]["TestingModelVectorized"])
+
+
+    def test_evaluate_batch_not_vectorized(self):
+        results = self.parallel.evaluate_batch([{"a": 0, "b": 1}, {"a": 1, "b": 2}])
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(np.array_equal(results[1][0]["TestingModel1d"]["values"], np.arange(0, 10) + 3))
+
+
+    def test_evaluate_batch_error_nan(self):
+        model = Model(run=model_function_vectorized_error, vectorized=True)
+        parallel = Parallel(model=model,
+                            on_error="nan",
+                            verbose_level="error")
+
+        results = parallel.evaluate_batch([{"a": 0, "b": 1}, {"a": 2, "b": 1}])
+
+        # The batch fails, and each set of parameters is evaluated separately
+        self.assertIsNone(results[0][1])
+        self.assertTrue(np.array_equal(results[0][0]["model_function_vectorized_error"]["values"],
+                                       self.values))
+
+        self.assertIsNone(results[1][0])
+        self.assertEqual(results[1][1], "ValueError: Model fails for a > 1")
+
+
+    def test_evaluate_batch_error_raise(self):
+        parallel = Parallel(model=Model(run=model_function_vectorized_error, vectorized=True),
+                            verbose_level="error")
+
+        with self.assertRaises(ValueError):
+            parallel.evaluate_batch([{"a": 0, "b": 1}, {"a": 2, "b": 1}])
@@ -11,6 +11,7 @@ matplotlib.use('Agg')
 from .testing_classes import TestCasePlot
 from uncertainpy.plotting.plot_uncertainty import PlotUncertainty
 from uncertainpy import Data
+from uncertainpy.utils import SpikeTrains
 
 
 
@@ -227,6 +228,28 @@ class TestPlotUncertainpy(TestCasePlot):
         self.assertEqual(plot_count, 22)
 
 
+    def test_evaluations_2d_spike_trains(self):
+        self.plot.data = Data()
+
+        evaluations = np.full(3, np.nan, dtype=object)
+        evaluations[0] = SpikeTrains.from_spiketrains([[0, 2, 3], [1.5]], 4, 0.5)
+        evaluations[2] = SpikeTrains.from_spiketrains([[1, 2], [3]], 4, 0.5)
+
+        self.plot.data.add_features("nest_model")
+        self.plot.data["nest_model"].labels = ["x", "y", "z"]
+        self.plot.data["nest_model"].time = np.nan
+        self.plot.data["nest_model"].evaluations = evaluations
+        self.plot.data.model_name = "nest_model"
+
+        self.plot.evaluations(feature="nest_model")
+
+        plot_count = 0
+        for plot in glob.glob(os.path.join(self.output_test_dir, "nest_model_evaluations/*.png")):
+            plot_count += 1
+
+        self.assertEqual(plot_count, 2)
+
+
     def test_evaluations_feature_2d(self):
         self.plot.data = Data(os.path.join(self.test_data_dir, "TestingModel1d.h5"))
 
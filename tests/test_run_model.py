@@ -6,15 +6,82 @@ import scipy.interpolate
 import numpy as np
 
 from uncertainpy import Parameters
-from uncertainpy.core import RunModel
+from uncertainpy.core import RunModel, ProcessExecutor, SerialExecutor, ThreadExecutor
+from uncertainpy.core import Checkpoint, EvaluationCache, ModelOutputs
+from uncertainpy.core.assembler import ResultAssembler
 from uncertainpy.models import NeuronModel, Model
 from uncertainpy.features import Features, SpikingFeatures
+from uncertainpy.utils import SpikeTrains
 
 from .testing_classes import TestingFeatures, model_function
 from .testing_classes import TestingModel0d, TestingModel1d, TestingModel2d
 from .testing_classes import TestingModelAdaptive
+from .testing_classes import model_function_error, TestingModelFlaky
+from .testing_classes import TestingModelVectorized
 
 
+def spiking_network(a, b):
+    return 4, [[0, a], [b]]
+
+
+def spiking_network_postprocess(simulation_end, spiketrains):
+    return None, SpikeTrains.from_spiketrains(spiketrains, simulation_end, 0.5)
+
+
+class CountingModel(Model):
+    def __init__(self):
+        super(CountingModel, self).__init__(labels=["x", "y"])
+
+        # Not a number, so the count is not part of the cache key
+        self.evaluations = np.zeros(1, dtype=int)
+
+    def run(self, a=1, b=2):
+        self.evaluations[0] += 1
+
+        return model_function(a=a, b=b)
+
+
+
+class SetupModel(TestingModel1d):
+    def __init__(self):
+        super(SetupModel, self).__init__()
+
+        self.setups = 0
+        self.teardowns = 0
+
+    def setup_worker(self):
+        self.setups += 1
+
+    def teardown_worker(self):
+        self.teardowns += 1
+
+
+
+class CountingModelAdaptive(TestingModelAdaptive):
+    def __init__(self):
+        super(CountingModelAdaptive, self).__init__()
+
+        self.evaluations = 0
+
+    def run(self, a=1, b=2):
+        self.evaluations += 1
+
+        return super(CountingModelAdaptive, self).run(a=a, b=b)
+
+
+
+class RecordingExecutor(SerialExecutor):
+    def __init__(self):
+        super(RecordingExecutor, self).__init__()
+
+        self.calls = []
+
+    def imap(self, model_parameters, max_inflight=None, time_grids=None):
+        self.calls.append((len(model_parameters), max_inflight))
+
+        return super(RecordingExecutor, self).imap(model_parameters,
+                                                   max_inflight=max_inflight,
+                                                   time_grids=time_grids)
 
 
 class TestRunModel(unittest.TestCase):
@@ -320,6 +387,324 @@ class TestRunModel(unittest.TestCase):
         self.runmodel.evaluate_nodes(nodes, ["a", "b"])
 
 
+    def test_evaluate_nodes_reuse_pool(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        pool = self.runmodel.backend._pool
+
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertIs(self.runmodel.backend._pool, pool)
+        self.assertEqual(len(results), 3)
+
+        self.runmodel.close()
+
+
+    def test_evaluate_nodes_new_pool_model_changed(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        pool = self.runmodel.backend._pool
+
+        self.runmodel.model = model_function
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertIsNot(self.runmodel.backend._pool, pool)
+        self.assertIn("model_function", results[0])
+
+        self.runmodel.close()
+
+
+    def test_evaluate_nodes_new_pool_features_changed(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        pool = self.runmodel.backend._pool
+
+        self.runmodel.features.features_to_run = ["feature0d"]
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertIsNot(self.runmodel.backend._pool, pool)
+        self.assertEqual(set(results[0].keys()),
+                         set(["TestingModel1d", "feature0d"]))
+
+        self.runmodel.close()
+
+
+    def test_close(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        self.runmodel.close()
+
+        self.assertFalse(self.runmodel.backend.running)
+
+        # Closing twice should not fail
+        self.runmodel.close()
+
+
+    def test_context_manager(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        with RunModel(model=TestingModel1d(),
+                      parameters=self.parameters,
+                      features=self.features) as runmodel:
+            runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+            self.assertTrue(runmodel.backend.running)
+
+        self.assertFalse(runmodel.backend.running)
+
+
+    def test_backend(self):
+        self.assertIsInstance(self.runmodel.backend, ProcessExecutor)
+
+        runmodel = RunModel(model=TestingModel1d(),
+                            parameters=self.parameters,
+                            backend="serial")
+
+        self.assertIsInstance(runmodel.backend, SerialExecutor)
+
+
+    def test_backend_error(self):
+        with self.assertRaises(ValueError):
+            RunModel(model=TestingModel1d(),
+                     parameters=self.parameters,
+                     backend="not_existing")
+
+
+    def test_backend_thread_timeout_error(self):
+        with self.assertRaises(ValueError):
+            RunModel(model=TestingModel1d(),
+                     parameters=self.parameters,
+                     backend="thread",
+                     timeout=1)
+
+        runmodel = RunModel(model=TestingModel1d(),
+                            parameters=self.parameters,
+                            backend="serial",
+                            timeout=1)
+
+        with self.assertRaises(ValueError):
+            runmodel.backend = "thread"
+
+
+    def test_set_backend(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel.CPUs = 2
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        backend = self.runmodel.backend
+
+        self.runmodel.backend = "thread"
+
+        self.assertFalse(backend.running)
+        self.assertIsInstance(self.runmodel.backend, ThreadExecutor)
+        self.assertEqual(self.runmodel.CPUs, 2)
+
+        self.runmodel.close()
+
+
+    def test_evaluate_nodes_backends(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        results_process = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        self.runmodel.close()
+
+        for backend in ["serial", "thread"]:
+            self.runmodel.backend = backend
+            results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+            self.runmodel.close()
+
+            self.assertEqual(len(results), 3)
+            for result, result_process in zip(results, results_process):
+                self.assertEqual(set(result.keys()), set(result_process.keys()))
+                self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                               result_process["TestingModel1d"]["values"]))
+
+
+    def test_run_memmap(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel = RunModel(model=TestingModel1d(),
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature0d",
+                                                                           "feature1d",
+                                                                           "feature2d"]),
+                                 backend=ProcessExecutor(CPUs=1,
+                                                         memmap_threshold=0,
+                                                         scratch_folder=self.output_test_dir))
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+        self.runmodel.close()
+
+        self.assert_testingmodel1d(data)
+        self.assert_feature_0d(data)
+        self.assert_feature_1d(data)
+        self.assert_feature_2d(data)
+
+
+    def test_run_memmap_arguments(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel = RunModel(model=TestingModel1d(),
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature1d"]),
+                                 CPUs=1,
+                                 memmap_threshold=0,
+                                 scratch_folder=self.output_test_dir)
+
+        self.assertEqual(self.runmodel.backend.memmap_threshold, 0)
+        self.assertEqual(self.runmodel.backend.scratch_folder, self.output_test_dir)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+        self.runmodel.close()
+
+        self.assert_testingmodel1d(data)
+        self.assert_feature_1d(data)
+
+
+    def test_set_memmap_threshold(self):
+        self.runmodel.memmap_threshold = 100
+        self.assertEqual(self.runmodel.backend.memmap_threshold, 100)
+
+        # The settings are kept when a new process backend is created
+        self.runmodel.backend = "process"
+        self.assertEqual(self.runmodel.memmap_threshold, 100)
+
+        self.runmodel.memmap_threshold = None
+        self.assertIsNone(self.runmodel.backend.memmap_threshold)
+
+        self.runmodel.backend = "serial"
+        self.assertIsNone(self.runmodel.memmap_threshold)
+
+        with self.assertRaises(ValueError):
+            self.runmodel.memmap_threshold = 100
+
+
+    def test_memmap_threshold_backend_error(self):
+        with self.assertRaises(ValueError):
+            RunModel(model=TestingModel1d(),
+                     parameters=self.parameters,
+                     backend="serial",
+                     memmap_threshold=100)
+
+
+    def test_run_spike_trains(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        model = Model(run=spiking_network,
+                      postprocess=spiking_network_postprocess,
+                      ignore=True)
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature0d"]))
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        evaluations = data["spiking_network"].evaluations
+        self.assertEqual(evaluations.dtype, object)
+        self.assertEqual(len(evaluations), 3)
+
+        for i in range(3):
+            self.assertIsInstance(evaluations[i], SpikeTrains)
+            self.assertTrue(np.array_equal(evaluations[i].spiketrain(0), [0, nodes[0, i]]))
+            self.assertTrue(np.array_equal(evaluations[i].spiketrain(1), [nodes[1, i]]))
+
+        self.assertTrue(np.isnan(data["spiking_network"].time))
+        self.assertEqual(data.ndim("spiking_network"), 2)
+        self.assert_feature_0d(data)
+
+
+    def test_run_spike_trains_checkpoint(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        checkpoint = os.path.join(self.output_test_dir, "checkpoint.h5")
+
+        model = Model(run=spiking_network,
+                      postprocess=spiking_network_postprocess,
+                      ignore=True)
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature0d"]),
+                                 backend="serial",
+                                 checkpoint=checkpoint)
+
+        self.runmodel.run(nodes, ["a", "b"])
+
+        self.runmodel.resume = True
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        evaluations = data["spiking_network"].evaluations
+        for i in range(3):
+            self.assertIsInstance(evaluations[i], SpikeTrains)
+            self.assertTrue(np.array_equal(evaluations[i].spiketrain(0), [0, nodes[0, i]]))
+            self.assertTrue(np.array_equal(evaluations[i].spiketrain(1), [nodes[1, i]]))
+
+
+    def test_initializer(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        filename = os.path.join(self.output_test_dir, "initializer")
+
+        def initializer(filename):
+            with open(filename, "a") as f:
+                f.write("initialized\n")
+
+        runmodel = RunModel(model=TestingModel1d(),
+                            parameters=self.parameters,
+                            features=self.features,
+                            CPUs=1,
+                            initializer=initializer,
+                            initargs=(filename,))
+
+        runmodel.evaluate_nodes(nodes, ["a", "b"])
+        runmodel.evaluate_nodes(nodes, ["a", "b"])
+        runmodel.close()
+
+        with open(filename) as f:
+            self.assertEqual(f.read(), "initialized\n")
+
+
+    def test_setup_times(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        runmodel = RunModel(model=SetupModel(),
+                            parameters=self.parameters,
+                            features=self.features,
+                            CPUs=1)
+
+        runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(runmodel.setup_times), 1)
+        self.assertGreaterEqual(runmodel.setup_times[0], 0)
+
+        # The workers are reused, so there is no new setup
+        runmodel.evaluate_nodes(nodes, ["a", "b"])
+        self.assertEqual(runmodel.setup_times, [])
+
+        runmodel.close()
+
+
+    def test_setup_times_serial(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        model = SetupModel()
+
+        runmodel = RunModel(model=model,
+                            parameters=self.parameters,
+                            features=self.features,
+                            backend="serial")
+
+        runmodel.evaluate_nodes(nodes, ["a", "b"])
+        self.assertEqual(len(runmodel.setup_times), 1)
+        self.assertEqual(model.setups, 1)
+
+        runmodel.close()
+        self.assertEqual(model.teardowns, 1)
+
+
 
     def test_results_to_data_model_1d_all_features(self):
         nodes = np.array([[0, 1, 2], [1, 2, 3]])
@@ -512,6 +897,81 @@ class TestRunModel(unittest.TestCase):
             self.runmodel.results_to_data(results)
 
 
+    def test_results_to_data_not_adaptive_error(self):
+        results = [{"TestingModel1d": {"values": np.arange(0, 10),
+                                       "time": np.arange(0, 10)}},
+                   {"TestingModel1d": {"values": np.arange(0, 5),
+                                       "time": np.arange(0, 5)}}]
+
+        with self.assertRaises(ValueError):
+            self.runmodel.results_to_data(results)
+
+
+    def test_result_assembler_out_of_order(self):
+        results = [{"TestingModel1d": {"values": np.arange(0, 10) + 1,
+                                       "time": np.arange(0, 10)},
+                    "feature0d": {"values": 1,
+                                  "time": np.nan}},
+                   {"TestingModel1d": {"values": np.arange(0, 10) + 3,
+                                       "time": np.arange(0, 10)},
+                    "feature0d": {"values": 2,
+                                  "time": np.nan}},
+                   {"TestingModel1d": {"values": np.nan,
+                                       "time": np.nan},
+                    "feature0d": {"values": np.nan,
+                                  "time": np.nan}}]
+
+        assembler = ResultAssembler(self.runmodel.model,
+                                    self.runmodel.features,
+                                    4,
+                                    self.runmodel.logger)
+
+        for i in [2, 1, 0]:
+            assembler.add(i, results[i])
+
+        # Failed model evaluation
+        assembler.add(3, None)
+
+        data = assembler.data()
+
+        self.assertTrue(np.array_equal(data["TestingModel1d"].time, np.arange(0, 10)))
+        self.assertEqual(data["TestingModel1d"].evaluations.shape, (4, 10))
+        self.assertTrue(np.array_equal(data["TestingModel1d"].evaluations[0], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(data["TestingModel1d"].evaluations[1], np.arange(0, 10) + 3))
+        self.assertTrue(np.all(np.isnan(data["TestingModel1d"].evaluations[2:])))
+
+        self.assertTrue(np.isnan(data["feature0d"].time))
+        self.assertTrue(np.array_equal(data["feature0d"].evaluations[:2], [1, 2]))
+        self.assertTrue(np.all(np.isnan(data["feature0d"].evaluations[2:])))
+
+
+    def test_result_assembler_integer(self):
+        assembler = ResultAssembler(self.runmodel.model,
+                                    self.runmodel.features,
+                                    2,
+                                    self.runmodel.logger)
+
+        assembler.add(1, {"feature0d": {"values": 2, "time": np.nan}})
+        assembler.add(0, {"feature0d": {"values": 1, "time": np.nan}})
+
+        data = assembler.data()
+
+        self.assertTrue(np.array_equal(data["feature0d"].evaluations, [1, 2]))
+        self.assertTrue(np.issubdtype(data["feature0d"].evaluations.dtype, np.integer))
+
+
+    def test_result_assembler_no_results(self):
+        assembler = ResultAssembler(self.runmodel.model,
+                                    self.runmodel.features,
+                                    2,
+                                    self.runmodel.logger)
+
+        assembler.add(0, None)
+
+        with self.assertRaises(RuntimeError):
+            assembler.data()
+
+
     # def test_results_to_dataAdaptiveError(self):
     #     self.runmodel = RunModel(TestingModelAdaptive(adaptive=True),
     #                              features=TestingFeatures(),
@@ -750,6 +1210,117 @@ class TestRunModel(unittest.TestCase):
         self.assert_feature_2d(data)
 
 
+    def test_run_timings(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        features = TestingFeatures(features_to_run=["feature0d",
+                                                    "feature1d"])
+
+        self.runmodel = RunModel(model=TestingModel1d(),
+                                 parameters=self.parameters,
+                                 features=features,
+                                 CPUs=1)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertEqual(set(data.node_timings.keys()),
+                         set(["run", "validate", "postprocess", "preprocess",
+                              "feature: feature0d", "feature: feature1d",
+                              "interpolation"]))
+
+        for phase in data.node_timings:
+            self.assertEqual(data.node_timings[phase].shape, (3,))
+            self.assertTrue(np.all(data.node_timings[phase] >= 0))
+
+        self.assertIn("model evaluation", data.timings)
+        self.assertIn("assembly", data.timings)
+        self.assertLessEqual(data.timings["assembly"], data.timings["model evaluation"])
+
+        self.runmodel.close()
+
+
+    def test_run_profile(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel = RunModel(model=TestingModel1d(),
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run="feature1d"),
+                                 CPUs=1,
+                                 profile=True)
+
+        self.assertTrue(self.runmodel.profile)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertNotIn("profile", data)
+
+        stats = self.runmodel.profile_stats.stats
+        keys = [key for key in stats if key[2] == "feature1d"]
+        self.assertEqual(len(keys), 1)
+
+        # Number of calls merged from all workers
+        self.assertEqual(stats[keys[0]][1], 3)
+
+        self.runmodel.close()
+
+
+    def test_max_inflight_error(self):
+        with self.assertRaises(ValueError):
+            RunModel(model=TestingModel1d(), parameters=self.parameters, max_inflight=0)
+
+
+    def test_run_max_inflight(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+        backend = RecordingExecutor()
+
+        self.runmodel = RunModel(model=TestingModel1d(),
+                                 parameters=self.parameters,
+                                 backend=backend,
+                                 max_inflight=2)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertEqual(backend.calls, [(5, 2)])
+
+        for i, evaluation in enumerate(data["TestingModel1d"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + 2*i + 1))
+
+
+    def test_run_max_memory(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+        backend = RecordingExecutor()
+
+        # Each result has the model values and time, 10 numbers each
+        self.runmodel = RunModel(model=TestingModel1d(),
+                                 parameters=self.parameters,
+                                 backend=backend,
+                                 max_memory=3*2*10*8)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        # The first node is evaluated alone to find the size of each result
+        self.assertEqual(backend.calls, [(1, 1), (4, 3)])
+
+        for i, evaluation in enumerate(data["TestingModel1d"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + 2*i + 1))
+
+
+    def test_run_max_memory_vectorized(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+
+        self.runmodel = RunModel(model=TestingModelVectorized(),
+                                 parameters=self.parameters,
+                                 backend="thread",
+                                 CPUs=2,
+                                 max_memory=1)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        for i, evaluation in enumerate(data["TestingModelVectorized"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + 2*i + 1))
+
+        self.runmodel.close()
+
+
     def test_run_one_uncertain_parameter(self):
         nodes = np.array([0, 1, 2])
         self.runmodel = RunModel(model=TestingModel1d(),
@@ -771,6 +1342,394 @@ class TestRunModel(unittest.TestCase):
                                        np.arange(0, 10) + 4))
 
 
+    def test_init_time_grid_error(self):
+        with self.assertRaises(ValueError):
+            RunModel(model=TestingModelAdaptive(),
+                     parameters=self.parameters,
+                     time_grid="longest")
+
+
+    def assert_time_grid(self, data, time):
+        for feature in ["TestingModelAdaptive", "feature_adaptive"]:
+            self.assertTrue(np.array_equal(data[feature]["time"], time))
+            self.assertEqual(data[feature].evaluations.shape, (3, len(time)))
+            self.assertTrue(np.allclose(data[feature].evaluations[0], time + 1))
+            self.assertTrue(np.allclose(data[feature].evaluations[1], time + 3))
+            self.assertTrue(np.allclose(data[feature].evaluations[2], time + 5))
+
+
+    def test_run_time_grid_array(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        features = TestingFeatures(features_to_run=["feature_adaptive"],
+                                   adaptive="feature_adaptive")
+
+        self.runmodel = RunModel(model=TestingModelAdaptive(),
+                                 parameters=self.parameters,
+                                 features=features,
+                                 CPUs=1,
+                                 time_grid=np.linspace(0, 14, 8))
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertEqual(set(self.runmodel.time_grids.keys()),
+                         set(["TestingModelAdaptive", "feature_adaptive"]))
+        self.assert_time_grid(data, np.linspace(0, 14, 8))
+
+
+    def test_run_time_grid_pilot(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        features = TestingFeatures(features_to_run=["feature_adaptive"],
+                                   adaptive="feature_adaptive")
+
+        self.runmodel = RunModel(model=TestingModelAdaptive(),
+                                 parameters=self.parameters,
+                                 features=features,
+                                 CPUs=1,
+                                 time_grid="pilot")
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        # The first node has the shortest time array
+        self.assert_time_grid(data, np.arange(0, 11))
+
+
+    def test_run_time_grid_pilot_reuse_pool(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        features = TestingFeatures(features_to_run=["feature_adaptive"],
+                                   adaptive="feature_adaptive")
+
+        self.runmodel = RunModel(model=TestingModelAdaptive(),
+                                 parameters=self.parameters,
+                                 features=features,
+                                 CPUs=1,
+                                 time_grid="pilot")
+
+        starts = []
+        start = self.runmodel.backend._start
+
+        def counting_start(*args):
+            starts.append(1)
+            start(*args)
+
+        self.runmodel.backend._start = counting_start
+
+        for i in range(3):
+            data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.runmodel.close()
+
+        self.assertEqual(len(starts), 1)
+        self.assert_time_grid(data, np.arange(0, 11))
+
+
+    def test_run_time_grid_pilot_reuse_first_node(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        model = CountingModelAdaptive()
+        features = TestingFeatures(features_to_run=["feature_adaptive"],
+                                   adaptive="feature_adaptive")
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=features,
+                                 backend="serial",
+                                 time_grid="pilot")
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertEqual(model.evaluations, 3)
+        self.assertTrue(np.allclose(data["CountingModelAdaptive"].evaluations[0], np.arange(0, 11) + 1))
+        self.assertTrue(np.allclose(data["feature_adaptive"].evaluations[0], np.arange(0, 11) + 1))
+
+
+    def test_run_time_grid_nr_points(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        features = TestingFeatures(features_to_run=["feature_adaptive"],
+                                   adaptive="feature_adaptive")
+
+        self.runmodel = RunModel(model=TestingModelAdaptive(),
+                                 parameters=self.parameters,
+                                 features=features,
+                                 CPUs=1,
+                                 time_grid=6)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assert_time_grid(data, np.linspace(0, 10, 6))
+
+
+    def test_run_vectorized(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        model = TestingModelVectorized()
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 backend="serial",
+                                 batch_size=2)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        # Two batches, with two and one sets of parameters
+        self.assertEqual(model.calls[0], 2)
+
+        self.assertTrue(np.array_equal(data["TestingModelVectorized"].time, np.arange(0, 10)))
+        self.assertTrue(np.array_equal(data["TestingModelVectorized"].evaluations,
+                                       [np.arange(0, 10) + 1,
+                                        np.arange(0, 10) + 3,
+                                        np.arange(0, 10) + 5]))
+
+
+    def test_run_vectorized_process(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        self.runmodel = RunModel(model=TestingModelVectorized(),
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature0d", "feature1d"]),
+                                 CPUs=1)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertTrue(np.array_equal(data["TestingModelVectorized"].evaluations,
+                                       [np.arange(0, 10) + 1,
+                                        np.arange(0, 10) + 3,
+                                        np.arange(0, 10) + 5]))
+        self.assert_feature_0d(data)
+        self.assert_feature_1d(data)
+
+
+    def test_run_on_error_nan(self):
+        nodes = np.array([[0, 2, 1], [1, 2, 3]])
+        features = TestingFeatures(features_to_run=["feature0d", "feature1d"])
+
+        self.runmodel = RunModel(model=model_function_error,
+                                 parameters=self.parameters,
+                                 features=features,
+                                 CPUs=1,
+                                 on_error="nan",
+                                 verbose_level="error")
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertEqual(len(data.failures), 1)
+        self.assertTrue(data.failures[0].startswith("Node 1 "))
+        self.assertTrue(data.failures[0].endswith("ValueError: Model fails for a > 1"))
+
+        self.assertTrue(np.array_equal(data["model_function_error"].time, np.arange(0, 10)))
+        self.assertTrue(np.array_equal(data["model_function_error"].evaluations[0],
+                                       np.arange(0, 10) + 1))
+        self.assertTrue(np.all(np.isnan(data["model_function_error"].evaluations[1])))
+        self.assertTrue(np.array_equal(data["model_function_error"].evaluations[2],
+                                       np.arange(0, 10) + 4))
+
+        self.assertEqual(data["feature0d"].evaluations[0], 1)
+        self.assertTrue(np.isnan(data["feature0d"].evaluations[1]))
+        self.assertEqual(np.shape(data["feature1d"].evaluations), (3, 10))
+        self.assertTrue(np.all(np.isnan(data["feature1d"].evaluations[1])))
+
+
+    def test_run_on_error_nan_first_node(self):
+        nodes = np.array([[2, 0, 1], [1, 2, 3]])
+
+        self.runmodel = RunModel(model=Model(run=model_function_error, adaptive=True),
+                                 parameters=self.parameters,
+                                 CPUs=1,
+                                 on_error="nan",
+                                 verbose_level="error")
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        self.assertEqual(len(data.failures), 1)
+        self.assertTrue(np.array_equal(data["model_function_error"].time, np.arange(0, 10)))
+        self.assertTrue(np.all(np.isnan(data["model_function_error"].evaluations[0])))
+        self.assertTrue(np.allclose(data["model_function_error"].evaluations[1],
+                                    np.arange(0, 10) + 2))
+
+
+    def test_run_on_error_nan_all_failed(self):
+        nodes = np.array([[2, 3], [1, 2]])
+
+        self.runmodel = RunModel(model=model_function_error,
+                                 parameters=self.parameters,
+                                 CPUs=1,
+                                 on_error="nan",
+                                 verbose_level="error")
+
+        with self.assertRaises(RuntimeError):
+            self.runmodel.run(nodes, ["a", "b"])
+
+
+    def test_run_on_error_raise(self):
+        nodes = np.array([[0, 2, 1], [1, 2, 3]])
+
+        self.runmodel = RunModel(model=model_function_error,
+                                 parameters=self.parameters,
+                                 CPUs=1,
+                                 backend="serial")
+
+        with self.assertRaises(ValueError):
+            self.runmodel.run(nodes, ["a", "b"])
+
+
+    def test_run_checkpoint(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+
+        self.runmodel.checkpoint = filename
+        self.runmodel.run(nodes, ["a", "b"])
+
+        with Checkpoint(filename, "TestingModel1d", ["a", "b"],
+                        feature_names=self.runmodel.features.features_to_run,
+                        resume=True) as checkpoint:
+            evaluations = checkpoint.load()
+
+        self.assertEqual(set(evaluations.keys()), set([(0, 1), (1, 2), (2, 3)]))
+
+
+    def test_run_resume(self):
+        filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+        model = TestingModelFlaky(failures=0)
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=self.features,
+                                 backend="serial",
+                                 checkpoint=filename,
+                                 resume=True)
+
+        self.runmodel.run(np.array([[0, 1], [1, 2]]), ["a", "b"])
+        self.assertEqual(model.attempts, 2)
+
+        data = self.runmodel.run(np.array([[0, 1, 2], [1, 2, 3]]), ["a", "b"])
+        self.assertEqual(model.attempts, 3)
+
+        self.assertEqual(set(data.keys()),
+                         set(["TestingModelFlaky", "feature0d", "feature1d",
+                              "feature2d", "feature_invalid", "feature_adaptive"]))
+
+        for i, evaluation in enumerate(data["TestingModelFlaky"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + 1 + 2*i))
+
+        self.assertEqual(np.shape(data["feature_adaptive"].evaluations), (3, 10))
+
+
+    def test_run_resume_failed(self):
+        filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+        model = TestingModelFlaky(failures=1)
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=self.features,
+                                 backend="serial",
+                                 on_error="nan",
+                                 checkpoint=filename,
+                                 resume=True,
+                                 verbose_level="error")
+
+        nodes = np.array([[0, 1], [1, 2]])
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+        self.assertEqual(model.attempts, 2)
+        self.assertTrue(np.all(np.isnan(data["TestingModelFlaky"].evaluations[0])))
+
+        # The failed node is evaluated again, the successful node is reused
+        data = self.runmodel.run(nodes, ["a", "b"])
+        self.assertEqual(model.attempts, 3)
+
+        for i, evaluation in enumerate(data["TestingModelFlaky"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + 1 + 2*i))
+
+
+    def test_run_resume_other_features(self):
+        filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+        model = TestingModelFlaky(failures=0)
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature0d"]),
+                                 backend="serial",
+                                 checkpoint=filename,
+                                 resume=True,
+                                 verbose_level="error")
+
+        nodes = np.array([[0, 1], [1, 2]])
+
+        self.runmodel.run(nodes, ["a", "b"])
+        self.assertEqual(model.attempts, 2)
+
+        self.runmodel.features = TestingFeatures(features_to_run=["feature1d"])
+        data = self.runmodel.run(nodes, ["a", "b"])
+        self.assertEqual(model.attempts, 4)
+        self.assertEqual(set(data.keys()), set(["TestingModelFlaky", "feature1d"]))
+
+        self.runmodel.time_grid = np.arange(0, 10)
+        self.runmodel.run(nodes, ["a", "b"])
+        self.assertEqual(model.attempts, 6)
+
+        self.runmodel.run(nodes, ["a", "b"])
+        self.assertEqual(model.attempts, 6)
+
+
+    def test_run_cache(self):
+        cache = EvaluationCache()
+        model = CountingModel()
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 backend="serial",
+                                 cache=cache)
+
+        self.runmodel.run(np.array([[0, 1], [1, 2]]), ["a", "b"])
+        self.assertEqual(model.evaluations[0], 2)
+        self.assertEqual(len(cache), 2)
+
+        data = self.runmodel.run(np.array([[1, 0, 2], [2, 1, 3]]), ["a", "b"])
+        self.assertEqual(model.evaluations[0], 3)
+        self.assertEqual(cache.hits, 2)
+
+        for i, evaluation in enumerate(data["CountingModel"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + [3, 1, 5][i]))
+
+        # Only the node that was not cached is timed
+        self.assertTrue(np.all(np.isnan(data.node_timings["run"][:2])))
+        self.assertFalse(np.isnan(data.node_timings["run"][2]))
+
+
+    def test_run_model_outputs(self):
+        folder = os.path.join(self.output_test_dir, "model_outputs")
+        model = CountingModel()
+
+        self.runmodel = RunModel(model=model,
+                                 parameters=self.parameters,
+                                 features=TestingFeatures(features_to_run=["feature0d"]),
+                                 backend="serial",
+                                 model_outputs=folder)
+
+        self.runmodel.run(np.array([[0, 1], [1, 2]]), ["a", "b"])
+        self.assertEqual(model.evaluations[0], 2)
+        self.assertEqual(len(ModelOutputs(folder)), 2)
+
+        self.runmodel.features = TestingFeatures(features_to_run=["feature1d"])
+        self.runmodel.reuse_model_outputs = True
+
+        data = self.runmodel.run(np.array([[0, 1, 2], [1, 2, 3]]), ["a", "b"])
+
+        # Only the node without a stored model output is evaluated
+        self.assertEqual(model.evaluations[0], 3)
+        self.assertEqual(len(ModelOutputs(folder)), 3)
+
+        self.assertEqual(set(data.keys()), set(["CountingModel", "feature1d"]))
+
+        for i, evaluation in enumerate(data["CountingModel"].evaluations):
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10) + 1 + 2*i))
+
+        for evaluation in data["feature1d"].evaluations:
+            self.assertTrue(np.array_equal(evaluation, np.arange(0, 10)))
+
+
     def test_run_neuron_model(self):
         path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                             "models/interneuron_modelDB/")
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from uncertainpy.utils import SpikeTrains
+
+
+class TestSpikeTrains(unittest.TestCase):
+    def setUp(self):
+        self.spike_trains = SpikeTrains.from_spiketrains([[0, 2, 3], [], [1.5]], 4, 0.5)
+
+
+    def test_init(self):
+        spike_trains = SpikeTrains([0, 2, 3, 1.5], [0, 3, 3, 4], 4, 0.5)
+
+        self.assertTrue(np.array_equal(spike_trains.times, [0, 2, 3, 1.5]))
+        self.assertTrue(np.array_equal(spike_trains.offsets, [0, 3, 3, 4]))
+        self.assertEqual(spike_trains.simulation_end, 4)
+        self.assertEqual(spike_trains.dt, 0.5)
+        self.assertEqual(spike_trains.nr_trains, 3)
+        self.assertEqual(spike_trains.ndim, 2)
+
+
+    def test_from_spiketrains(self):
+        self.assertTrue(np.array_equal(self.spike_trains.times, [0, 2, 3, 1.5]))
+        self.assertTrue(np.array_equal(self.spike_trains.offsets, [0, 3, 3, 4]))
+        self.assertEqual(self.spike_trains.nr_trains, 3)
+
+
+    def test_from_spiketrains_empty(self):
+        spike_trains = SpikeTrains.from_spiketrains([], 4, 0.5)
+
+        self.assertEqual(spike_trains.nr_trains, 0)
+        self.assertEqual(len(spike_trains.times), 0)
+
+
+    def test_spiketrain(self):
+        self.assertTrue(np.array_equal(self.spike_trains.spiketrain(0), [0, 2, 3]))
+        self.assertTrue(np.array_equal(self.spike_trains.spiketrain(1), []))
+        self.assertTrue(np.array_equal(self.spike_trains.spiketrain(2), [1.5]))
+
+        spiketrains = self.spike_trains.spiketrains()
+        self.assertEqual(len(spiketrains), 3)
+        self.assertTrue(np.array_equal(spiketrains[0], [0, 2, 3]))
+
+
+    def test_time(self):
+        self.assertTrue(np.array_equal(self.spike_trains.time, np.arange(0, 4, 0.5)))
+
+
+    def test_to_dense(self):
+        time, values = self.spike_trains.to_dense()
+
+        self.assertTrue(np.array_equal(time, np.arange(0, 4, 0.5)))
+        self.assertTrue(np.array_equal(values, [[1, 0, 0, 0, 1, 0, 1, 0],
+                                                [0, 0, 0, 0, 0, 0, 0, 0],
+                                                [0, 0, 0, 1, 0, 0, 0, 0]]))
+
+
+    def test_to_dense_in1d(self):
+        spiketrains = [[0, 2, 3.05, 3.9, 10], [0.3, 0.3, 0.35]]
+        spike_trains = SpikeTrains.from_spiketrains(spiketrains, 4, 0.1)
+
+        time, values = spike_trains.to_dense()
+
+        for i, spiketrain in enumerate(spiketrains):
+            correct = np.zeros(len(time))
+            correct[np.in1d(time, spiketrain)] = 1
+
+            self.assertTrue(np.array_equal(values[i], correct))
+
+
+    def test_eq(self):
+        spike_trains = SpikeTrains([0, 2, 3, 1.5], [0, 3, 3, 4], 4, 0.5)
+        self.assertEqual(self.spike_trains, spike_trains)
+
+        spike_trains = SpikeTrains([0, 2, 3, 1.5], [0, 3, 4, 4], 4, 0.5)
+        self.assertNotEqual(self.spike_trains, spike_trains)
+
+
+    def test_repr(self):
+        self.assertEqual(repr(self.spike_trains),
+                         "SpikeTrains(nr_trains=3, nr_spikes=4, simulation_end=4, dt=0.5)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,6 +44,39 @@ class TestSpikes(TestCasePlot):
         self.assertEqual(self.spikes.nr_spikes, 12)
 
 
+    def test_set_spikes(self):
+        self.spikes = Spikes(self.time, self.values)
+
+        spikes = self.spikes.spikes[2:5]
+        self.spikes.spikes = spikes
+
+        self.assertEqual(self.spikes.nr_spikes, 3)
+        self.assertEqual(len(self.spikes), 3)
+        self.assertEqual(len(self.spikes.time_spike), 3)
+
+        for spike, new_spike in zip(spikes, self.spikes):
+            self.assertTrue(np.array_equal(spike.time, new_spike.time))
+            self.assertTrue(np.array_equal(spike.V, new_spike.V))
+            self.assertEqual(spike.time_spike, new_spike.time_spike)
+            self.assertEqual(spike.V_spike, new_spike.V_spike)
+            self.assertEqual(spike.global_index, new_spike.global_index)
+
+        self.assertIs(self.spikes.V, self.values)
+
+        # Spikes that are not from the voltage trace are joined together
+        other = Spikes(self.time, self.values + 1)
+        self.spikes.spikes = other.spikes[:2]
+
+        self.assertEqual(len(self.spikes.V), np.sum(other.end[:2] - other.start[:2]))
+        self.assertTrue(np.array_equal(self.spikes.V[self.spikes.global_index],
+                                       other.V_spike[:2]))
+        self.assertTrue(np.array_equal(self.spikes[1].V, other[1].V))
+
+        self.spikes.spikes = []
+        self.assertEqual(self.spikes.nr_spikes, 0)
+        self.assertEqual(list(self.spikes), [])
+
+
     def test_find_spikes_default(self):
         self.spikes = Spikes()
 
@@ -72,6 +105,35 @@ class TestSpikes(TestCasePlot):
         self.assertEqual(self.spikes.nr_spikes, 12)
 
 
+    def test_find_spikes_threshold_crossings(self):
+        time = np.arange(0, 10)
+        values = np.array([-40, -20, -30, -20, -40, -50, -20, -10, np.nan, -10.])
+
+        self.spikes = Spikes()
+        self.spikes.find_spikes(time, values)
+
+        # Samples equal to the threshold do not end a spike, and the spike
+        # that has not ended at the end of the trace is not included
+        self.assertEqual(self.spikes.nr_spikes, 1)
+        self.assertEqual(self.spikes[0].global_index, 1)
+        self.assertEqual(self.spikes[0].V_spike, -20)
+        self.assertTrue(np.array_equal(self.spikes[0].time, np.arange(0, 5)))
+        self.assertTrue(np.array_equal(self.spikes[0].V, [-40, -20, -30, -20, -40]))
+
+
+    def test_find_spikes_identical_peaks(self):
+        time = np.arange(0, 8)
+        values = np.array([-60, -60, 0, 10, 10, 0, -60, -60.])
+
+        self.spikes = Spikes()
+        self.spikes.find_spikes(time, values)
+
+        # The first of equal peak values is used
+        self.assertEqual(self.spikes.nr_spikes, 1)
+        self.assertEqual(self.spikes[0].global_index, 3)
+        self.assertTrue(np.array_equal(self.spikes[0].time, np.arange(2, 7)))
+
+
     def test_iter(self):
         self.spikes = Spikes()
         self.spikes.find_spikes(self.time, self.values)
@@ -94,6 +156,48 @@ class TestSpikes(TestCasePlot):
         self.assertIsInstance(result, Spike)
 
 
+    def test_getitem_negative_slice(self):
+        self.spikes = Spikes()
+        self.spikes.find_spikes(self.time, self.values)
+
+        self.assertEqual(self.spikes[-1].global_index, self.spikes.global_index[-1])
+
+        result = self.spikes[1:3]
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0].global_index, self.spikes.global_index[1])
+
+        with self.assertRaises(IndexError):
+            self.spikes[12]
+
+
+    def test_arrays(self):
+        self.spikes = Spikes()
+        self.spikes.find_spikes(self.time, self.values)
+
+        self.assertEqual(len(self.spikes.global_index), 12)
+        self.assertEqual(len(self.spikes.start), 12)
+        self.assertEqual(len(self.spikes.end), 12)
+        self.assertTrue(np.array_equal(self.spikes.time_spike, self.time[self.spikes.global_index]))
+        self.assertTrue(np.array_equal(self.spikes.V_spike, self.values[self.spikes.global_index]))
+
+        for i, spike in enumerate(self.spikes):
+            self.assertEqual(spike.global_index, self.spikes.global_index[i])
+            self.assertEqual(spike.time_spike, self.spikes.time_spike[i])
+            self.assertEqual(spike.V_spike, self.spikes.V_spike[i])
+            self.assertTrue(np.shares_memory(spike.V, self.spikes.V))
+            self.assertTrue(np.array_equal(spike.V, self.values[self.spikes.start[i]:self.spikes.end[i]]))
+
+        self.assertEqual(len(self.spikes.spikes), 12)
+
+
+    def test_arrays_empty(self):
+        self.spikes = Spikes()
+
+        self.assertEqual(len(self.spikes.global_index), 0)
+        self.assertEqual(self.spikes.spikes, [])
+        self.assertEqual(list(self.spikes), [])
+
+
     def test_plot(self):
         self.spikes = Spikes(self.time, self.values, xlabel="xlabel", ylabel="ylabel")
 
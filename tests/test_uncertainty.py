@@ -3,6 +3,7 @@ import os
 import shutil
 import subprocess
 import glob
+import pstats
 import numpy as np
 import chaospy as cp
 
@@ -13,7 +14,7 @@ from uncertainpy import UncertaintyQuantification
 from uncertainpy.parameters import Parameters
 from uncertainpy.features import Features
 from uncertainpy import uniform, normal
-from uncertainpy.core import UncertaintyCalculations
+from uncertainpy.core import UncertaintyCalculations, ProcessExecutor, SerialExecutor, ModelOutputs
 from uncertainpy import Data
 from uncertainpy import Model
 from uncertainpy import SpikingFeatures
@@ -354,7 +355,7 @@ class TestUncertainty(TestCasePlot):
         folder = os.path.dirname(os.path.realpath(__file__))
         compare_file = os.path.join(folder, "data/TestingModel1d_single-parameter-a.h5")
         filename = os.path.join(self.output_test_dir, "TestingModel1d_single-parameter-a.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold), filename, compare_file])
 
 
         self.assertEqual(result, 0)
@@ -362,7 +363,7 @@ class TestUncertainty(TestCasePlot):
         folder = os.path.dirname(os.path.realpath(__file__))
         compare_file = os.path.join(folder, "data/TestingModel1d_single-parameter-b.h5")
         filename = os.path.join(self.output_test_dir, "TestingModel1d_single-parameter-b.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -381,7 +382,7 @@ class TestUncertainty(TestCasePlot):
         self.assertTrue(os.path.isfile(filename))
 
 
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold),
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold),
                                   filename, compare_file])
 
         self.assertEqual(result, 0)
@@ -399,7 +400,7 @@ class TestUncertainty(TestCasePlot):
         filename = os.path.join(self.output_test_dir, "TestingModel1d.h5")
         self.assertTrue(os.path.isfile(filename))
 
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -511,7 +512,7 @@ class TestUncertainty(TestCasePlot):
 
         self.assertTrue(os.path.isfile(filename))
 
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -521,7 +522,7 @@ class TestUncertainty(TestCasePlot):
 
         self.assertTrue(os.path.isfile(filename))
 
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -559,7 +560,7 @@ class TestUncertainty(TestCasePlot):
         filename = os.path.join(self.output_test_dir, "TestingModel1d_MC.h5")
         self.assertTrue(os.path.isfile(filename))
 
-        result = subprocess.call(["h5diff", "-d", str(self.difference_treshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.difference_treshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -950,6 +951,142 @@ class TestUncertainty(TestCasePlot):
         self.assertEqual(data.arguments["nr_samples"], self.nr_mc_samples)
 
 
+    def test_quantify_backend(self):
+        self.assertIsInstance(self.uncertainty.uncertainty_calculations.runmodel.backend,
+                              ProcessExecutor)
+
+        data = self.uncertainty.quantify(method="mc",
+                                         nr_mc_samples=self.nr_mc_samples,
+                                         plot=None,
+                                         save=False,
+                                         seed=self.seed,
+                                         backend="serial")
+
+        self.assertIsInstance(self.uncertainty.uncertainty_calculations.runmodel.backend,
+                              SerialExecutor)
+        self.assertEqual(len(data["TestingModel1d"].evaluations), self.nr_mc_samples)
+
+
+    def test_init_memmap(self):
+        uncertainty = UncertaintyQuantification(self.model,
+                                                parameters=self.parameters,
+                                                memmap_threshold=100,
+                                                scratch_folder=self.output_test_dir)
+
+        runmodel = uncertainty.uncertainty_calculations.runmodel
+        self.assertEqual(runmodel.memmap_threshold, 100)
+        self.assertEqual(runmodel.scratch_folder, self.output_test_dir)
+
+
+    def test_quantify_memmap(self):
+        data = self.uncertainty.quantify(method="mc",
+                                         nr_mc_samples=self.nr_mc_samples,
+                                         plot=None,
+                                         save=False,
+                                         seed=self.seed,
+                                         memmap_threshold=0,
+                                         scratch_folder=self.output_test_dir)
+
+        self.uncertainty.close()
+
+        runmodel = self.uncertainty.uncertainty_calculations.runmodel
+        self.assertEqual(runmodel.memmap_threshold, 0)
+        self.assertEqual(len(data["TestingModel1d"].evaluations), self.nr_mc_samples)
+
+
+    def test_quantify_checkpoint(self):
+        self.uncertainty.quantify(method="mc",
+                                  nr_mc_samples=self.nr_mc_samples,
+                                  plot=None,
+                                  save=False,
+                                  seed=self.seed,
+                                  data_folder=self.output_test_dir,
+                                  checkpoint=True)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d_checkpoint.h5")
+        self.assertTrue(os.path.isfile(filename))
+        self.assertIsNone(self.uncertainty.uncertainty_calculations.runmodel.checkpoint)
+
+        data = self.uncertainty.quantify(method="mc",
+                                         nr_mc_samples=self.nr_mc_samples,
+                                         plot=None,
+                                         save=False,
+                                         seed=self.seed,
+                                         data_folder=self.output_test_dir,
+                                         resume=True)
+
+        self.assertEqual(len(data["TestingModel1d"].evaluations), self.nr_mc_samples)
+        self.assertFalse(self.uncertainty.uncertainty_calculations.runmodel.resume)
+
+
+    def test_recompute_features(self):
+        self.uncertainty.quantify(method="mc",
+                                  nr_mc_samples=self.nr_mc_samples,
+                                  plot=None,
+                                  save=False,
+                                  seed=self.seed,
+                                  data_folder=self.output_test_dir,
+                                  store_model_outputs=True)
+
+        folder = os.path.join(self.output_test_dir, "TestingModel1d_model_outputs")
+        self.assertEqual(len(ModelOutputs(folder)), self.nr_mc_samples)
+        self.assertIsNone(self.uncertainty.uncertainty_calculations.runmodel.model_outputs)
+
+        data = self.uncertainty.recompute_features(features=TestingFeatures(features_to_run=["feature1d"]),
+                                                   method="mc",
+                                                   nr_mc_samples=self.nr_mc_samples,
+                                                   plot=None,
+                                                   save=False,
+                                                   seed=self.seed,
+                                                   data_folder=self.output_test_dir)
+
+        self.assertEqual(set(data.keys()), set(["TestingModel1d", "feature1d"]))
+        self.assertEqual(len(data["feature1d"].evaluations), self.nr_mc_samples)
+        self.assertFalse(self.uncertainty.uncertainty_calculations.runmodel.reuse_model_outputs)
+
+        # No model evaluations are timed when the stored model outputs are used
+        self.assertNotIn("run", data.node_timings)
+        self.assertIn("feature: feature1d", data.node_timings)
+
+
+    def test_recompute_features_custom(self):
+        with self.assertRaises(ValueError):
+            self.uncertainty.recompute_features(method="custom")
+
+
+    def test_quantify_profile(self):
+        self.uncertainty.quantify(method="mc",
+                                  nr_mc_samples=self.nr_mc_samples,
+                                  plot=None,
+                                  save=False,
+                                  seed=self.seed,
+                                  data_folder=self.output_test_dir,
+                                  profile=True)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d.prof")
+        self.assertTrue(os.path.isfile(filename))
+        self.assertFalse(self.uncertainty.uncertainty_calculations.runmodel.profile)
+
+        stats = pstats.Stats(filename)
+        functions = [function for filename, line, function in stats.stats]
+        self.assertIn("feature1d", functions)
+
+
+    def test_quantify_save_before_plot(self):
+        data = self.uncertainty.quantify(method="mc",
+                                         nr_mc_samples=self.nr_mc_samples,
+                                         plot="evaluations",
+                                         seed=self.seed,
+                                         data_folder=self.output_test_dir,
+                                         figure_folder=self.output_test_dir)
+
+        self.assertIn("plotting", data.timings)
+
+        saved_data = Data(os.path.join(self.output_test_dir, "TestingModel1d.h5"))
+        self.assertIn("model evaluation", saved_data.timings)
+        self.assertNotIn("plotting", saved_data.timings)
+
+
     def test_quantify_custom(self):
         self.set_up_test_calculations()
 
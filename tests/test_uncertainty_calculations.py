@@ -923,7 +923,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
         folder = os.path.dirname(os.path.realpath(__file__))
         compare_file = os.path.join(folder, "data/TestingModel1d.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.threshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -939,7 +939,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
         folder = os.path.dirname(os.path.realpath(__file__))
         compare_file = os.path.join(folder, "data/TestingModel1d_Rosenblatt.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.threshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -956,7 +956,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
         folder = os.path.dirname(os.path.realpath(__file__))
         compare_file = os.path.join(folder, "data/TestingModel1d_spectral.h5")
-        result = subprocess.call(["h5diff", "-d", str(5e-4), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(5e-4), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -977,7 +977,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
         # TODO Make this test work
         # folder = os.path.dirname(os.path.realpath(__file__))
         # compare_file = os.path.join(folder, "data/TestingModel1d_Rosenblatt_spectral.h5")
-        # result = subprocess.call(["h5diff", "-d", str(5e-4), filename, compare_file])
+        # result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(5e-4), filename, compare_file])
 
         # self.assertEqual(result, 0)
 
@@ -1086,7 +1086,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
         folder = os.path.dirname(os.path.realpath(__file__))
 
         compare_file = os.path.join(folder, "data/TestingModel1d_single-parameter-a.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.threshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -1101,7 +1101,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
         folder = os.path.dirname(os.path.realpath(__file__))
 
         compare_file = os.path.join(folder, "data/UncertaintyCalculations_single-parameter-b.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", "-d", str(self.threshold), filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -1145,7 +1145,7 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
         folder = os.path.dirname(os.path.realpath(__file__))
         compare_file = os.path.join(folder, "data/TestingModel1d_MC.h5")
-        result = subprocess.call(["h5diff", filename, compare_file])
+        result = subprocess.call(["h5diff", "--exclude-path", "/timings", filename, compare_file])
 
         self.assertEqual(result, 0)
 
@@ -1,9 +1,10 @@
 from .testing_models import TestingModel0d, TestingModel1d, TestingModel2d
 from .testing_models import TestingModelNoTime, TestingModelNoTimeU
 from .testing_models import TestingModelAdaptive, TestingModelConstant
-from .testing_models import TestingModelIncomplete
+from .testing_models import TestingModelIncomplete, TestingModelFlaky, TestingModelVectorized
 from .testing_models import PostprocessErrorNumpy, PostprocessErrorValue, PostprocessErrorOne
-from .testing_models import model_function
+from .testing_models import model_function, model_function_error, model_function_sleep
+from .testing_models import model_function_vectorized, model_function_vectorized_error
 
 from .testing_features import TestingFeatures
 from .testing_uncertainty import TestingUncertaintyCalculations
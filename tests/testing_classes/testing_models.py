@@ -1,5 +1,6 @@
 from uncertainpy import Model
 import numpy as np
+import time as time_module
 
 
 
@@ -11,6 +12,38 @@ def model_function(a=1, b=2):
 
 
 
+def model_function_error(a=1, b=2):
+    if a > 1:
+        raise ValueError("Model fails for a > 1")
+
+    return model_function(a=a, b=b)
+
+
+def model_function_sleep(a=1, b=2):
+    if a > 1:
+        time_module.sleep(10)
+
+    return model_function(a=a, b=b)
+
+
+def model_function_vectorized(a=1, b=2):
+    a = np.asarray(a)[:, np.newaxis]
+    b = np.asarray(b)[:, np.newaxis]
+
+    time = np.arange(0, 10)
+    values = np.arange(0, 10) + a + b
+
+    return time, values
+
+
+def model_function_vectorized_error(a=1, b=2):
+    if np.any(np.asarray(a) > 1):
+        raise ValueError("Model fails for a > 1")
+
+    return model_function_vectorized(a=a, b=b)
+
+
+
 class TestingModel0d(Model):
     def __init__(self):
         super(TestingModel0d, self).__init__(labels=["x"])
@@ -161,4 +194,35 @@ class PostprocessErrorValue(Model):
         return time, values
 
     def postprocess(self, time, values):
-        return (1, 2, 3)
\ No newline at end of file
+        return (1, 2, 3)
+
+
+
+class TestingModelFlaky(Model):
+    def __init__(self, failures=1):
+        super(TestingModelFlaky, self).__init__(labels=["x", "y"])
+
+        self.failures = failures
+        self.attempts = 0
+
+    def run(self, a=1, b=2):
+        self.attempts += 1
+
+        if self.attempts <= self.failures:
+            raise RuntimeError("Model failed")
+
+        return model_function(a=a, b=b)
+
+
+
+class TestingModelVectorized(Model):
+    def __init__(self):
+        super(TestingModelVectorized, self).__init__(labels=["x", "y"], vectorized=True)
+
+        # Not a number, so the count is not part of the cache key
+        self.calls = np.zeros(1, dtype=int)
+
+    def run(self, a=1, b=2):
+        self.calls[0] += 1
+
+        return model_function_vectorized(a=a, b=b)